@@ -11,6 +11,11 @@ import os
 
 from django.core.asgi import get_asgi_application
 
+from espndata.core.sentry import init_sentry
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'espndata.settings')
 
 application = get_asgi_application()
+
+# Web processes are long-lived, so Sentry is initialised up front rather than on first use
+init_sentry()
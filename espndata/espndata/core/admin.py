@@ -1,5 +1,3 @@
 from django.contrib import admin
 
-from espndata.core.models import LeagueDetails
-
-admin.site.register(LeagueDetails)
\ No newline at end of file
+# Register your models here.
@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.conf import settings
+
+import logging
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'espndata.core'
+
+    def ready(self):
+        if settings.SENTRY_DSN:
+            from espndata.core.sentry import SentryErrorHandler
+            logging.getLogger('espndata').addHandler(SentryErrorHandler())
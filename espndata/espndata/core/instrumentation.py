@@ -0,0 +1,213 @@
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+import heapq
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (50, 90, 99)
+SQL_DISPLAY_LENGTH = 300    # characters of a slow query's SQL kept
+
+current_record = ContextVar('current_query_record', default=None)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """
+    Raised when a request or block runs more SQL queries than its budget. An AssertionError, so tests fail on it.
+    """
+
+
+class QueryRecord:
+    """
+    Query count, database time and the slowest queries (SQL without parameters) of one request or block.
+    """
+    def __init__(self, slowest=None):
+        self.count = 0
+        self.seconds = 0.0
+        self.slowest_kept = settings.INSTRUMENTATION_SLOW_QUERIES if slowest is None else slowest
+        self.slowest = []           # min-heap of (seconds, sql)
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            seconds = time.perf_counter() - start
+            self.count += 1
+            self.seconds += seconds
+
+            if len(self.slowest) < self.slowest_kept:
+                heapq.heappush(self.slowest, (seconds, sql[:SQL_DISPLAY_LENGTH]))
+            elif self.slowest and seconds > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, (seconds, sql[:SQL_DISPLAY_LENGTH]))
+
+    def slowest_queries(self):
+        return sorted(self.slowest, reverse=True)
+
+
+def _record_query(execute, sql, params, many, context):
+    record = current_record.get()
+
+    if record is None:
+        return execute(sql, params, many, context)
+
+    return record(execute, sql, params, many, context)
+
+
+def _wrap_connection(connection, **kwargs):
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+def install():
+    """
+    Adds the recording execute wrapper to this thread's open connections and to every connection opened from now on.
+    Outside `record_queries()` the wrapper only reads a context variable, so it can stay installed.
+    """
+    connection_created.connect(_wrap_connection, dispatch_uid='espndata.core.instrumentation')
+
+    for connection in connections.all(initialized_only=True):
+        _wrap_connection(connection)
+
+
+@contextmanager
+def record_queries(slowest=None):
+    """
+    Yields a QueryRecord of the queries run inside the block, on every database connection.
+    Queries the async ORM runs in `sync_to_async()` threads are included, as the context variable is copied to them.
+    """
+    install()
+    record = QueryRecord(slowest)
+    token = current_record.set(record)
+
+    try:
+        yield record
+    finally:
+        current_record.reset(token)
+
+
+def query_budget_message(label, record, budget):
+    queries = '\n'.join(f'  {seconds * 1000:.1f} ms: {sql}' for seconds, sql in record.slowest_queries())
+    return f'{label} ran {record.count} queries, over its budget of {budget}. Slowest:\n{queries}'
+
+
+@contextmanager
+def query_budget(budget, label='Block'):
+    """
+    Raises QueryBudgetExceeded if the block runs more than `budget` queries. For tests:
+
+        with query_budget(3):
+            self.client.get(reverse('team-ratings'), {'league': 'nfl'})
+    """
+    with record_queries() as record:
+        yield record
+
+    if record.count > budget:
+        raise QueryBudgetExceeded(query_budget_message(label, record, budget))
+
+
+def check_query_budget(endpoint, record):
+    """
+    Compares a request's queries to the endpoint's QUERY_BUDGETS entry. Over budget is a warning,
+    or a QueryBudgetExceeded with QUERY_BUDGET_STRICT (for test settings).
+    """
+    budget = settings.QUERY_BUDGETS.get(endpoint)
+
+    if budget is None or record.count <= budget:
+        return
+
+    message = query_budget_message(f'`{endpoint}`', record, budget)
+
+    if settings.QUERY_BUDGET_STRICT:
+        raise QueryBudgetExceeded(message)
+
+    logger.warning(message)
+
+
+def percentile(sorted_values, percent):
+    """
+    Nearest-rank percentile of an ascending list.
+    """
+    if not sorted_values:
+        return None
+
+    rank = max(int(len(sorted_values) * percent / 100 + 0.5), 1)
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class EndpointStats:
+    """
+    Rolling window of one endpoint's most recent requests, plus its all-time slowest queries.
+    Recording appends to fixed-size deques; percentiles are only sorted out of them when read.
+    """
+    def __init__(self, window, slowest):
+        self.requests = 0
+        self.over_budget = 0
+        self.response_seconds = deque(maxlen=window)
+        self.query_counts = deque(maxlen=window)
+        self.query_seconds = deque(maxlen=window)
+        self.slowest_kept = slowest
+        self.slowest = []           # min-heap of (seconds, sql)
+
+    def add(self, seconds, record, over_budget=False):
+        self.requests += 1
+        self.over_budget += over_budget
+        self.response_seconds.append(seconds)
+        self.query_counts.append(record.count)
+        self.query_seconds.append(record.seconds)
+
+        for query in record.slowest:
+            if len(self.slowest) < self.slowest_kept:
+                heapq.heappush(self.slowest, query)
+            elif query[0] > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, query)
+
+    def summary(self):
+        response_ms = sorted(seconds * 1000 for seconds in self.response_seconds)
+        query_counts = sorted(self.query_counts)
+        query_ms = sorted(seconds * 1000 for seconds in self.query_seconds)
+
+        return {
+            'requests': self.requests,
+            'window': len(response_ms),
+            'over_budget': self.over_budget,
+            'response_ms': {f'p{percent}': round(percentile(response_ms, percent), 2) for percent in PERCENTILES},
+            'queries': {f'p{percent}': percentile(query_counts, percent) for percent in PERCENTILES} | {'max': query_counts[-1]},
+            'db_ms': {f'p{percent}': round(percentile(query_ms, percent), 2) for percent in PERCENTILES},
+            'slowest_queries': [{'ms': round(seconds * 1000, 2), 'sql': sql} for seconds, sql in sorted(self.slowest, reverse=True)],
+        }
+
+
+class EndpointRegistry:
+    """
+    EndpointStats by endpoint, shared by this process's threads. Each worker process keeps its own.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.endpoints = {}
+
+    def add(self, endpoint, seconds, record, over_budget=False):
+        with self.lock:
+            if endpoint not in self.endpoints:
+                self.endpoints[endpoint] = EndpointStats(settings.INSTRUMENTATION_WINDOW, settings.INSTRUMENTATION_SLOW_QUERIES)
+
+            self.endpoints[endpoint].add(seconds, record, over_budget)
+
+    def summary(self):
+        with self.lock:
+            return {endpoint: stats.summary() for endpoint, stats in sorted(self.endpoints.items())}
+
+    def reset(self):
+        with self.lock:
+            self.endpoints.clear()
+
+
+registry = EndpointRegistry()
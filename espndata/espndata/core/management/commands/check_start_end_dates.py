@@ -1,17 +1,17 @@
 from django.conf import settings
 from django.core.mail import send_mail
-from django.core.management.base import BaseCommand
 
 from datetime import date
 import logging
-from sentry_sdk import capture_exception
 
-from espndata.core.models import DataCollectionState
+from espndata.core.profiling import ProfiledCommand
+from espndata.core.sentry import capture_exception
+from espndata.events.models import League
 
 logger = logging.getLogger(__name__)
 
-class Command(BaseCommand):
-    help = 'Checks DataCollectionState objects season_start and season_end dates need to be updated. Sends an email to admins if any do.'
+class Command(ProfiledCommand):
+    help = 'Checks if League objects season_start and season_end dates need to be updated. Sends an email to admins if any do.'
 
     def handle(self, *args, **options):
         logger.info('`check_start_end_dates` command started.')
@@ -19,27 +19,27 @@ class Command(BaseCommand):
         today = date.today()
 
         message = ''
-        improperly_configured = 'The stored {league} season dates are not properly configured. Update them via the DataCollectionState object.\n'
+        improperly_configured = 'The stored {league} season dates are not properly configured. Update them via the League object.\n'
 
-        for state in DataCollectionState.objects.all():
-            if state.all_star_start and state.all_star_end:
+        for league in League.objects.all():
+            if league.all_star_start and league.all_star_end:
                 # order should always be seasonStart, allstarStart, allstarEnd, seasonEnd
                 if not (
-                    state.season_start < state.all_star_start
-                    and state.all_star_start <= state.all_star_end
-                    and state.all_star_end < state.season_end
+                    league.season_start < league.all_star_start
+                    and league.all_star_start <= league.all_star_end
+                    and league.all_star_end < league.season_end
                 ):
-                    message += improperly_configured.format(state.get_league_display())
-            elif not state.all_star_start and not state.all_star_end:
+                    message += improperly_configured.format(league.display_name)
+            elif not league.all_star_start and not league.all_star_end:
                 # order should always be seasonStart, seasonEnd
-                if not state.season_start < state.season_end:
-                    message += improperly_configured.format(state.get_league_display())
+                if not league.season_start < league.season_end:
+                    message += improperly_configured.format(league.display_name)
             else:
                 # must have both or neither all star dates, not just one
-                message += improperly_configured.format(state.get_league_display())
+                message += improperly_configured.format(league.display_name)
 
-            if today > state.season_end:
-                message += f'The current {state.get_league_display()} season has ended. Relevant season dates should be updated via the DataCollectionState object.\n'
+            if today > league.season_end:
+                message += f'The current {league.display_name} season has ended. Relevant season dates should be updated via the League object.\n'
 
         if message:
             try:
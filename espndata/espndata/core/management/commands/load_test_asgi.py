@@ -0,0 +1,123 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+import asyncio
+from collections import defaultdict
+import itertools
+import time
+from urllib.parse import urlsplit
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+async def asgi_get(application, url, headers):
+    """
+    Sends one GET request straight to the ASGI application, as a server would.
+    Returns (status, seconds to the first body byte, seconds to the end of the response, body bytes).
+    """
+    parts = urlsplit(url)
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': parts.path,
+        'raw_path': parts.path.encode(),
+        'query_string': parts.query.encode(),
+        'root_path': '',
+        'headers': headers,
+        'client': ('127.0.0.1', 0),
+        'server': ('localhost', 80),
+    }
+    response_done = asyncio.Event()
+    request_sent = False
+    result = {'status': None, 'first_byte': None, 'bytes': 0}
+    start = time.perf_counter()
+
+    async def receive():
+        nonlocal request_sent
+
+        if not request_sent:
+            request_sent = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        await response_done.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            result['status'] = message['status']
+        elif message['type'] == 'http.response.body':
+            if result['first_byte'] is None:
+                result['first_byte'] = time.perf_counter() - start
+            result['bytes'] += len(message.get('body', b''))
+
+            if not message.get('more_body'):
+                response_done.set()
+
+    await application(scope, receive, send)
+    return result['status'], result['first_byte'], time.perf_counter() - start, result['bytes']
+
+
+async def run_load(application, urls, concurrency, total_requests, headers):
+    """
+    Issues `total_requests` requests, cycling through `urls`, with at most `concurrency` in flight.
+    Returns ({url: [(status, first byte, total, bytes)]}, seconds elapsed).
+    """
+    results = defaultdict(list)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(url):
+        async with semaphore:
+            results[url].append(await asgi_get(application, url, headers))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(url) for url in itertools.islice(itertools.cycle(urls), total_requests)))
+    return results, time.perf_counter() - start
+
+
+class Command(BaseCommand):
+    help = 'Load-tests URLs by driving the ASGI application in-process at several concurrency levels; reports throughput and latency percentiles.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('urls', nargs='+', help='Paths with query strings, e.g. "/matchups/?league=nfl". Requests cycle through them.')
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32], help='Requests in flight, one run per level.')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per run.')
+        parser.add_argument('--user', help='Username to send requests as (superuser-only endpoints need one).')
+
+    def handle(self, *args, **options):
+        headers = [(b'host', b'localhost')]
+
+        if options['user']:
+            try:
+                user = get_user_model().objects.get(username=options['user'])
+            except get_user_model().DoesNotExist:
+                raise CommandError(f'No user named {options["user"]!r}')
+
+            client = Client()
+            client.force_login(user)
+            session_cookie = f'{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}'
+            headers.append((b'cookie', session_cookie.encode()))
+
+        application = get_asgi_application()
+
+        for concurrency in options['concurrency']:
+            results, elapsed = asyncio.run(run_load(application, options['urls'], concurrency, options['requests'], headers))
+            self.stdout.write(f'concurrency {concurrency}: {options["requests"] / elapsed:.1f} requests/s')
+
+            for url, samples in results.items():
+                statuses = sorted({status for status, _, _, _ in samples})
+                first_bytes = [first_byte for _, first_byte, _, _ in samples if first_byte is not None]
+                totals = [total for _, _, total, _ in samples]
+                self.stdout.write(
+                    f'  {url}: {len(samples)} requests, status {statuses}, '
+                    f'first byte p50 {percentile(first_bytes, 0.5) * 1000:.1f} ms, '
+                    f'total p50 {percentile(totals, 0.5) * 1000:.1f} ms, p99 {percentile(totals, 0.99) * 1000:.1f} ms'
+                )
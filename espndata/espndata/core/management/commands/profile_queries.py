@@ -0,0 +1,38 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+import argparse
+import time
+
+from espndata.core.instrumentation import query_budget_message, record_queries
+
+
+class Command(BaseCommand):
+    help = (
+        'Runs another management command and reports its SQL query count, database time and slowest queries. '
+        'Example: `python manage.py profile_queries --budget 50 update_ratings --league nfl`'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--slowest', type=int, default=10, help='Slowest queries listed.')
+        parser.add_argument('--budget', type=int, help='Exit with an error if the command runs more queries than this.')
+        parser.add_argument('command_name', help='Management command to run.')
+        parser.add_argument('command_args', nargs=argparse.REMAINDER, help="The command's own arguments.")
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+
+        with record_queries(slowest=options['slowest']) as record:
+            call_command(options['command_name'], *options['command_args'])
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f'{options["command_name"]}: {record.count} queries, {record.seconds:.2f}s in the database '
+            f'of {elapsed:.2f}s ({record.seconds / elapsed:.0%})'
+        )
+
+        for seconds, sql in record.slowest_queries():
+            self.stdout.write(f'  {seconds * 1000:8.1f} ms  {sql}')
+
+        if options['budget'] is not None and record.count > options['budget']:
+            raise CommandError(query_budget_message(options['command_name'], record, options['budget']))
@@ -0,0 +1,121 @@
+from django.apps import apps
+from django.conf import settings
+from django.core.management import find_commands
+from django.core.management.base import BaseCommand, CommandError
+
+from collections import defaultdict
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+# Boots Django and imports one command module, as `manage.py <command>` does before `handle()` runs
+BOOT_SNIPPET = 'import django; django.setup(); import importlib; importlib.import_module({module!r})'
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def project_commands():
+    """
+    Returns {command name: module path} for every management command in the project's installed apps,
+    the ones `manage.py` can run.
+    """
+    commands = {}
+
+    for app_config in apps.get_app_configs():
+        if app_config.name.startswith('espndata.'):
+            for name in find_commands(os.path.join(app_config.path, 'management')):
+                commands[name] = f'{app_config.name}.management.commands.{name}'
+
+    return dict(sorted(commands.items()))
+
+
+def parse_importtime(stderr):
+    """
+    Returns (total import microseconds, {package: microseconds spent in its own modules}) from `python -X importtime` output.
+    """
+    total = 0
+    by_package = defaultdict(int)
+
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+
+        if not match:
+            continue
+
+        by_package[match[4].split('.')[0]] += int(match[1])
+
+        if len(match[3]) <= 1:      # top-level imports; nested ones are already in their parent's cumulative time
+            total += int(match[2])
+
+    return total, by_package
+
+
+def measure(module, runs):
+    """
+    Boots a fresh interpreter `runs` times for `module` and returns (median wall ms, median import ms, {package: ms}).
+    """
+    walls = []
+    imports = []
+    packages = defaultdict(list)
+
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', BOOT_SNIPPET.format(module=module)],
+            capture_output=True,
+            text=True,
+            env=os.environ.copy(),
+        )
+        walls.append((time.perf_counter() - start) * 1000)
+
+        if result.returncode:
+            raise CommandError(f'Could not import {module}:\n{result.stderr.splitlines()[-1]}')
+
+        total, by_package = parse_importtime(result.stderr)
+        imports.append(total / 1000)
+
+        for package, microseconds in by_package.items():
+            packages[package].append(microseconds / 1000)
+
+    return statistics.median(walls), statistics.median(imports), {package: statistics.median(ms) for package, ms in packages.items()}
+
+
+class Command(BaseCommand):
+    help = 'Measures each management command\'s startup (Django boot plus imports) and checks it against STARTUP_IMPORT_BUDGETS.'
+
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('commands', nargs='*', help='Commands to measure. Defaults to all of the project\'s commands.')
+        parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters booted per command; medians are reported.')
+        parser.add_argument('--top', type=int, default=3, help='Slowest imported packages listed per command.')
+        parser.add_argument('--check', action='store_true', help='Exit with an error if any command is over its import budget.')
+
+    def handle(self, *args, **options):
+        commands = project_commands()
+        names = options['commands'] or list(commands)
+        unknown = set(names) - set(commands)
+
+        if unknown:
+            raise CommandError(f'Unknown commands: {", ".join(sorted(unknown))}')
+
+        over_budget = []
+        self.stdout.write(f'{"command":<30}{"wall ms":>9}{"import ms":>11}{"budget":>8}       slowest imports')
+
+        for name in names:
+            wall, imports, packages = measure(commands[name], options['runs'])
+            budget = settings.STARTUP_IMPORT_BUDGETS.get(name, settings.STARTUP_IMPORT_BUDGETS['default'])
+            slowest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:options['top']]
+            flag = 'OVER' if imports > budget else ''
+            self.stdout.write(
+                f'{name:<30}{wall:>9.0f}{imports:>11.0f}{budget:>8} {flag:<4}  '
+                + ', '.join(f'{package} {ms:.0f}' for package, ms in slowest)
+            )
+
+            if imports > budget:
+                over_budget.append(name)
+
+        if options['check'] and over_budget:
+            raise CommandError(f'Over import budget: {", ".join(over_budget)}')
@@ -0,0 +1,66 @@
+from django.conf import settings
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+import time
+
+from espndata.core.instrumentation import check_query_budget, install, record_queries, registry
+
+UNRESOLVED_ENDPOINT = '<unresolved>'
+
+
+def endpoint_name(request):
+    """
+    Returns the URL name a request resolved to (e.g. `team-ratings`, `admin:events_event_changelist`), or its route.
+    """
+    match = getattr(request, 'resolver_match', None)
+
+    if match is None:
+        return UNRESOLVED_ENDPOINT
+
+    return match.view_name or match.route
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Records each request's SQL query count, database time, slowest queries and response time by endpoint
+    (see `core/instrumentation.py`), and checks QUERY_BUDGETS. Place it first in MIDDLEWARE to include the session and
+    auth queries. Streamed response bodies are produced after it returns, so their time and queries aren't counted.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+
+        if self.is_async:
+            markcoroutinefunction(self)
+
+        install()
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        start = time.perf_counter()
+
+        with record_queries() as record:
+            response = self.get_response(request)
+
+        self.finish(request, start, record)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+
+        with record_queries() as record:
+            response = await self.get_response(request)
+
+        self.finish(request, start, record)
+        return response
+
+    def finish(self, request, start, record):
+        endpoint = endpoint_name(request)
+        budget = settings.QUERY_BUDGETS.get(endpoint)
+        registry.add(endpoint, time.perf_counter() - start, record, over_budget=budget is not None and record.count > budget)
+        check_query_budget(endpoint, record)
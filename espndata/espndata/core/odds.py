@@ -0,0 +1,114 @@
+from collections import defaultdict
+import numpy as np
+
+OVERROUND_METHODS = ['multiplicative', 'additive']
+
+
+def american_to_decimal(american):
+    """
+    Converts an array of American odds to decimal odds. Zero and NaN (missing) odds become NaN.
+    """
+    american = np.asarray(american, dtype=float)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        decimal = np.where(american > 0, american / 100 + 1, 1 - 100 / american)
+
+    return np.where((american == 0) | np.isnan(american), np.nan, decimal)
+
+
+def decimal_to_american(decimal):
+    """
+    Converts an array of decimal odds to American odds. Odds of 1.0 or less and NaN become NaN.
+    """
+    decimal = np.asarray(decimal, dtype=float)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        american = np.where(decimal >= 2, (decimal - 1) * 100, -100 / (decimal - 1))
+
+    return np.where(decimal > 1, american, np.nan)
+
+
+def decimal_to_implied(decimal):
+    """
+    Converts an array of decimal odds to implied probabilities (0-1), overround included.
+    """
+    decimal = np.asarray(decimal, dtype=float)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(decimal > 1, 1 / decimal, np.nan)
+
+
+def american_to_implied(american):
+    return decimal_to_implied(american_to_decimal(american))
+
+
+def remove_overround(home_implied, away_implied, method='multiplicative'):
+    """
+    Removes the bookmaker's margin from both sides of each game.
+    `multiplicative` scales both probabilities by the book sum; `additive` subtracts half the margin from each side.
+    Returns (home fair probability, away fair probability, overround), all arrays; games missing a side are NaN.
+    """
+    home_implied = np.asarray(home_implied, dtype=float)
+    away_implied = np.asarray(away_implied, dtype=float)
+    book_sum = home_implied + away_implied
+    overround = book_sum - 1
+
+    if method == 'multiplicative':
+        return home_implied / book_sum, away_implied / book_sum, overround
+    if method == 'additive':
+        return home_implied - overround / 2, away_implied - overround / 2, overround
+
+    raise ValueError(f'Unknown overround method {method!r}; expected one of {OVERROUND_METHODS}')
+
+
+def edge(probability, fair_probability):
+    """
+    Returns how far a model's (e.g. ESPN's) probability sits above the market's fair probability.
+    """
+    return np.asarray(probability, dtype=float) - np.asarray(fair_probability, dtype=float)
+
+
+def _optional(value, digits=4):
+    return None if np.isnan(value) else round(float(value), digits)
+
+
+def fill_odds_columns(team_predictions, method='multiplicative'):
+    """
+    Sets `implied_probability`, `fair_probability`, `overround` and `edge` (all in percent, like `win_probability`)
+    on TeamPredictions, computed for the whole batch at once. Predictions are paired by event;
+    columns stay None where either side's moneyline is missing.
+    """
+    by_event = defaultdict(list)
+
+    for prediction in team_predictions:
+        by_event[prediction.event_id or id(prediction.event)].append(prediction)
+
+    pairs = [pair for pair in by_event.values() if len(pair) == 2]
+
+    if not pairs:
+        return team_predictions
+
+    columns = np.array(
+        [
+            [
+                float(prediction.moneyline) if prediction.moneyline is not None else np.nan,
+                float(prediction.win_probability) / 100,
+            ]
+            for pair in pairs
+            for prediction in pair
+        ],
+        dtype=float,
+    ).reshape(len(pairs), 2, 2)    # game, side, (decimal odds, win probability)
+    implied = decimal_to_implied(columns[:, :, 0])
+    first_fair, second_fair, overround = remove_overround(implied[:, 0], implied[:, 1], method)
+    fair = np.stack([first_fair, second_fair], axis=1)
+    edges = edge(columns[:, :, 1], fair)
+
+    for game, pair in enumerate(pairs):
+        for side, prediction in enumerate(pair):
+            prediction.implied_probability = _optional(implied[game, side] * 100)
+            prediction.fair_probability = _optional(fair[game, side] * 100)
+            prediction.overround = _optional(overround[game] * 100)
+            prediction.edge = _optional(edges[game, side] * 100)
+
+    return team_predictions
@@ -0,0 +1,183 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from collections import Counter
+import cProfile
+from datetime import datetime
+import io
+import logging
+from pathlib import Path
+import pstats
+import sys
+import threading
+import tracemalloc
+
+from espndata.core.sentry import capture_exception
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ['cpu', 'memory', 'sample']
+MEMORY_SNAPSHOTS_PER_STAGE = 3     # stage runs diffed per stage; bounds tracemalloc snapshot overhead
+TOP_ALLOCATORS = 15
+
+
+class StackSampler(threading.Thread):
+    """
+    Low-overhead sampling profiler. Periodically records the main thread's stack and counts collapsed stacks
+    (`file:function;file:function ...`), the input format of flame graph tools.
+    """
+    def __init__(self, interval):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.target_thread_id = threading.main_thread().ident
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.target_thread_id)
+            stack = []
+
+            while frame is not None:
+                stack.append(f'{Path(frame.f_code.co_filename).name}:{frame.f_code.co_name}')
+                frame = frame.f_back
+
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+class CommandProfiler:
+    """
+    Wraps a command run with the requested profiling modes and writes their output to RUN_REPORT_DIR:
+    - cpu: cProfile `.pstats` dump plus a text summary of the top functions
+    - memory: tracemalloc top allocators for the whole run and per instrumented stage
+    - sample: collapsed stacks from a StackSampler, cheap enough to leave on in production
+    """
+    def __init__(self, command_name, modes, sample_interval=0.05):
+        self.command_name = command_name
+        self.modes = set(modes)
+        self.sample_interval = sample_interval
+        self.cpu_profile = None
+        self.sampler = None
+        self.stage_starts = {}
+        self.stage_allocators = {}      # stage -> Counter of allocation site -> bytes
+        self.stage_samples = Counter()  # stage -> number of diffed runs
+
+    def __enter__(self):
+        if 'memory' in self.modes:
+            tracemalloc.start(10)
+        if 'sample' in self.modes:
+            self.sampler = StackSampler(self.sample_interval)
+            self.sampler.start()
+        if 'cpu' in self.modes:
+            self.cpu_profile = cProfile.Profile()
+            self.cpu_profile.enable()
+
+        return self
+
+    def __exit__(self, *exc_info):
+        if not self.modes:
+            return
+
+        if self.cpu_profile:
+            self.cpu_profile.disable()
+        if self.sampler:
+            self.sampler.stop()
+
+        output_dir = Path(settings.RUN_REPORT_DIR)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        prefix = output_dir / f'{self.command_name}_{datetime.now():%Y%m%dT%H%M%S}'
+
+        if self.cpu_profile:
+            self.write_cpu_profile(prefix)
+        if 'memory' in self.modes:
+            self.write_memory_profile(prefix)
+            tracemalloc.stop()
+        if self.sampler:
+            self.write_samples(prefix)
+
+    def watch(self, metrics):
+        """
+        Attributes memory allocations to the stages timed by the passed RunMetrics.
+        """
+        if 'memory' in self.modes:
+            metrics.stage_listeners.append(self.on_stage)
+
+    def on_stage(self, stage, event):
+        if self.stage_samples[stage] >= MEMORY_SNAPSHOTS_PER_STAGE:
+            return
+
+        if event == 'start':
+            self.stage_starts[stage] = tracemalloc.take_snapshot()
+        elif stage in self.stage_starts:
+            diff = tracemalloc.take_snapshot().compare_to(self.stage_starts.pop(stage), 'lineno')
+            allocators = self.stage_allocators.setdefault(stage, Counter())
+
+            for stat in diff[:TOP_ALLOCATORS]:
+                allocators[str(stat.traceback[0])] += stat.size_diff
+
+            self.stage_samples[stage] += 1
+
+    def write_cpu_profile(self, prefix):
+        self.cpu_profile.dump_stats(f'{prefix}.pstats')
+        summary = io.StringIO()
+        pstats.Stats(self.cpu_profile, stream=summary).sort_stats('cumulative').print_stats(40)
+
+        with open(f'{prefix}_cpu.txt', 'w') as summary_file:
+            summary_file.write(summary.getvalue())
+
+        logger.info(f'CPU profile written to {prefix}.pstats')
+
+    def write_memory_profile(self, prefix):
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [f'Traced memory: current {current / 1024:.1f} KiB, peak {peak / 1024:.1f} KiB', '', 'Top allocators (whole run):']
+        lines += [f'  {stat}' for stat in tracemalloc.take_snapshot().statistics('lineno')[:TOP_ALLOCATORS]]
+
+        for stage, allocators in self.stage_allocators.items():
+            lines += ['', f'Top allocators during `{stage}` (net bytes over {self.stage_samples[stage]} sampled runs):']
+            lines += [f'  {site}: {size / 1024:.1f} KiB' for site, size in allocators.most_common(TOP_ALLOCATORS)]
+
+        with open(f'{prefix}_memory.txt', 'w') as memory_file:
+            memory_file.write('\n'.join(lines) + '\n')
+
+        logger.info(f'Memory profile written to {prefix}_memory.txt')
+
+    def write_samples(self, prefix):
+        with open(f'{prefix}.folded', 'w') as folded_file:
+            for stack, count in self.sampler.stacks.most_common():
+                folded_file.write(f'{stack} {count}\n')
+
+        logger.info(f'Stack samples written to {prefix}.folded')
+
+
+class ProfiledCommand(BaseCommand):
+    """
+    Base class for management commands that adds the shared `--profile` options.
+    Commands that time stages with RunMetrics should pass it to `self.profiler.watch()`.
+    """
+    def create_parser(self, prog_name, subcommand, **kwargs):
+        parser = super().create_parser(prog_name, subcommand, **kwargs)
+        parser.add_argument(
+            '--profile',
+            action='append',
+            choices=PROFILE_MODES,
+            help='Profile the run. May be repeated. Output is written next to the run reports.',
+        )
+        parser.add_argument('--profile-interval', type=float, default=0.05, help='Seconds between stack samples in `sample` mode.')
+        return parser
+
+    def execute(self, *args, **options):
+        command_name = self.__module__.rsplit('.', 1)[-1]
+
+        with CommandProfiler(command_name, options.get('profile') or [], options.get('profile_interval', 0.05)) as profiler:
+            self.profiler = profiler
+
+            try:
+                return super().execute(*args, **options)
+            except Exception as e:
+                capture_exception(e)
+                raise
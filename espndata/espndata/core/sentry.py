@@ -0,0 +1,74 @@
+from django.conf import settings
+
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+_init_lock = threading.Lock()
+_initialized = False
+
+
+def init_sentry():
+    """
+    Initialises Sentry the first time it is needed, if SENTRY_DSN is configured. Returns whether Sentry is active.
+    `sentry_sdk` and its Django integration are imported here rather than in settings, so the many commands that
+    never report an error don't pay for loading them at startup.
+    """
+    global _initialized
+
+    if not settings.SENTRY_DSN:
+        return False
+
+    with _init_lock:
+        if not _initialized:
+            import sentry_sdk
+            from sentry_sdk.integrations.django import DjangoIntegration
+            from sentry_sdk.integrations.logging import LoggingIntegration
+
+            sentry_sdk.init(
+                dsn=settings.SENTRY_DSN,
+                # Error logs are reported by SentryErrorHandler, which also covers errors logged before initialisation
+                integrations=[DjangoIntegration(), LoggingIntegration(event_level=None)],
+                sample_rate=1.0,
+                enable_logs=True,
+                send_default_pii=False,
+                environment='development' if settings.DEBUG else 'production',
+            )
+            _initialized = True
+            logger.debug('Sentry initialised')
+
+    return True
+
+
+def capture_exception(error=None):
+    """
+    Reports an exception to Sentry (initialising it if needed). Does nothing without a SENTRY_DSN.
+    """
+    if not init_sentry():
+        return None
+
+    import sentry_sdk
+    return sentry_sdk.capture_exception(error)
+
+
+class SentryErrorHandler(logging.Handler):
+    """
+    Reports ERROR log records to Sentry, initialising it on the first one.
+    """
+    def __init__(self):
+        super().__init__(level=logging.ERROR)
+
+    def emit(self, record):
+        try:
+            if not init_sentry():
+                return
+
+            import sentry_sdk
+
+            if record.exc_info:
+                sentry_sdk.capture_exception(record.exc_info)
+            else:
+                sentry_sdk.capture_message(record.getMessage(), level='error')
+        except Exception:
+            self.handleError(record)
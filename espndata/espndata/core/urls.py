@@ -3,5 +3,5 @@ from django.urls import path
 from espndata.core import views
 
 urlpatterns = [
-    
+    path('instrumentation/', views.InstrumentationStats.as_view(), name='instrumentation'),
 ]
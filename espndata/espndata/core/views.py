@@ -0,0 +1,19 @@
+from django.http import JsonResponse
+from django.views import View
+
+from espndata.core.instrumentation import registry
+from espndata.mixins import SuperuserRequiredMixin
+
+
+class InstrumentationStats(SuperuserRequiredMixin, View):
+    """
+    Returns this process's rolling request statistics by endpoint, as JSON: requests, response time, query count and
+    database time percentiles over the last INSTRUMENTATION_WINDOW requests, and the slowest queries seen.
+    POST clears them.
+    """
+    def get(self, request, *args, **kwargs):
+        return JsonResponse({'endpoints': registry.summary()})
+
+    def post(self, request, *args, **kwargs):
+        registry.reset()
+        return JsonResponse({'endpoints': {}})
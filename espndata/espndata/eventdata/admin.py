@@ -1,5 +0,0 @@
-from django.contrib import admin
-
-from espndata.eventdata.models import Event
-
-admin.site.register(Event)
@@ -0,0 +1,306 @@
+from django.conf import settings
+
+import fcntl
+import json
+import logging
+import mmap
+import numpy as np
+import os
+from pathlib import Path
+import threading
+import zstandard
+
+logger = logging.getLogger(__name__)
+
+INDEX_DTYPE = np.dtype([
+    ('espn_id', '<i8'),
+    ('segment', '<u2'),
+    ('dict_id', '<u4'),     # 0 when the frame was compressed without a dictionary
+    ('offset', '<u8'),
+    ('length', '<u4'),
+])
+DICTIONARY_SIZE = 112 * 1024
+
+
+class PayloadArchive:
+    """
+    Append-only archive of one league's raw summary payloads.
+
+    Each payload is an independent zstd frame, compressed with the league's latest trained dictionary and appended to
+    a segment file (`segment-0001.zst`, ...). A fixed-width sidecar index (`index.bin`, INDEX_DTYPE records) maps
+    ESPN IDs to (segment, offset, length); readers memory-map the segments, so fetching one payload is a dictionary lookup,
+    a slice and a decompress. Appends from several processes are serialised with a lock on the index file.
+    A re-archived ESPN ID shadows its earlier frames.
+    """
+    def __init__(self, league_name, root=None):
+        self.directory = Path(root or settings.PAYLOAD_ARCHIVE_DIR) / league_name
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.directory / 'index.bin'
+        self.index_path.touch(exist_ok=True)
+        self.current_dict_path = self.directory / 'current-dict'
+        self.train_lock_path = self.directory / 'train.lock'
+        self.train_failed_path = self.directory / 'train-failed'     # payload count of the last failed training
+        self.level = settings.PAYLOAD_ARCHIVE_COMPRESSION_LEVEL
+        self.segment_max_bytes = settings.PAYLOAD_ARCHIVE_SEGMENT_BYTES
+        self.positions = {}         # espn_id -> index record
+        self.index_bytes_read = 0
+        self.segments = {}          # segment number -> (file, mmap)
+        self.dictionaries = {}      # dict_id -> ZstdCompressionDict
+        self.decompressors = {}
+        self.lock = threading.Lock()
+
+    def segment_path(self, segment):
+        return self.directory / f'segment-{segment:04d}.zst'
+
+    def dictionary_paths(self):
+        return sorted(self.directory.glob('dict-*.zdict'))
+
+    def get_dictionary(self, dict_id):
+        if dict_id not in self.dictionaries:
+            with open(self.directory / f'dict-{dict_id}.zdict', 'rb') as dict_file:
+                self.dictionaries[dict_id] = zstandard.ZstdCompressionDict(dict_file.read())
+
+        return self.dictionaries[dict_id]
+
+    def latest_dictionary(self):
+        """
+        Returns the dictionary new frames are compressed with, recorded by ID in the `current-dict` file
+        (dictionary IDs are random, so file names don't order them). Archives from before the file existed
+        fall back to the most recently written dictionary. Returns None if none has been trained.
+        """
+        try:
+            return self.get_dictionary(int(self.current_dict_path.read_text()))
+        except FileNotFoundError:
+            paths = self.dictionary_paths()
+
+        if not paths:
+            return None
+
+        latest = max(paths, key=lambda path: path.stat().st_mtime)
+        return self.get_dictionary(int(latest.stem.split('-')[1]))
+
+    def train_dictionary(self, samples, size=DICTIONARY_SIZE):
+        """
+        Trains a dictionary on sample payloads (bytes) and makes it the one new frames are compressed with.
+        Frames compressed with earlier dictionaries stay readable. Returns the dictionary ID.
+        """
+        dictionary = zstandard.train_dictionary(size, list(samples), level=self.level)
+        dict_id = dictionary.dict_id()
+
+        with open(self.directory / f'dict-{dict_id}.zdict', 'wb') as dict_file:
+            dict_file.write(dictionary.as_bytes())
+
+        # Switched by rename, so concurrent appenders see either the old or the new ID
+        staging_path = self.current_dict_path.with_suffix('.tmp')
+        staging_path.write_text(str(dict_id))
+        staging_path.replace(self.current_dict_path)
+        self.dictionaries[dict_id] = dictionary
+        return dict_id
+
+    def failed_training_count(self):
+        try:
+            return int(self.train_failed_path.read_text())
+        except FileNotFoundError:
+            return 0
+
+    def train_if_due(self):
+        """
+        Trains the archive's first dictionary on its payloads once PAYLOAD_ARCHIVE_TRAIN_AFTER have been archived.
+        Processes train one at a time under a lock on `train.lock` and re-check for a dictionary inside it, so only one
+        is installed. A failed training records the payload count in `train-failed` and is only retried once the
+        archive has doubled. Returns the new dictionary ID, or None.
+        """
+        if not settings.PAYLOAD_ARCHIVE_TRAIN_AFTER:
+            return None
+
+        due_at = max(settings.PAYLOAD_ARCHIVE_TRAIN_AFTER, 2 * self.failed_training_count())
+
+        if len(self) < due_at:
+            return None
+
+        with open(self.train_lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+            try:
+                if self.latest_dictionary() is not None or len(self) < 2 * self.failed_training_count():
+                    return None
+
+                sample_ids = self.ids()
+
+                try:
+                    dict_id = self.train_dictionary(self.get(sample_id) for sample_id in sample_ids)
+                except zstandard.ZstdError as error:
+                    self.train_failed_path.write_text(str(len(sample_ids)))
+                    logger.warning(
+                        f'Could not train a payload dictionary for {self.directory.name} on {len(sample_ids)} payloads; '
+                        f'retrying at {2 * len(sample_ids)}. Error: {error}'
+                    )
+                    return None
+
+                self.train_failed_path.unlink(missing_ok=True)
+                logger.info(f'Trained payload dictionary {dict_id} for {self.directory.name} on {len(sample_ids)} payloads')
+                return dict_id
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def refresh_index(self):
+        """
+        Reads index records appended since the last refresh (by this or any other process).
+        """
+        size = self.index_path.stat().st_size
+        size -= size % INDEX_DTYPE.itemsize     # ignore a record still being written
+
+        if size <= self.index_bytes_read:
+            return
+
+        with open(self.index_path, 'rb') as index_file:
+            index_file.seek(self.index_bytes_read)
+            records = np.frombuffer(index_file.read(size - self.index_bytes_read), dtype=INDEX_DTYPE)
+
+        self.positions.update(zip(records['espn_id'].tolist(), records))
+        self.index_bytes_read = size
+
+    def append(self, espn_id, payload):
+        """
+        Compresses and appends one raw payload (bytes). Returns the compressed size.
+        """
+        dictionary = self.latest_dictionary()
+        dict_id = dictionary.dict_id() if dictionary else 0
+        compressor = zstandard.ZstdCompressor(level=self.level, dict_data=dictionary)
+        frame = compressor.compress(payload)
+
+        with open(self.index_path, 'ab') as index_file:
+            fcntl.flock(index_file, fcntl.LOCK_EX)
+
+            try:
+                segment = max([int(path.stem.split('-')[1]) for path in self.directory.glob('segment-*.zst')], default=1)
+
+                if self.segment_path(segment).exists() and self.segment_path(segment).stat().st_size + len(frame) > self.segment_max_bytes:
+                    segment += 1
+
+                with open(self.segment_path(segment), 'ab') as segment_file:
+                    offset = segment_file.tell()
+                    segment_file.write(frame)
+                    segment_file.flush()
+                    os.fsync(segment_file.fileno())
+
+                # The index record is written only once its frame is durable, so a crash leaves no dangling entry
+                record = np.array([(int(espn_id), segment, dict_id, offset, len(frame))], dtype=INDEX_DTYPE)
+                index_file.write(record.tobytes())
+                index_file.flush()
+            finally:
+                fcntl.flock(index_file, fcntl.LOCK_UN)
+
+        if not dict_id:
+            self.train_if_due()
+
+        return len(frame)
+
+    def get_segment(self, segment, end):
+        """
+        Returns a memory map of the segment covering at least `end` bytes, remapping it if it has grown.
+        """
+        if segment not in self.segments or len(self.segments[segment][1]) < end:
+            if segment in self.segments:
+                segment_file, segment_map = self.segments.pop(segment)
+                segment_map.close()
+                segment_file.close()
+
+            segment_file = open(self.segment_path(segment), 'rb')
+            self.segments[segment] = (segment_file, mmap.mmap(segment_file.fileno(), 0, access=mmap.ACCESS_READ))
+
+        return self.segments[segment][1]
+
+    def get_frame(self, espn_id):
+        """
+        Returns (compressed frame, dictionary ID) for `espn_id`. Call with `self.lock` held.
+        """
+        espn_id = int(espn_id)
+
+        if espn_id not in self.positions:
+            self.refresh_index()
+
+        record = self.positions[espn_id]
+        offset, length = int(record['offset']), int(record['length'])
+        return self.get_segment(int(record['segment']), offset + length)[offset:offset + length], int(record['dict_id'])
+
+    def open(self, espn_id):
+        """
+        Returns a binary file object that decompresses the payload archived for `espn_id` as it is read,
+        for streaming parsers. Raises KeyError if it was never archived.
+        """
+        with self.lock:
+            frame, dict_id = self.get_frame(espn_id)
+            dictionary = self.get_dictionary(dict_id) if dict_id else None
+
+        return zstandard.ZstdDecompressor(dict_data=dictionary).stream_reader(frame)
+
+    def get(self, espn_id):
+        """
+        Returns the raw payload (bytes) archived for `espn_id`. Raises KeyError if it was never archived.
+        """
+        with self.lock:
+            frame, dict_id = self.get_frame(espn_id)
+
+            if dict_id not in self.decompressors:
+                dictionary = self.get_dictionary(dict_id) if dict_id else None
+                self.decompressors[dict_id] = zstandard.ZstdDecompressor(dict_data=dictionary)
+
+            return self.decompressors[dict_id].decompress(frame)
+
+    def get_json(self, espn_id):
+        return json.loads(self.get(espn_id))
+
+    def ids(self):
+        with self.lock:
+            self.refresh_index()
+            return list(self.positions)
+
+    def __contains__(self, espn_id):
+        with self.lock:
+            self.refresh_index()
+            return int(espn_id) in self.positions
+
+    def __len__(self):
+        with self.lock:
+            self.refresh_index()
+            return len(self.positions)
+
+    def stats(self):
+        """
+        Returns payload count, dictionaries and compressed bytes on disk (segments include shadowed frames).
+        """
+        with self.lock:
+            self.refresh_index()
+
+        return {
+            'payloads': len(self.positions),
+            'dictionaries': len(self.dictionary_paths()),
+            'compressed_bytes': sum(path.stat().st_size for path in self.directory.glob('segment-*.zst')),
+            'index_bytes': self.index_path.stat().st_size,
+        }
+
+    def close(self):
+        for segment_file, segment_map in self.segments.values():
+            segment_map.close()
+            segment_file.close()
+
+        self.segments = {}
+
+
+_archives = {}
+_archives_lock = threading.Lock()
+
+
+def archive_for(league):
+    """
+    Returns the league's shared PayloadArchive, or None when PAYLOAD_ARCHIVE_ENABLED is off.
+    """
+    if not settings.PAYLOAD_ARCHIVE_ENABLED:
+        return None
+
+    with _archives_lock:
+        if league.espn_name not in _archives:
+            _archives[league.espn_name] = PayloadArchive(league.espn_name)
+
+        return _archives[league.espn_name]
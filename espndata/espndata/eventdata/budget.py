@@ -0,0 +1,130 @@
+from contextlib import contextmanager
+import fcntl
+import json
+import logging
+from pathlib import Path
+import time
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+REQUEST_BUDGETS = {                 # host -> (requests per second, burst), shared by every process on this machine
+    'site.api.espn.com': (2.0, 4),
+    'espn.com': (1.0, 4),
+}
+DEFAULT_REQUEST_BUDGET = (1.0, 4)
+PRIORITY_WEIGHTS = {                # relative share of a saturated host each priority gets
+    'high': 4,                      # the daily collector and live tracking
+    'normal': 2,                    # summary collection
+    'low': 1,                       # backfills
+}
+BUDGET_STATE_PATH = Path(__file__).resolve().parent.parent / '_raw_data' / 'request_budget.json'
+MAX_DEFER_SECONDS = 300             # longest a Retry-After may pause a host for every process
+
+
+def request_interval(url):
+    """
+    Returns the steady-state seconds between requests to the URL's host.
+    """
+    return 1 / REQUEST_BUDGETS.get(urlsplit(url).hostname, DEFAULT_REQUEST_BUDGET)[0]
+
+
+class RequestBudget:
+    """
+    Token bucket per ESPN host, shared by every process (and thread) on this machine through a locked state file.
+
+    A host's bucket holds up to `burst` tokens and refills at its requests per second; its state records when the bucket
+    will be full again, so taking a token is a short locked read-modify-write. Priorities waiting on the same host are
+    served by stride scheduling: each token taken advances its priority's pass by 1 / PRIORITY_WEIGHTS[priority], and
+    the waiting priority with the lowest pass goes next. A saturated host's rate is split 4:2:1 between high, normal and
+    low priority, and any priority running alone gets the full rate. Commands of the same priority share its part.
+    """
+    def __init__(self, priority='normal', path=None, budgets=None):
+        if priority not in PRIORITY_WEIGHTS:
+            raise ValueError(f'Unknown request priority {priority!r}; expected one of {", ".join(PRIORITY_WEIGHTS)}')
+
+        self.priority = priority
+        self.path = Path(path or BUDGET_STATE_PATH)
+        self.budgets = budgets or REQUEST_BUDGETS
+
+    @contextmanager
+    def state(self):
+        """
+        Yields the {host: state} dictionary under an exclusive lock, and writes it back if it was changed.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(self.path, 'a+') as state_file:
+            fcntl.flock(state_file, fcntl.LOCK_EX)
+
+            try:
+                state_file.seek(0)
+                contents = state_file.read()
+                state = json.loads(contents) if contents else {}
+                original = json.dumps(state, sort_keys=True)
+                yield state
+
+                if json.dumps(state, sort_keys=True) != original:
+                    state_file.seek(0)
+                    state_file.truncate()
+                    state_file.write(json.dumps(state))
+                    state_file.flush()
+            finally:
+                fcntl.flock(state_file, fcntl.LOCK_UN)
+
+    def host_budget(self, host):
+        rate, burst = self.budgets.get(host, DEFAULT_REQUEST_BUDGET)
+        return 1 / rate, burst
+
+    def host_state(self, state, host):
+        return state.setdefault(host, {'full_at': 0.0, 'passes': {}, 'waiting': {}})
+
+    def acquire(self, url):
+        """
+        Blocks until it is this priority's turn and the URL's host has a token, and takes it. Returns the seconds waited.
+        """
+        host = urlsplit(url).hostname
+        interval, burst = self.host_budget(host)
+        waited = 0.0
+
+        while True:
+            with self.state() as state:
+                bucket = self.host_state(state, host)
+                now = time.time()
+                full_at = max(bucket['full_at'], now)
+                token_wait = (full_at - now) - (burst - 1) * interval
+                passes, waiting = bucket['passes'], bucket['waiting']
+                active = [priority for priority, expires in waiting.items() if expires > now and priority != self.priority]
+
+                if waiting.get(self.priority, 0.0) < now - 2 * interval:
+                    # Joining after being idle: don't let its old credit starve the priorities already waiting
+                    passes[self.priority] = max([passes.get(self.priority, 0.0)] + [passes.get(priority, 0.0) for priority in active])
+
+                # Marks this priority as waiting; the mark lapses unless a request of the priority renews it
+                waiting[self.priority] = now + max(token_wait, 0) + 2 * interval
+                is_turn = all(passes[self.priority] <= passes.get(priority, 0.0) for priority in active)
+
+                if token_wait <= 0 and is_turn:
+                    bucket['full_at'] = full_at + interval
+                    passes[self.priority] += 1 / PRIORITY_WEIGHTS[self.priority]
+                    waiting[self.priority] = now
+                    return waited
+
+            # Another priority's turn: check back once it has had time to take its token
+            sleep = token_wait if token_wait > 0 else interval / 4
+            time.sleep(sleep)
+            waited += sleep
+
+    def defer(self, url, seconds):
+        """
+        Empties the URL's host bucket until `seconds` from now (e.g. for a 429's Retry-After), for every process sharing it.
+        """
+        host = urlsplit(url).hostname
+        interval, burst = self.host_budget(host)
+        seconds = min(seconds, MAX_DEFER_SECONDS)
+
+        with self.state() as state:
+            bucket = self.host_state(state, host)
+            bucket['full_at'] = max(bucket['full_at'], time.time() + seconds + burst * interval)
+
+        logger.warning(f'Requests to {host} paused for {seconds:.1f}s across all processes')
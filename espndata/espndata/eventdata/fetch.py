@@ -0,0 +1,221 @@
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import logging
+import random
+import requests
+import threading
+import time
+from urllib.parse import urlsplit
+
+from espndata.eventdata.budget import RequestBudget
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    'Accept': 'application/xml; charset=utf-8',
+    'User-Agent': 'foo',
+}
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+BREAKER_FAILURE_THRESHOLD = 5       # consecutive retryable failures that open an endpoint's circuit
+BREAKER_RESET_SECONDS = 60          # how long an open circuit fails fast before letting a trial request through
+
+
+class FetchError(RuntimeError):
+    """
+    Base class for requests the FetchEngine gave up on.
+    """
+
+
+class PermanentFetchError(FetchError):
+    """
+    Raised for responses retrying cannot fix (4xx other than 408/425/429), e.g. a 404 for a nonexistent event ID.
+    """
+    def __init__(self, message, status_code):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class FetchDeadlineExceeded(FetchError):
+    """
+    Raised when a request's retries would run past its deadline budget.
+    """
+
+
+class CircuitOpenError(FetchError):
+    """
+    Raised without making a request while an endpoint's circuit breaker is open.
+    """
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint circuit breaker. Opens after `failure_threshold` consecutive retryable failures,
+    fails fast for `reset_seconds`, then lets a single trial request through (half-open).
+    """
+    def __init__(self, failure_threshold=BREAKER_FAILURE_THRESHOLD, reset_seconds=BREAKER_RESET_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self.lock = threading.Lock()
+
+    def allow(self):
+        with self.lock:
+            if self.opened_at is None:
+                return True
+
+            if time.monotonic() - self.opened_at >= self.reset_seconds and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return True
+
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            self.trial_in_flight = False
+
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+def parse_retry_after(value):
+    """
+    Returns the number of seconds a `Retry-After` header asks for (delta-seconds or HTTP-date), or None.
+    """
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class FetchEngine:
+    """
+    Shared HTTP client for ESPN requests.
+    Classifies failures (permanent 4xx vs retryable), honours Retry-After, backs off with decorrelated jitter,
+    trips a circuit breaker per endpoint and never retries past a request's deadline budget.
+    Every attempt takes a token from the host's RequestBudget, shared with the other commands running on this machine;
+    a 429 pauses the host for all of them.
+    """
+    def __init__(
+        self,
+        metrics=None,
+        max_attempts=5,
+        base_delay=1.0,
+        max_delay=30.0,
+        deadline=120.0,
+        timeout=30,
+        headers=None,
+        budget=None,
+    ):
+        self.metrics = metrics
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(headers or DEFAULT_HEADERS)
+        self.breakers = {}
+        self.budget = budget or RequestBudget()
+
+    def get_breaker(self, url):
+        parts = urlsplit(url)
+        endpoint = f'{parts.netloc}{parts.path}'
+
+        if endpoint not in self.breakers:
+            self.breakers[endpoint] = CircuitBreaker()
+
+        return self.breakers[endpoint]
+
+    def stage(self, name):
+        return self.metrics.stage(name) if self.metrics else nullcontext()
+
+    def next_delay(self, previous_delay):
+        """
+        Decorrelated jitter: a random delay between the base delay and three times the previous one, capped.
+        """
+        return min(self.max_delay, random.uniform(self.base_delay, previous_delay * 3))
+
+    def get(self, url, params=None, deadline=None):
+        """
+        Executes a GET request and returns the response.
+        Raises PermanentFetchError, CircuitOpenError or FetchDeadlineExceeded (all FetchErrors) if it gives up.
+        """
+        breaker = self.get_breaker(url)
+        expires = time.monotonic() + (deadline or self.deadline)
+        delay = self.base_delay
+        error = None
+
+        for attempt in range(self.max_attempts):
+            if not breaker.allow():
+                raise CircuitOpenError(f'Circuit open for {url}; failing fast')
+
+            retry_after = None
+            status_code = None
+
+            with self.stage('throttle'):
+                self.budget.acquire(url)
+
+            try:
+                with self.stage('fetch'):
+                    start = time.perf_counter()
+                    resp = self.session.get(url, params=params, timeout=min(self.timeout, max(expires - time.monotonic(), 1)))
+
+                if self.metrics:
+                    self.metrics.observe_fetch(time.perf_counter() - start, len(resp.content))
+
+                if resp.status_code < 400:
+                    breaker.record_success()
+                    return resp
+
+                if resp.status_code not in RETRYABLE_STATUSES:
+                    breaker.record_success()    # the endpoint answered; the request itself is bad
+                    raise PermanentFetchError(f'{resp.status_code} for {resp.url}', resp.status_code)
+
+                status_code = resp.status_code
+                error = f'HTTP {resp.status_code}'
+                retry_after = parse_retry_after(resp.headers.get('Retry-After'))
+            except requests.RequestException as e:     # connection errors and timeouts, but also truncated or undecodable bodies
+                error = str(e)
+
+            breaker.record_failure()
+
+            if attempt + 1 == self.max_attempts:
+                break
+
+            delay = retry_after if retry_after is not None else self.next_delay(delay)
+
+            if status_code == 429:
+                self.budget.defer(url, delay)
+
+            if time.monotonic() + delay > expires:
+                raise FetchDeadlineExceeded(f'Deadline exceeded fetching {url} after {attempt + 1} attempts: {error}')
+
+            logger.warning(f'Request failed {url}. Attempt {attempt + 1}/{self.max_attempts}. Error: {error}. Retrying in {delay:.1f}s')
+
+            if self.metrics:
+                self.metrics.record_retry(delay)
+
+            with self.stage('backoff'):
+                time.sleep(delay)
+
+        raise FetchError(f'Failed to fetch {url} after {self.max_attempts} attempts: {error}')
@@ -0,0 +1,145 @@
+from django.conf import settings
+
+from collections import Counter
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+import logging
+import zstandard
+
+from espndata.core.sentry import capture_exception
+from espndata.eventdata.archive import archive_for
+from espndata.eventdata.parsers import (
+    EventSkipped,
+    build_event_rows,
+    merge_summary,
+    needs_summary,
+    parse_scoreboard_event,
+    parse_summary,
+)
+from espndata.events.matchups import update_matchup_index
+from espndata.events.ratings import update_league_ratings
+from espndata.events.timeseries import series_from_summary
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ScoreboardRows:
+    """
+    Unsaved rows built from one scoreboard payload, plus the summary requests it took to build them.
+    """
+    events: list = field(default_factory=list)
+    team_predictions: list = field(default_factory=list)
+    series: list = field(default_factory=list)
+    events_seen: int = 0
+    summary_requests: int = 0
+    skips: Counter = field(default_factory=Counter)
+
+    @property
+    def summary_requests_saved(self):
+        """
+        Summary requests avoided compared to fetching one summary per new event.
+        """
+        return self.events_seen - self.summary_requests
+
+
+def archive_payload(league, espn_id, payload, metrics=None):
+    """
+    Keeps the raw summary payload in the league's PayloadArchive (when enabled).
+    Archiving failures are logged rather than failing ingestion.
+    """
+    archive = archive_for(league)
+
+    if archive is None:
+        return
+
+    try:
+        with metrics.stage('archive') if metrics else nullcontext():
+            compressed_bytes = archive.append(espn_id, payload)
+    except (OSError, zstandard.ZstdError) as e:     # ZstdError from training a dictionary inside `append()`
+        logger.error(f'Could not archive {league.espn_name} event {espn_id}: {e}')
+        return
+
+    if metrics:
+        metrics.increment('archived_bytes', compressed_bytes)
+
+
+def fetch_summary_rows(fetcher, metrics, league, espn_id):
+    """
+    Fetches and parses one event summary into unsaved rows.
+    Returns (event, team_predictions, series), where `series` may be None.
+    Raises FetchError if the request failed or EventSkipped if the summary is unusable.
+    """
+    summary_url = settings.BASE_ESPN_EVENT_SUMMARY_API_LINK.format(sport=league.sport, league=league.espn_name)
+    resp = fetcher.get(summary_url, {'event': espn_id})
+    archive_payload(league, espn_id, resp.content, metrics)
+
+    with metrics.stage('decode'):
+        event_summary = resp.json()
+
+    with metrics.stage('parse'):
+        parsed = parse_summary(event_summary)
+        parsed['espn_id'] = espn_id
+        event, team_predictions = build_event_rows(league, parsed)
+        series = series_from_summary(league, espn_id, event_summary)
+
+    return event, team_predictions, series
+
+
+def rows_from_scoreboard(fetcher, league, scoreboard, existing_ids, require_odds=True):
+    """
+    Builds rows for the scoreboard's events not in `existing_ids` (which is updated) straight from the scoreboard payload.
+    A summary is only requested for events missing fields the scoreboard lacks (see `needs_summary()`).
+    FetchErrors from summary requests propagate.
+    """
+    summary_url = settings.BASE_ESPN_EVENT_SUMMARY_API_LINK.format(sport=league.sport, league=league.espn_name)
+    rows = ScoreboardRows()
+
+    for scoreboard_event in scoreboard.get('events', []):
+        try:
+            parsed = parse_scoreboard_event(scoreboard_event)
+            series = None
+
+            if parsed['espn_id'] in existing_ids:
+                continue
+
+            rows.events_seen += 1
+
+            if needs_summary(parsed, require_odds):
+                resp = fetcher.get(summary_url, {'event': parsed['espn_id']})
+                archive_payload(league, parsed['espn_id'], resp.content)
+                event_summary = resp.json()
+                rows.summary_requests += 1
+                merge_summary(parsed, parse_summary(event_summary))
+                series = series_from_summary(league, parsed['espn_id'], event_summary)
+
+            event, team_predictions = build_event_rows(league, parsed)
+        except EventSkipped as e:
+            rows.skips[e.reason] += 1
+
+            if e.incomplete:
+                logger.warning(f'{league.display_name} event {scoreboard_event.get("id")} skipped: {e.reason}')
+            continue
+
+        rows.events.append(event)
+        rows.team_predictions += team_predictions
+        existing_ids.add(parsed['espn_id'])
+
+        if series:
+            rows.series.append(series)
+
+    return rows
+
+
+def update_league_indexes(league):
+    """
+    Brings the league's Elo ratings and matchup index up to date after new events were stored.
+    Failures are reported rather than raised: both can be rebuilt with `update_ratings`/`matchup_index`,
+    so they shouldn't fail the collection.
+    """
+    try:
+        update_league_ratings(league)
+        update_matchup_index(league)
+    except Exception as e:
+        capture_exception(e)
+        logger.error(f'{league.display_name} rating or matchup index update failed: {e}')
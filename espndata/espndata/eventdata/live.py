@@ -0,0 +1,280 @@
+from django.conf import settings
+from django.db import close_old_connections
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+import heapq
+import logging
+import requests
+import time
+
+from espndata.eventdata.budget import RequestBudget
+from espndata.eventdata.upsert import save_series
+from espndata.events.models import WinProbabilitySeries
+from espndata.events.timeseries import get_play_periods, pack_series
+
+logger = logging.getLogger(__name__)
+
+# Per sport: (regulation periods, "close" score margin, "blowout" score margin)
+SPORT_GAME_SHAPES = {
+    'football': (4, 8, 24),
+    'basketball': (4, 8, 20),
+    'baseball': (9, 2, 7),
+    'hockey': (3, 1, 4),
+}
+DEFAULT_GAME_SHAPE = (4, 7, 20)
+INTERMISSION_STATUSES = ('STATUS_HALFTIME', 'STATUS_END_PERIOD', 'STATUS_DELAYED', 'STATUS_RAIN_DELAY')
+
+
+@dataclass
+class LiveGame:
+    league_id: int
+    sport: str
+    espn_id: str
+    summary_url: str
+    next_poll: float = 0.0
+    packed: bytes = None    # home win percentages and play IDs last packed, to spot changed series
+    etag: str = None
+    last_modified: str = None
+    is_final: bool = False
+    situation: dict = field(default_factory=dict)
+    last_change: float = field(default_factory=time.monotonic)     # when its series last changed
+
+
+def poll_interval(sport, situation):
+    """
+    Returns the number of seconds until an in-progress game should be polled again.
+    Close games late in regulation are polled fastest; intermissions and blowouts slowest.
+    """
+    intervals = settings.LIVE_POLL_INTERVALS
+
+    if situation.get('status_name') in INTERMISSION_STATUSES:
+        return intervals['intermission']
+
+    regulation_periods, close_margin, blowout_margin = SPORT_GAME_SHAPES.get(sport, DEFAULT_GAME_SHAPE)
+    margin = abs(situation.get('home_score', 0) - situation.get('away_score', 0))
+    period = situation.get('period', 0)
+    is_late = period >= regulation_periods - (2 if sport == 'baseball' else 0)
+
+    if margin >= blowout_margin:
+        return intervals['blowout']
+
+    if is_late and margin <= close_margin:
+        return intervals['close_late']
+
+    return intervals['default']
+
+
+def parse_situation(competition):
+    """
+    Pulls the game state used to pick a polling interval out of a scoreboard competition.
+    """
+    status = competition.get('status', {})
+    scores = {
+        team.get('homeAway'): int(team.get('score') or 0)
+        for team in competition.get('competitors', [])
+    }
+
+    return {
+        'state': status.get('type', {}).get('state'),
+        'status_name': status.get('type', {}).get('name'),
+        'period': status.get('period', 0),
+        'home_score': scores.get('home', 0),
+        'away_score': scores.get('away', 0),
+    }
+
+
+class LiveTracker:
+    """
+    Polls in-progress events from one process and keeps their packed WinProbabilitySeries up to date in batches.
+    Scoreboards are polled every `LIVE_SCOREBOARD_INTERVAL` seconds to find live games and their situations;
+    each live game's summary is then polled on its own adaptive interval using conditional requests.
+    Every changed summary is repacked whole, so points ESPN revises mid-game are revised in the stored series too.
+    """
+    def __init__(self, leagues, max_workers=16):
+        self.leagues = leagues
+        self.max_workers = max_workers
+        self.session = requests.Session()
+        self.session.mount('https://', requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=max_workers))
+        self.budget = RequestBudget(priority='high')
+        self.games = {}         # (league id, espn id) -> LiveGame
+        self.abandoned = set()  # (league id, espn id) of games dropped for going LIVE_MAX_IDLE_SECONDS without changes
+        self.queue = []         # heap of (next poll, league id, espn id)
+        self.scoreboard_cache = {}      # url -> (etag, last modified, payload)
+        self.pending_series = {}        # (league id, espn id) -> latest unsaved WinProbabilitySeries
+        self.last_flush = time.monotonic()
+
+    def conditional_get(self, url, params, validators):
+        """
+        Executes a conditional GET using the passed (etag, last_modified) validators.
+        Returns (response, changed); `changed` is False on a 304 Not Modified.
+        """
+        etag, last_modified = validators
+        headers = {'User-Agent': 'foo'}
+
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        self.budget.acquire(url)
+        resp = self.session.get(url, headers=headers, params=params, timeout=15)
+
+        if resp.status_code == 304:
+            return resp, False
+
+        resp.raise_for_status()
+        return resp, True
+
+    def refresh_scoreboards(self):
+        """
+        Polls every league's scoreboard and starts or updates tracking of its live games.
+        """
+        for league in self.leagues:
+            url = settings.BASE_ESPN_SCOREBOARD_API_LINK.format(sport=league.sport, league=league.espn_name)
+            etag, last_modified, payload = self.scoreboard_cache.get(url, (None, None, None))
+
+            try:
+                resp, changed = self.conditional_get(url, None, (etag, last_modified))
+
+                if changed:
+                    payload = resp.json()
+                    self.scoreboard_cache[url] = (resp.headers.get('ETag'), resp.headers.get('Last-Modified'), payload)
+            except (requests.RequestException, ValueError) as e:
+                logger.warning(f'Scoreboard poll failed for {league.display_name}: {e}')
+                continue
+
+            listed = set()
+
+            for event in (payload or {}).get('events', []):
+                competition = next(iter(event.get('competitions', [])), {})
+                situation = parse_situation(competition)
+                key = (league.id, event.get('id'))
+                game = self.games.get(key)
+                listed.add(key)
+
+                if (situation['state'] != 'in' and not game) or key in self.abandoned:
+                    continue    # not started, finished before tracking began, or given up on
+
+                if not game:
+                    game = LiveGame(
+                        league_id=league.id,
+                        sport=league.sport,
+                        espn_id=event.get('id'),
+                        summary_url=settings.BASE_ESPN_EVENT_SUMMARY_API_LINK.format(sport=league.sport, league=league.espn_name),
+                    )
+                    self.games[key] = game
+                    heapq.heappush(self.queue, (0.0, league.id, game.espn_id))
+                    logger.info(f'Tracking {league.display_name} event {game.espn_id}')
+
+                game.situation = situation
+                game.is_final = situation['state'] == 'post'
+
+            # Games that left the scoreboard (date rollover, postponed or suspended mid-game) get one last poll
+            for key, game in self.games.items():
+                if key[0] == league.id and key not in listed and not game.is_final:
+                    logger.info(f'{league.display_name} event {game.espn_id} left the scoreboard; stopping tracking')
+                    game.is_final = True
+
+    def poll_game(self, game):
+        """
+        Fetches a game's summary (if changed) and returns its repacked WinProbabilitySeries (unsaved),
+        or None if the series is unchanged. Runs in a worker thread, so it never touches the database.
+        """
+        try:
+            resp, changed = self.conditional_get(game.summary_url, {'event': game.espn_id}, (game.etag, game.last_modified))
+        except requests.RequestException as e:
+            logger.warning(f'Summary poll failed for event {game.espn_id}: {e}')
+            return None
+
+        if not changed:
+            return None
+
+        game.etag = resp.headers.get('ETag')
+        game.last_modified = resp.headers.get('Last-Modified')
+        event_summary = resp.json()
+        fields = pack_series(event_summary.get('winprobability', []), play_periods=get_play_periods(event_summary), sport=game.sport)
+
+        if fields is None or fields['home_win_percentages'] + fields['play_ids'] == game.packed:
+            return None
+
+        game.packed = fields['home_win_percentages'] + fields['play_ids']
+        return WinProbabilitySeries(league_id=game.league_id, espn_id=game.espn_id, **fields)
+
+    def poll(self, game):
+        """
+        `poll_game()` for the worker threads: an unexpected payload costs that poll, not the tracking loop.
+        """
+        try:
+            return self.poll_game(game)
+        except Exception:
+            logger.exception(f'Summary poll failed for event {game.espn_id}')
+            return None
+
+    def pop_due(self, now):
+        due_games = []
+
+        while self.queue and self.queue[0][0] <= now:
+            _, league_id, espn_id = heapq.heappop(self.queue)
+            due_games.append(self.games[(league_id, espn_id)])
+
+        return due_games
+
+    def flush(self, force=False):
+        """
+        Upserts the changed series once `LIVE_WRITE_BATCH_SIZE` games have changed or `LIVE_FLUSH_SECONDS` have passed.
+        """
+        is_due = time.monotonic() - self.last_flush >= settings.LIVE_FLUSH_SECONDS
+
+        if self.pending_series and (force or is_due or len(self.pending_series) >= settings.LIVE_WRITE_BATCH_SIZE):
+            save_series(list(self.pending_series.values()))
+            logger.info(f'{len(self.pending_series)} win probability series written')
+            self.pending_series = {}
+
+        if force or is_due:
+            self.last_flush = time.monotonic()
+
+    def run(self, stop_when_idle=False):
+        """
+        Runs the tracking loop. If `stop_when_idle` is True, returns once no games are live.
+        """
+        next_scoreboard = 0.0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            try:
+                while True:
+                    now = time.monotonic()
+
+                    if now >= next_scoreboard:
+                        close_old_connections()
+                        self.refresh_scoreboards()
+                        next_scoreboard = now + settings.LIVE_SCOREBOARD_INTERVAL
+
+                        if stop_when_idle and not self.games:
+                            return
+
+                    due_games = self.pop_due(now)
+
+                    for game, series in zip(due_games, executor.map(self.poll, due_games)):
+                        if series:
+                            self.pending_series[(game.league_id, game.espn_id)] = series
+                            game.last_change = now
+
+                        if game.is_final:
+                            del self.games[(game.league_id, game.espn_id)]  # final poll done
+                            continue
+
+                        if now - game.last_change >= settings.LIVE_MAX_IDLE_SECONDS:
+                            logger.warning(f'No win probability changes for event {game.espn_id} in {settings.LIVE_MAX_IDLE_SECONDS}s; stopping tracking')
+                            del self.games[(game.league_id, game.espn_id)]
+                            self.abandoned.add((game.league_id, game.espn_id))
+                            continue
+
+                        game.next_poll = now + poll_interval(game.sport, game.situation)
+                        heapq.heappush(self.queue, (game.next_poll, game.league_id, game.espn_id))
+
+                    self.flush()
+                    wake = min(next_scoreboard, self.queue[0][0]) if self.queue else next_scoreboard
+                    time.sleep(max(wake - time.monotonic(), 0))
+            finally:
+                self.flush(force=True)
@@ -0,0 +1,89 @@
+from django.conf import settings
+
+import logging
+import random
+import time
+
+from espndata.core.profiling import ProfiledCommand
+from espndata.eventdata.archive import PayloadArchive
+from espndata.events.models import League
+
+logger = logging.getLogger(__name__)
+
+class Command(ProfiledCommand):
+    help = 'Reports on, retrains dictionaries for, and reads from the compressed raw summary payload archive.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--league', action='append', help='ESPN league name. May be repeated. Defaults to all leagues.')
+        parser.add_argument(
+            '--train',
+            action='store_true',
+            help='Train a new dictionary from the latest archived payloads. Only frames appended afterwards use it.',
+        )
+        parser.add_argument('--samples', type=int, default=settings.PAYLOAD_ARCHIVE_TRAIN_AFTER, help='Payloads to train on.')
+        parser.add_argument('--get', type=int, metavar='ESPN_ID', help='Write one archived payload to stdout (requires one --league).')
+        parser.add_argument(
+            '--benchmark',
+            type=int,
+            metavar='N',
+            help='Read N random archived payloads and report compression ratio and per-read latency.',
+        )
+
+    def handle(self, *args, **options):
+        leagues = League.objects.all()
+
+        if options['league']:
+            leagues = leagues.filter(espn_name__in=options['league'])
+
+        if options['get'] is not None:
+            if len(leagues) != 1:
+                logger.error('--get needs exactly one --league')
+                return
+
+            archive = PayloadArchive(leagues[0].espn_name)
+
+            try:
+                self.stdout.write(archive.get(options['get']).decode())
+            except KeyError:
+                logger.error(f'{leagues[0].espn_name} event {options["get"]} is not archived')
+            return
+
+        for league in leagues:
+            archive = PayloadArchive(league.espn_name)
+
+            if not len(archive):
+                continue
+
+            if options['train']:
+                sample_ids = archive.ids()[-options['samples']:]
+                dict_id = archive.train_dictionary(archive.get(espn_id) for espn_id in sample_ids)
+                self.stdout.write(f'{league.display_name}: trained dictionary {dict_id} on {len(sample_ids)} payloads')
+
+            stats = archive.stats()
+            self.stdout.write(
+                f'{league.display_name}: {stats["payloads"]} payloads, {stats["dictionaries"]} dictionaries, '
+                f'{stats["compressed_bytes"] / 1024 ** 2:.1f} MB compressed, {stats["index_bytes"] / 1024:.1f} KB index'
+            )
+
+            if options['benchmark']:
+                self.benchmark(archive, options['benchmark'])
+
+            archive.close()
+
+    def benchmark(self, archive, n):
+        sample_ids = random.sample(archive.ids(), min(n, len(archive)))
+        compressed_bytes = sum(int(archive.positions[espn_id]['length']) for espn_id in sample_ids)
+        raw_bytes = 0
+        timings = []
+
+        for espn_id in sample_ids:
+            start = time.perf_counter()
+            raw_bytes += len(archive.get(espn_id))
+            timings.append(time.perf_counter() - start)
+
+        timings.sort()
+        self.stdout.write(
+            f'  {len(sample_ids)} random reads: compression {raw_bytes / compressed_bytes:.1f}x, '
+            f'p50 {timings[len(timings) // 2] * 1000:.2f} ms, p95 {timings[int(len(timings) * 0.95)] * 1000:.2f} ms, '
+            f'{raw_bytes / 1024 ** 2 / sum(timings):.0f} MB/s'
+        )
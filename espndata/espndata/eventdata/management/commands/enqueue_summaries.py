@@ -0,0 +1,30 @@
+from django.conf import settings
+
+import json
+import logging
+
+from espndata.core.profiling import ProfiledCommand
+from espndata.eventdata.workqueue import enqueue
+from espndata.events.models import League
+
+logger = logging.getLogger(__name__)
+
+class Command(ProfiledCommand):
+    help = 'Moves the event IDs in `event_ids.json` into the summary work queue as batches for `summary_worker` processes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.WORK_QUEUE_BATCH_SIZE, help='Event IDs per task.')
+
+    def handle(self, *args, **options):
+        leagues_by_name = {league.espn_name: league for league in League.objects.all()}
+        ids_filepath = settings.BASE_DIR / 'espndata' / '_raw_data' / 'event_ids.json'
+
+        with open(ids_filepath, 'r') as ids_file:
+            ids_by_league = json.load(ids_file)
+
+        for league, ids_list in ids_by_league.items():
+            created = enqueue(leagues_by_name[league], ids_list, options['batch_size'])
+            logger.info(f'{league}: {len(ids_list)} event IDs read, {created} tasks created')
+
+        with open(ids_filepath, 'w') as ids_file:
+            json.dump({league: [] for league in ids_by_league}, ids_file)
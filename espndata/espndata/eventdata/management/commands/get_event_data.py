@@ -1,66 +1,141 @@
 from django.conf import settings
-from django.core.management import BaseCommand
+from django.db import transaction
+from django.utils.functional import cached_property
 
 from datetime import date, timedelta
-from dateutil import parser as dateparser
-import json
 import logging
-import requests
-import time
-from sentry_sdk import capture_exception
 
-from espndata.eventdata.models import Event, TeamPrediction
-from espndata.core.models import DataCollectionState
-from espndata.core.utils import american_to_decimal
+from espndata.core.odds import fill_odds_columns
+from espndata.core.profiling import ProfiledCommand
+from espndata.core.sentry import capture_exception
+from espndata.eventdata.budget import RequestBudget
+from espndata.eventdata.fetch import FetchEngine
+from espndata.eventdata.ingest import rows_from_scoreboard, update_league_indexes
+from espndata.eventdata.planner import ScoreboardWindow, mark_ingested, scoreboard_is_settled
+from espndata.eventdata.upsert import save_series
+from espndata.events.models import DataCollectionState, Event, TeamPrediction
 
 logger = logging.getLogger(__name__)
 
-class Command(BaseCommand):
-    help = ''
+class Command(ProfiledCommand):
+    help = 'Collects the latest window of events for each league from one scoreboard request per league, fetching summaries only where the scoreboard lacks data.'
+
+    @cached_property
+    def fetcher(self):
+        return FetchEngine(budget=RequestBudget(priority='high'))
 
     def handle(self, *args, **options):
-        self.today = date.today()
-        self.yesterday = self.today - timedelta(days=1)
+        today = date.today()
+
+        for league_state in DataCollectionState.objects.select_related('league'):
+            self.run_league(league_state, today)
+
+    def run_league(self, league_state, today):
+        """
+        Checks whether the state's league should be collected on `today` and, if so, collects it.
+        Returns True if a collection ran successfully, else returns False.
+        """
+        self.today = today
+        self.yesterday = today - timedelta(days=1)
+        check_collect = self.check_collect_today(league_state)
+
+        if not check_collect:
+            return False
+
+        try:
+            self.collect_league(league_state, check_collect)
+        except Exception as e:
+            capture_exception(e)
+            logger.error(f'{league_state.league.display_name} collection failed: {e}')
+            return False
+
+        return True
+
+    def collect_league(self, league_state, check_collect):
+        """
+        Collects one collection window of events for the state's league and advances its DataCollectionState.
+        A single scoreboard request covers the window; summaries are only requested for events missing probabilities or odds.
+        """
+        league = league_state.league
+        scoreboard_url = settings.BASE_ESPN_SCOREBOARD_API_LINK.format(sport=league.sport, league=league.espn_name)
+        window = self.get_window(league_state, check_collect)
+        scoreboard = self.fetcher.get(scoreboard_url, window.params(league)).json()
+        existing_ids = set(Event.objects.filter(league=league).values_list('espn_id', flat=True))
+        rows = rows_from_scoreboard(self.fetcher, league, scoreboard, existing_ids)
+
+        with transaction.atomic():
+            Event.objects.bulk_create(rows.events)
+            TeamPrediction.objects.bulk_create(fill_odds_columns(rows.team_predictions))
+            save_series(rows.series)
+            self.advance_state(league_state, check_collect, rows.events)
+
+            if scoreboard_is_settled(scoreboard, league, window):
+                mark_ingested(league, window, len(scoreboard.get('events', [])))
+
+        logger.info(
+            f'{league.display_name}: {len(rows.events)} Events and {len(rows.team_predictions)} TeamPredictions added '
+            f'(1 scoreboard request, {rows.summary_requests} summary requests)'
+        )
+
+        if rows.events:
+            update_league_indexes(league)
+
+    def get_window(self, league_state, check_collect):
+        """
+        Translates a `check_collect_today()` dictionary into the ScoreboardWindow to collect.
+        """
+        if 'date' in check_collect:
+            return ScoreboardWindow(season=league_state.league.season_start.year, date=self.yesterday)
+
+        return ScoreboardWindow(
+            season=league_state.league.season_start.year,
+            season_type=check_collect['season_type'],
+            week=check_collect['week'],
+        )
+
+    def advance_state(self, league_state, check_collect, new_events):
+        """
+        Records the collected window on the league's DataCollectionState.
+        """
+        league_state.collection_date = self.today
 
-        for league_state in DataCollectionState.objects.all():
-            if league_state.league not in settings.LEAGUE_DETAILS:
-                # League is not configured in LEAGUE_DETAILS setting
-                error_msg = f'League "{league_state.league}" has DataCollectionState but no LEAGUE_DETAILS configuration.'
-                logger.error(error_msg) # Log locally
-                capture_exception(RuntimeError(error_msg))  # Send to Sentry
-                continue    # Skip to next league
+        if 'date' in check_collect:
+            league_state.event_date = self.yesterday
 
-            check_collect = self.check_collect_today(league_state)
+            if new_events:
+                league_state.season_type = new_events[-1].season_type
+        else:
+            league_state.season_type = check_collect['season_type']
+            league_state.week = check_collect['week']
 
-            if check_collect:
-                pass
+        league_state.save()
 
     def check_collect_today(self, league_state):
         """
-        Returns params dictionary to be sent with formatted URL to `request_with_retry()` method.
+        Returns params dictionary describing the collection window (see `get_window()`).
         If should collect today, returns populated dictionary (truthy), else returns empty dictionary (falsy).
         """
-        details = settings.LEAGUE_DETAILS[league_state.league]
+        league = league_state.league
 
-        if details['check_type'] == 'daily':
+        if league.check_type == 'daily':
             if self.check_is_offseason(league_state):
                 # Offseason
                 return {}
 
             return self.check_collect_daily_league(league_state)
         else:
-            if details['check_day'] != self.today.weekday():
+            if league.check_day != self.today.weekday():
                 # Only check on specified day of week
                 return {}
             
-            season_types = details['season_types']
+            season_types = league.season_types
             
-            if league_state.league == 'nfl':
+            if league.espn_name == 'nfl':
                 return self.check_collect_nfl(league_state, season_types)
-            elif league_state.league == 'college-football':
+            elif league.espn_name == 'college-football':
                 return self.check_collect_ncaaf(league_state, season_types)
             else:
-                error_msg = f'No collection handler implemented for weekly league: {league_state.league}'
+                error_msg = f'No collection handler implemented for weekly league: {league.espn_name}'
                 logger.error(error_msg)
                 capture_exception(RuntimeError(error_msg))
                 return {}
@@ -70,12 +145,12 @@ class Command(BaseCommand):
         Handles checking if daily league's data should be collected.
         If should collect today, returns populated dictionary (truthy), else returns empty dictionary (falsy).
         """
-        if not (self.yesterday >= league_state.season_start and self.yesterday <= league_state.season_end):
+        if not (self.yesterday >= league_state.league.season_start and self.yesterday <= league_state.league.season_end):
             # Is currently offseason
             return {}
         
-        if league_state.all_star_start and league_state.all_star_end:
-            if (self.yesterday >= league_state.all_star_start and self.yesterday <= league_state.all_star_end):
+        if league_state.league.all_star_start and league_state.league.all_star_end:
+            if (self.yesterday >= league_state.league.all_star_start and self.yesterday <= league_state.league.all_star_end):
                 # Is currently All Star break
                 return {}
             
@@ -103,7 +178,7 @@ class Command(BaseCommand):
                 else:
                     # Week IS Pro Bowl week, do not gather, update League State to pretend we did (needed for accurate `curr_week` assignment)
                     league_state.week = curr_week
-                    league_state.collected = self.today
+                    league_state.collection_date = self.today
                     league_state.save()
                     return {}
             else:
@@ -125,7 +200,7 @@ class Command(BaseCommand):
                 return {'season_type': 2, 'week': league_state.week + 1}
             
             # Last collected week WAS last week of regular season
-            if self.yesterday >= league_state.season_end:
+            if self.yesterday >= league_state.league.season_end:
                 # Can currently only collect postseason data after season end due to ESPN handling of CFP data on their scoreboard
                 return {'season_type': 3, 'week': season_types[3][-1]}
             
@@ -144,35 +219,12 @@ class Command(BaseCommand):
         Has checks for updated league dates and stale league dates (staleness is assumed to be short-term).
         Returns True if offseason, else returns False.
         """
-        if self.yesterday > league_state.season_end:
+        if self.yesterday > league_state.league.season_end:
             # Stale date check -- yesterday is after season end date, safe to assume offseason
             return True
 
-        if league_state.is_offseason and self.yesterday < league_state.season_start:
+        if league_state.league.is_offseason and self.yesterday < league_state.league.season_start:
             # Updated dates -- offseason previously recorded as active, new season not started -- remains offseason
             return True
 
         return False    # Season is active
-
-    def request_with_retry(self, url, params):
-        """ 
-        Executes the HTTP request and returns the response.
-        Built in retries. Raises RunTimeError if unsuccessful after {max_retries} attempts.
-        """
-        max_retries = 5
-        backoff = 1.0
-        headers = {
-            'Accept': 'application/xml; charset=utf-8',
-            'User-Agent': 'foo',
-        }
-
-        for attempt in range(max_retries):
-            try:
-                resp = requests.get(url, headers=headers, params=params, timeout=30)
-                resp.raise_for_status()
-                return resp
-            except Exception as e:
-                logging.warning(f'Request failed {url}. Attempt {attempt + 1}/{max_retries}. Error: {e}')
-                time.sleep(backoff * (5 ** attempt))
-        
-        raise RuntimeError(f'Failed to fetch {url} after {max_retries} attempts')
\ No newline at end of file
@@ -0,0 +1,60 @@
+import logging
+
+from espndata.core.profiling import ProfiledCommand
+from espndata.eventdata.plays import PLAY_INSERT_CHUNK_SIZE, ingest_plays, table_bytes
+from espndata.events.models import League, Play
+
+logger = logging.getLogger(__name__)
+
+class Command(ProfiledCommand):
+    help = 'Streams play-by-play out of stored raw summary payloads into the compact Play table, without any network requests.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--league', action='append', help='ESPN league name. May be repeated. Defaults to all leagues.')
+        parser.add_argument(
+            '--directory',
+            help='Read `<espn_id>.json` summary payloads from this directory instead of the payload archive (requires one --league).',
+        )
+        parser.add_argument('--event', action='append', metavar='ESPN_ID', help='Only ingest this event. May be repeated.')
+        parser.add_argument('--chunk-size', type=int, default=PLAY_INSERT_CHUNK_SIZE, help='Plays buffered per bulk insert.')
+
+    def handle(self, *args, **options):
+        leagues = League.objects.all()
+
+        if options['league']:
+            leagues = leagues.filter(espn_name__in=options['league'])
+
+        if options['directory'] and len(leagues) != 1:
+            logger.error('--directory needs exactly one --league')
+            return
+
+        for league in leagues:
+            counts, elapsed = ingest_plays(
+                league,
+                espn_ids=options['event'],
+                directory=options['directory'],
+                chunk_size=options['chunk_size'],
+            )
+
+            if not counts['games']:
+                continue
+
+            self.stdout.write(
+                f'{league.display_name}: {counts["plays"]} plays from {counts["games"]} games in {elapsed:.1f}s '
+                f'({counts["plays"] / elapsed:.0f} plays/s, {counts["games"] / elapsed:.1f} games/s, '
+                f'{counts["payload_bytes"] / elapsed / 1e6:.1f} MB/s of payload streamed)'
+            )
+
+            for reason, count in sorted(counts.items()):
+                if reason.startswith('skipped: '):
+                    self.stdout.write(f'  {count} {reason}')
+
+        stored_bytes = table_bytes(Play)
+        plays = Play.objects.count()
+        games = Play.objects.values('event').distinct().count()
+
+        if stored_bytes is not None and games:
+            self.stdout.write(
+                f'Play table: {plays} plays of {games} games in {stored_bytes / 1e6:.1f} MB with indexes '
+                f'({stored_bytes / games / 1024:.1f} KB per game, {stored_bytes / plays:.0f} bytes per play)'
+            )
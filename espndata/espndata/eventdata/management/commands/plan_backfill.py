@@ -0,0 +1,175 @@
+from django.conf import settings
+from django.db import transaction
+
+from collections import Counter, defaultdict
+from datetime import date
+import json
+import logging
+from tqdm import tqdm
+
+from espndata.core.odds import fill_odds_columns
+from espndata.core.profiling import ProfiledCommand
+from espndata.eventdata.budget import RequestBudget
+from espndata.eventdata.fetch import FetchEngine, FetchError
+from espndata.eventdata.ingest import rows_from_scoreboard, update_league_indexes
+from espndata.eventdata.metrics import RunMetrics
+from espndata.eventdata.planner import (
+    estimate_cost,
+    mark_ingested,
+    plan_backfill,
+    scoreboard_is_settled,
+)
+from espndata.eventdata.upsert import save_series
+from espndata.events.models import Event, League, TeamPrediction
+
+logger = logging.getLogger(__name__)
+
+class Command(ProfiledCommand):
+    help = (
+        'Plans a backfill of every scoreboard window in the configured seasons (or the --season date ranges), skipping '
+        'windows already ingested, and queues new event IDs in `event_ids.json` for `summary_data` '
+        '(or, with --ingest, stores them from the scoreboards).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--league', action='append', help='ESPN league name to backfill. May be repeated. Defaults to all leagues.')
+        parser.add_argument(
+            '--season',
+            action='append',
+            nargs=2,
+            type=date.fromisoformat,
+            metavar=('START', 'END'),
+            help=(
+                'Backfill this date range (e.g. a past season: `--season 2023-10-24 2024-06-20`) instead of the configured '
+                'season, which is the only one a League stores. May be repeated; use with --league.'
+            ),
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Print the plan and its estimated cost without making requests.')
+        parser.add_argument(
+            '--ingest',
+            action='store_true',
+            help=(
+                'Build Events and TeamPredictions straight from the scoreboards instead of queuing IDs for `summary_data`, '
+                'requesting summaries only for events the scoreboard lacks a win probability for.'
+            ),
+        )
+        parser.add_argument('--require-odds', action='store_true', help='With --ingest, also request summaries for events missing moneylines.')
+
+    def handle(self, *args, **options):
+        leagues = League.objects.all()
+
+        if options['league']:
+            leagues = leagues.filter(espn_name__in=options['league'])
+
+        plan = plan_backfill(list(leagues), options['season'])
+        self.print_estimate(plan, options['season'])
+
+        if options['dry_run']:
+            return
+
+        self.metrics = RunMetrics('plan_backfill')
+        self.profiler.watch(self.metrics)
+        self.fetcher = FetchEngine(metrics=self.metrics, budget=RequestBudget(priority='low'))
+        self.savings = defaultdict(Counter)
+        ids_filepath = settings.BASE_DIR / 'espndata' / '_raw_data' / 'event_ids.json'
+
+        try:
+            with open(ids_filepath, 'r') as ids_file:
+                ids_by_league = json.load(ids_file)
+        except FileNotFoundError:
+            ids_by_league = {}
+
+        for league, windows in plan.items():
+            queued = ids_by_league.setdefault(league.espn_name, [])
+            known_ids = set(Event.objects.filter(league=league).values_list('espn_id', flat=True)) | set(queued)
+            scoreboard_url = settings.BASE_ESPN_SCOREBOARD_API_LINK.format(sport=league.sport, league=league.espn_name)
+            events_created = 0
+
+            for window in tqdm(windows, desc=f'Backfilling ESPN {league.display_name} Scoreboards'):
+                try:
+                    scoreboard = self.fetcher.get(scoreboard_url, window.params(league)).json()
+                except FetchError as e:
+                    logger.warning(f'{league.display_name} window {window.key} not fetched: {e}')
+                    self.metrics.record_skip(league.espn_name, 'fetch failed')
+                    continue
+
+                events = scoreboard.get('events', [])
+
+                if options['ingest']:
+                    try:
+                        events_created += self.ingest_window(league, scoreboard, known_ids, options['require_odds'])
+                    except FetchError as e:
+                        logger.warning(f'{league.display_name} window {window.key} not ingested: {e}')
+                        self.metrics.record_skip(league.espn_name, 'fetch failed')
+                        continue
+                else:
+                    new_ids = [event['id'] for event in events if event['id'] not in known_ids]
+                    queued += new_ids
+                    known_ids.update(new_ids)
+                    self.metrics.increment('event_ids_queued', len(new_ids))
+
+                if scoreboard_is_settled(scoreboard, league, window):
+                    mark_ingested(league, window, len(events))
+                    self.metrics.increment('windows_ingested')
+
+            # Once per league: backfilled events predate the ratings, so updating them forces a full rebuild
+            if events_created:
+                update_league_indexes(league)
+
+        with open(ids_filepath, 'w') as ids_file:
+            json.dump(ids_by_league, ids_file)
+
+        if options['ingest']:
+            self.print_savings()
+        else:
+            logger.info(f'{self.metrics.counters["event_ids_queued"]} event IDs queued for `summary_data`')
+
+        report_path = self.metrics.write_reports(settings.RUN_REPORT_DIR)
+        logger.info(f'Run report written to {report_path}')
+
+    def ingest_window(self, league, scoreboard, known_ids, require_odds):
+        """
+        Writes the rows built from one scoreboard window, recording summary requests made and saved for the league.
+        Returns the number of events created.
+        """
+        rows = rows_from_scoreboard(self.fetcher, league, scoreboard, known_ids, require_odds)
+
+        with self.metrics.stage('db_write'), transaction.atomic():
+            Event.objects.bulk_create(rows.events)
+            TeamPrediction.objects.bulk_create(fill_odds_columns(rows.team_predictions))
+            save_series(rows.series)
+
+        for reason, count in rows.skips.items():
+            self.metrics.skips[league.espn_name][reason] += count
+
+        self.metrics.increment('events_created', len(rows.events))
+        self.savings[league.display_name].update({
+            'events': rows.events_seen,
+            'summary_requests': rows.summary_requests,
+            'summary_requests_saved': rows.summary_requests_saved,
+        })
+        return len(rows.events)
+
+    def print_savings(self):
+        self.stdout.write(f'{"League":<24}{"New events":>12}{"Summaries":>11}{"Saved":>9}')
+
+        for league, counts in self.savings.items():
+            saved_pct = 100 * counts['summary_requests_saved'] / counts['events'] if counts['events'] else 0
+            self.stdout.write(
+                f'{league:<24}{counts["events"]:>12}{counts["summary_requests"]:>11}'
+                f'{counts["summary_requests_saved"]:>9} ({saved_pct:.0f}% of per-event summary requests)'
+            )
+            self.metrics.increment('summary_requests_saved', counts['summary_requests_saved'])
+
+    def print_estimate(self, plan, seasons):
+        estimates = estimate_cost(plan, seasons)
+        self.stdout.write(f'{"League":<24}{"Windows":>9}{"Skipped":>9}{"Scoreboards":>13}{"Summaries":>11}{"Est. time":>11}')
+
+        for row in estimates:
+            self.stdout.write(
+                f'{row["league"]:<24}{row["windows"]:>9}{row["skipped_windows"]:>9}{row["scoreboard_requests"]:>13}'
+                f'{row["estimated_summary_requests"]:>11}{row["estimated_seconds"] / 60:>9.1f}m'
+            )
+
+        total_seconds = sum(row['estimated_seconds'] for row in estimates)
+        self.stdout.write(f'Estimated total: {total_seconds / 3600:.1f}h of throttled requests')
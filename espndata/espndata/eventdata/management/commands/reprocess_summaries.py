@@ -0,0 +1,63 @@
+import logging
+
+from espndata.core.profiling import ProfiledCommand
+from espndata.eventdata.reprocess import REPROCESS_BATCH_SIZE, reprocess_league
+from espndata.events.matchups import update_matchup_index
+from espndata.events.models import League
+from espndata.events.ratings import update_league_ratings
+
+logger = logging.getLogger(__name__)
+
+class Command(ProfiledCommand):
+    help = 'Rebuilds Event and TeamPrediction rows from stored raw summary payloads, without any network requests.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--league', action='append', help='ESPN league name. May be repeated. Defaults to all leagues.')
+        parser.add_argument(
+            '--directory',
+            help='Read `*.json` summary payloads from this directory instead of the payload archive (requires one --league).',
+        )
+        parser.add_argument('--processes', type=int, help='Parser processes. Defaults to the number of CPUs.')
+        parser.add_argument('--batch-size', type=int, default=REPROCESS_BATCH_SIZE, help='Events written per transaction.')
+        parser.add_argument('--diff', action='store_true', help='Report the rows that would change, and roll every write back.')
+
+    def handle(self, *args, **options):
+        leagues = League.objects.all()
+
+        if options['league']:
+            leagues = leagues.filter(espn_name__in=options['league'])
+
+        if options['directory'] and len(leagues) != 1:
+            logger.error('--directory needs exactly one --league')
+            return
+
+        for league in leagues:
+            counts, payloads, elapsed = reprocess_league(
+                league,
+                directory=options['directory'],
+                processes=options['processes'],
+                batch_size=options['batch_size'],
+                dry_run=options['diff'],
+            )
+
+            if not payloads:
+                continue
+
+            verb = 'would be' if options['diff'] else 'were'
+            self.stdout.write(
+                f'{league.display_name}: {payloads} payloads reprocessed in {elapsed:.1f}s '
+                f'({payloads / elapsed:.0f} payloads/s, {counts["rows_built"] / elapsed:.0f} rows/s)'
+            )
+            self.stdout.write(
+                f'  {counts["events_created"]} Events created, {counts["events_updated"]} updated and '
+                f'{counts["events_unchanged"]} unchanged; {counts["team_predictions_updated"]} TeamPredictions updated '
+                f'and {counts["series_upserted"]} win probability series upserted (rows {verb} written)'
+            )
+
+            for reason, count in sorted(counts.items()):
+                if reason.startswith('skipped: '):
+                    self.stdout.write(f'  {count} {reason}')
+
+            if not options['diff'] and (counts['events_created'] or counts['events_updated']):
+                update_league_ratings(league)
+                update_matchup_index(league)
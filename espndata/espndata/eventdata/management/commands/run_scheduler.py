@@ -0,0 +1,33 @@
+from django.conf import settings
+
+import logging
+
+from espndata.core.profiling import ProfiledCommand
+from espndata.eventdata.scheduler import CollectionScheduler
+
+logger = logging.getLogger(__name__)
+
+class Command(ProfiledCommand):
+    help = 'Runs a long-lived scheduler that collects each league when it is next due, instead of cron-invoked `get_event_data` runs.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--show', action='store_true', help='Print the upcoming schedule and exit.')
+        parser.add_argument('--workers', type=int, default=4, help='Maximum leagues collected concurrently.')
+        parser.add_argument(
+            '--schedule-file',
+            default=settings.BASE_DIR / 'espndata' / '_raw_data' / 'schedule.json',
+            help='JSON file the upcoming schedule is written to whenever it changes.',
+        )
+
+    def handle(self, *args, **options):
+        scheduler = CollectionScheduler(max_workers=options['workers'], schedule_path=options['schedule_file'])
+
+        if options['show']:
+            scheduler.build_schedule()
+
+            for due, league_name in scheduler.upcoming():
+                self.stdout.write(f'{due.isoformat()}  {league_name}')
+            return
+
+        logger.info('`run_scheduler` started.')
+        scheduler.run_forever()
@@ -1,176 +1,154 @@
 from django.conf import settings
-from django.core.management.base import BaseCommand
 
-from dateutil import parser as dateparser
+from datetime import date
 import json
 import logging
-import requests
-import time
 from tqdm import tqdm
 
-from espndata.eventdata.models import Event, TeamPrediction
-from espndata.core.models import League
-from espndata.core.utils import american_to_decimal
+from espndata.core.odds import fill_odds_columns
+from espndata.core.profiling import ProfiledCommand
+from espndata.eventdata.fetch import FetchEngine, FetchError, PermanentFetchError
+from espndata.eventdata.ingest import fetch_summary_rows
+from espndata.eventdata.metrics import RunMetrics
+from espndata.eventdata.parsers import EventSkipped
+from espndata.eventdata.upsert import refresh_events, save_series
+from espndata.events.matchups import update_matchup_index
+from espndata.events.models import Event, League, TeamPrediction
+from espndata.events.ratings import update_league_ratings
 
 logger = logging.getLogger(__name__)
 
-class Command(BaseCommand):
+class Command(ProfiledCommand):
     help = 'Uses stored ESPN event IDs to collect and parse ESPN event summaries.'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--refresh',
+            action='store_true',
+            help='Re-fetch listed events that are already stored and update the rows whose fields changed.',
+        )
+        parser.add_argument(
+            '--refresh-unfinished',
+            action='store_true',
+            help='Also refresh stored past events that have no winner recorded (implies --refresh).',
+        )
+        parser.add_argument(
+            '--plays',
+            action='store_true',
+            help='Also stream the fetched events\' play-by-play into the Play table (needs PAYLOAD_ARCHIVE_ENABLED).',
+        )
+
     def handle(self, *args, **options):
+        self.metrics = RunMetrics('summary_data')
+        self.profiler.watch(self.metrics)
+        self.fetcher = FetchEngine(metrics=self.metrics)
         leagues = League.objects.all()
-        league_sport_map = {league.espn_name: league.sport for league in leagues}
+        leagues_by_name = {league.espn_name: league for league in leagues}
         incomplete_event_data = {league.espn_name: {} for league in leagues}
         new_events = []
         new_team_predictions = []
-        existing_league_id_pairs = set(Event.objects.values_list('league', 'espn_id'))
+        new_series = []
+        failed_ids = {league.espn_name: [] for league in leagues}     # kept in `event_ids.json` for the next run
+        refreshed_rows = {league.espn_name: [] for league in leagues}
+        refresh = options['refresh'] or options['refresh_unfinished']
+        existing_league_id_pairs = set(Event.objects.values_list('league__espn_name', 'espn_id'))
         raw_data_filepath = settings.BASE_DIR / 'espndata' / '_raw_data'
         
         with open(raw_data_filepath / 'event_ids.json', 'r') as ids_file:
             ids_by_league = json.load(ids_file)
 
+        if options['refresh_unfinished']:
+            unfinished = Event.objects.filter(winner__isnull=True, date__lt=date.today()).values_list('league__espn_name', 'espn_id')
+
+            for league, espn_id in unfinished:
+                if espn_id not in ids_by_league.setdefault(league, []):
+                    ids_by_league[league].append(espn_id)
+
         for league, ids_list in ids_by_league.items():
-            sport = league_sport_map[league]
-            formatted_url = settings.BASE_ESPN_EVENT_SUMMARY_API_LINK.format(sport=sport, league=league)
+            league_obj = leagues_by_name[league]
             
             for espn_id in tqdm(ids_list, desc=f'Fetching and Parsing ESPN {league.title()} Game Summaries'):
                 pair = (league, espn_id)
-
-                if pair not in existing_league_id_pairs:
-                    params = {'event': espn_id}
-                    event_summary = self.request_with_retry(formatted_url, params).json()
-
-                    header_info = event_summary.get('header', {})
-                    season_info = header_info.get('season')
-                    if not season_info:
-                        incomplete_event_data[league].update({espn_id: 'season/header'})
-                        continue
-                    
-                    season_type = season_info.get('type')
-                    if season_type == 1:
-                        continue        # ignore pre-season events
-                    
-                    season_year = season_info.get('year')
-                    week = header_info.get('week')
-
-                    comp = next(iter(header_info.get('competitions', [])))
-                    if not comp:
-                        incomplete_event_data[league].update({espn_id: 'competition'})
+                is_stored = pair in existing_league_id_pairs
+
+                if not is_stored or refresh:
+                    try:
+                        new_event, team_predictions, series = fetch_summary_rows(self.fetcher, self.metrics, league_obj, espn_id)
+                    except PermanentFetchError as e:
+                        self.metrics.record_skip(league, f'HTTP {e.status_code}')
+                        incomplete_event_data[league].update({espn_id: f'HTTP {e.status_code}'})
                         continue
-                    
-                    event_status = comp.get('status', {}).get('type', {}).get('id')
-                    if event_status == '5' or event_status == '6':
-                        continue        # ignore postponed or cancelled events
-                    
-                    event_date = comp.get('date')
-                    event_date = dateparser.parse(event_date)
-
-                    teams = comp.get('competitors', [])
-                    home = next((t for t in teams if t.get('homeAway') == 'home'), None)
-                    away = next((t for t in teams if t.get('homeAway') == 'away'), None)
-                    if not (home and away):
-                        incomplete_event_data[league].update({espn_id: 'home/away'})
+                    except FetchError as e:
+                        logger.warning(f'Giving up on {league} event {espn_id} for this run: {e}')
+                        self.metrics.record_skip(league, 'fetch failed')
+                        failed_ids[league].append(espn_id)
                         continue
-                    
-                    home_team = home.get('team', {}).get('displayName')
-                    home_rank = home.get('rank')
-                    is_home_win = home.get('winner', False)
-                    away_team = away.get('team', {}).get('displayName')
-                    away_rank = away.get('rank')
-                    is_away_win = away.get('winner', False)
-                    both_ranked_matchup = bool(home_rank and away_rank)
-                    one_ranked_matchup = bool(home_rank) != bool(away_rank)
-                    neutral_site = comp.get('neutralSite', False)
-
-                    win_probs = event_summary.get('winprobability', [])
-                    pre_win_probs = next(iter(win_probs), {})
-                    if not pre_win_probs:
-                        incomplete_event_data[league].update({espn_id: 'win probs'})
+                    except EventSkipped as e:
+                        self.metrics.record_skip(league, e.reason)
+
+                        if e.incomplete:
+                            incomplete_event_data[league].update({espn_id: e.reason})
                         continue
-                    
-                    home_win_prob = pre_win_probs.get('homeWinPercentage') * 100
-                    away_win_prob = 100 - home_win_prob
-
-                    betting_data = next(iter(event_summary.get('pickcenter', [])), {})
-                    home_american_ml = betting_data.get('homeTeamOdds', {}).get('moneyLine')
-                    home_decimal_ml = american_to_decimal(home_american_ml)
-                    away_american_ml = betting_data.get('awayTeamOdds', {}).get('moneyLine')
-                    away_decimal_ml = american_to_decimal(away_american_ml)
-
-                    new_event = Event(
-                        league=league,
-                        espn_id=espn_id,
-                        date=event_date,
-                        season=season_year,
-                        week=week,
-                        season_type=season_type,
-                        is_neutral_site=neutral_site,
-                        both_ranked_matchup=both_ranked_matchup,
-                        one_ranked_matchup=one_ranked_matchup,
-                    )
-                    home_team_prediction = TeamPrediction(
-                        event=new_event,
-                        team_name=home_team,
-                        team_rank=home_rank,
-                        home_away='home' if not neutral_site else 'neutral',
-                        win_probability=home_win_prob,
-                        moneyline=home_decimal_ml,
-                        is_winner=is_home_win,
-                        opponent_name=away_team,
-                        opponent_rank=away_rank,
-                    )
-                    away_team_prediction = TeamPrediction(
-                        event=new_event,
-                        team_name=away_team,
-                        team_rank=away_rank,
-                        home_away='away' if not neutral_site else 'neutral',
-                        win_probability=away_win_prob,
-                        moneyline=away_decimal_ml,
-                        is_winner=is_away_win,
-                        opponent_name=home_team,
-                        opponent_rank=home_rank,
+
+                    if is_stored:
+                        refreshed_rows[league].append((new_event, team_predictions, series))
+                    else:
+                        new_events.append(new_event)
+                        new_team_predictions += team_predictions
+                        existing_league_id_pairs.add(pair)
+
+                        if series:
+                            new_series.append(series)
+                else:
+                    self.metrics.record_skip(league, 'already stored')
+
+        with self.metrics.stage('db_write'):
+            Event.objects.bulk_create(new_events)
+            TeamPrediction.objects.bulk_create(fill_odds_columns(new_team_predictions))
+            save_series(new_series)
+
+            for league, rows in refreshed_rows.items():
+                if rows:
+                    refresh_counts = refresh_events(leagues_by_name[league], rows)
+                    self.metrics.counters.update(refresh_counts)
+                    logging.info(
+                        f'{league}: {len(rows)} stored events re-fetched, {refresh_counts["events_updated"]} Events and '
+                        f'{refresh_counts["team_predictions_updated"]} TeamPredictions updated, '
+                        f'{refresh_counts["series_upserted"]} win probability series upserted'
                     )
 
-                    if home_team_prediction.is_winner:
-                        new_event.winning_team = home_team
-                    elif away_team_prediction.is_winner:
-                        new_event.winning_team = away_team
+        if options['plays'] and not settings.PAYLOAD_ARCHIVE_ENABLED:
+            logger.warning('--plays ignored: plays are read from the payload archive, and PAYLOAD_ARCHIVE_ENABLED is off')
+        elif options['plays']:
+            # Imported here so runs without --plays don't load ijson and the play models
+            from espndata.eventdata.plays import ingest_plays
 
-                    new_events.append(new_event)
-                    new_team_predictions += [home_team_prediction, away_team_prediction]
-                    existing_league_id_pairs.add(pair)
+            with self.metrics.stage('plays'):
+                for league in leagues:
+                    espn_ids = [event.espn_id for event in new_events if event.league_id == league.id]
+                    espn_ids += [event.espn_id for event, _, _ in refreshed_rows[league.espn_name]]
 
-                time.sleep(0.5)
+                    if espn_ids:
+                        play_counts, _ = ingest_plays(league, espn_ids=espn_ids)
+                        self.metrics.increment('plays_ingested', play_counts['plays'])
 
-        Event.objects.bulk_create(new_events)
-        TeamPrediction.objects.bulk_create(new_team_predictions)
+        with self.metrics.stage('ratings'):
+            rated_leagues = {event.league_id for event in new_events}
+            rated_leagues.update(leagues_by_name[league].id for league, rows in refreshed_rows.items() if rows)
+
+            for league in leagues:
+                if league.id in rated_leagues:
+                    self.metrics.increment('events_rated', update_league_ratings(league))
+                    self.metrics.increment('matchup_predictions_indexed', update_matchup_index(league))
+
+        self.metrics.increment('events_created', len(new_events))
+        self.metrics.increment('team_predictions_created', len(new_team_predictions))
         logging.info(f'{len(new_events)} Events and {len(new_team_predictions)} TeamPredictions successfully added to the database')
+        report_path = self.metrics.write_reports(settings.RUN_REPORT_DIR)
+        logging.info(f'Run report written to {report_path}')
 
         with open(raw_data_filepath / 'incomplete_data_events.json', 'w') as incomplete_file:
             json.dump(incomplete_event_data, incomplete_file)
 
         with open(raw_data_filepath / 'event_ids.json', 'w') as ids_file:
-            json.dump({league.espn_name: [] for league in leagues}, ids_file)
-    
-    def request_with_retry(self, url, params):
-        """ 
-        Executes the HTTP request and returns the response.
-        Built in retries. Raises RunTimeError if unsuccessful after {max_retries} attempts.
-        """
-        max_retries = 5
-        backoff = 1.0
-        headers = {
-            'Accept': 'application/xml; charset=utf-8',
-            'User-Agent': 'foo',
-        }
-
-        for attempt in range(max_retries):
-            try:
-                resp = requests.get(url, headers=headers, params=params, timeout=30)
-                resp.raise_for_status()
-                return resp
-            except Exception as e:
-                logging.warning(f'Request failed {url}. Attempt {attempt + 1}/{max_retries}. Error: {e}')
-                time.sleep(backoff * (5 ** attempt))
-        
-        raise RuntimeError(f'Failed to fetch {url} after {max_retries} attempts')
\ No newline at end of file
+            json.dump(failed_ids, ids_file)
@@ -0,0 +1,136 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils.text import slugify
+
+import logging
+import os
+import socket
+import time
+
+from espndata.core.odds import fill_odds_columns
+from espndata.core.profiling import ProfiledCommand
+from espndata.eventdata.fetch import BREAKER_RESET_SECONDS, CircuitOpenError, FetchEngine, FetchError, PermanentFetchError
+from espndata.eventdata.ingest import fetch_summary_rows, update_league_indexes
+from espndata.eventdata.metrics import RunMetrics
+from espndata.eventdata.parsers import EventSkipped
+from espndata.eventdata.upsert import save_series
+from espndata.eventdata.workqueue import GlobalRateLimiter, LeaseHeartbeat, claim_task, finish_task, outstanding_tasks
+from espndata.events.models import Event, TeamPrediction
+
+logger = logging.getLogger(__name__)
+
+class Command(ProfiledCommand):
+    help = (
+        'Claims batches from the summary work queue and fetches, parses and writes them. '
+        'Run any number of workers, on any host sharing the database; requests stay under one global rate limit. '
+        'Each request also takes a token from its machine\'s per-host request budget (at normal priority, shared with '
+        'the other collectors there), so the workers on one machine fetch at the lower of --rate and that budget.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--worker-id', default=f'{socket.gethostname()}:{os.getpid()}', help='Name this worker holds leases under.')
+        parser.add_argument('--lease-seconds', type=int, default=settings.WORK_QUEUE_LEASE_SECONDS)
+        parser.add_argument('--rate', type=float, default=settings.WORK_QUEUE_REQUESTS_PER_SECOND, help='Summary requests per second across all workers, on top of each machine\'s request budget.')
+        parser.add_argument('--idle-seconds', type=float, default=10.0, help='Seconds to wait before polling an empty queue again.')
+        parser.add_argument('--forever', action='store_true', help='Keep polling after the queue drains instead of exiting.')
+
+    def handle(self, *args, **options):
+        self.worker_id = options['worker_id']
+        self.lease_seconds = options['lease_seconds']
+        self.metrics = RunMetrics(f'summary_worker_{slugify(self.worker_id)}')
+        self.profiler.watch(self.metrics)
+        self.fetcher = FetchEngine(metrics=self.metrics)
+        self.rate_limiter = GlobalRateLimiter('espn_summary', options['rate'])
+
+        while True:
+            task = claim_task(self.worker_id, self.lease_seconds)
+
+            if task:
+                self.process_task(task)
+                continue
+
+            if not options['forever'] and not outstanding_tasks():
+                break
+
+            # Other workers still hold leases that may expire and need reclaiming
+            time.sleep(options['idle_seconds'])
+
+        logger.info(f'{self.worker_id}: {self.metrics.counters["events_created"]} Events added from {self.metrics.counters["tasks_done"]} tasks')
+        report_path = self.metrics.write_reports(settings.RUN_REPORT_DIR)
+        logger.info(f'Run report written to {report_path}')
+
+    def process_task(self, task):
+        league = task.league
+        stored_ids = set(Event.objects.filter(league=league, espn_id__in=task.espn_ids).values_list('espn_id', flat=True))
+        new_events = []
+        new_team_predictions = []
+        new_series = []
+        incomplete = {}
+        retry_ids = []
+        deferred_ids = []
+
+        with LeaseHeartbeat(task, self.worker_id, self.lease_seconds) as heartbeat:
+            for position, espn_id in enumerate(task.espn_ids):
+                if heartbeat.lost.is_set():
+                    return
+
+                if espn_id in stored_ids:
+                    self.metrics.record_skip(league.espn_name, 'already stored')
+                    continue
+
+                with self.metrics.stage('throttle'):
+                    self.rate_limiter.acquire()
+
+                try:
+                    event, team_predictions, series = fetch_summary_rows(self.fetcher, self.metrics, league, espn_id)
+                except PermanentFetchError as e:
+                    self.metrics.record_skip(league.espn_name, f'HTTP {e.status_code}')
+                    incomplete[espn_id] = f'HTTP {e.status_code}'
+                    continue
+                except CircuitOpenError as e:
+                    # Hand the rest of the batch back rather than holding the lease through the outage
+                    deferred_ids = [espn_id for espn_id in task.espn_ids[position:] if espn_id not in stored_ids]
+                    logger.warning(f'Requeueing {len(deferred_ids)} {league.espn_name} events: {e}')
+                    break
+                except FetchError as e:
+                    logger.warning(f'Requeueing {league.espn_name} event {espn_id}: {e}')
+                    self.metrics.record_skip(league.espn_name, 'fetch failed')
+                    retry_ids.append(espn_id)
+                    continue
+                except EventSkipped as e:
+                    self.metrics.record_skip(league.espn_name, e.reason)
+
+                    if e.incomplete:
+                        incomplete[espn_id] = e.reason
+                    continue
+
+                new_events.append(event)
+                new_team_predictions += team_predictions
+
+                if series:
+                    new_series.append(series)
+
+        with self.metrics.stage('db_write'), transaction.atomic():
+            if not finish_task(task, self.worker_id, incomplete, retry_ids, deferred_ids):
+                logger.warning(f'{self.worker_id} lost its lease on task {task.id}; discarding its batch')
+                return
+
+            # Other collection commands may have stored some of these events since the batch started
+            stored_ids = set(Event.objects.filter(league=league, espn_id__in=task.espn_ids).values_list('espn_id', flat=True))
+            new_events = [event for event in new_events if event.espn_id not in stored_ids]
+            new_team_predictions = [prediction for prediction in new_team_predictions if prediction.event.espn_id not in stored_ids]
+            Event.objects.bulk_create(new_events)
+            TeamPrediction.objects.bulk_create(fill_odds_columns(new_team_predictions))
+            save_series(new_series)
+
+        if new_events:
+            update_league_indexes(league)
+
+        self.metrics.increment('tasks_done')
+        self.metrics.increment('events_created', len(new_events))
+        self.metrics.increment('team_predictions_created', len(new_team_predictions))
+
+        if deferred_ids:
+            # Wait out the open circuit once, without a lease, before claiming more work
+            with self.metrics.stage('backoff'):
+                time.sleep(BREAKER_RESET_SECONDS)
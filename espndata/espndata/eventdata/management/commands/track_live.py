@@ -0,0 +1,25 @@
+import logging
+
+from espndata.core.profiling import ProfiledCommand
+from espndata.eventdata.live import LiveTracker
+from espndata.events.models import League
+
+logger = logging.getLogger(__name__)
+
+class Command(ProfiledCommand):
+    help = 'Polls in-progress events and stores their in-game win probability series, polling close late games most often.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--league', action='append', dest='leagues', help='ESPN league name. May be repeated. Defaults to every in-season league.')
+        parser.add_argument('--workers', type=int, default=16, help='Concurrent summary requests.')
+        parser.add_argument('--stop-when-idle', action='store_true', help='Exit once no tracked games are live.')
+
+    def handle(self, *args, **options):
+        leagues = League.objects.filter(is_offseason=False)
+
+        if options['leagues']:
+            leagues = leagues.filter(espn_name__in=options['leagues'])
+
+        logger.info('`track_live` command started.')
+        LiveTracker(list(leagues), max_workers=options['workers']).run(stop_when_idle=options['stop_when_idle'])
+        logger.info('`track_live` command completed.')
@@ -0,0 +1,169 @@
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import json
+import os
+from pathlib import Path
+import time
+
+FETCH_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)   # seconds
+METRIC_PREFIX = 'espndata_ingest'
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram in the shape Prometheus expects.
+    """
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)     # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self):
+        total = 0
+
+        for upper, count in zip(list(self.buckets) + ['+Inf'], self.counts):
+            total += count
+            yield upper, total
+
+    def quantile(self, q):
+        """
+        Returns the upper bound of the bucket containing quantile `q` (None if no observations).
+        """
+        if not self.count:
+            return None
+
+        for upper, total in self.cumulative_counts():
+            if total >= q * self.count:
+                return upper
+
+
+class RunMetrics:
+    """
+    Collects per-stage instrumentation for one ingestion run and writes it as a Prometheus textfile and a JSON run report.
+    """
+    def __init__(self, command):
+        self.command = command
+        self.started_at = datetime.now(timezone.utc)
+        self.fetch_latency = Histogram(FETCH_LATENCY_BUCKETS)
+        self.counters = Counter()               # requests, bytes_downloaded, retries, ...
+        self.stage_seconds = Counter()          # stage -> accumulated seconds
+        self.skips = defaultdict(Counter)       # league -> reason -> count
+        self.stage_listeners = []               # callables notified with (stage, 'start' | 'end'), e.g. profilers
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Context manager timing a stage (fetch, decode, parse, db_write, ...). Time accumulates across uses.
+        """
+        for listener in self.stage_listeners:
+            listener(name, 'start')
+
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.stage_seconds[name] += time.perf_counter() - start
+
+            for listener in self.stage_listeners:
+                listener(name, 'end')
+
+    def observe_fetch(self, seconds, nbytes):
+        self.fetch_latency.observe(seconds)
+        self.counters['requests'] += 1
+        self.counters['bytes_downloaded'] += nbytes
+
+    def record_retry(self, backoff_seconds):
+        self.counters['retries'] += 1
+        self.counters['backoff_seconds'] += backoff_seconds
+
+    def record_skip(self, league, reason):
+        self.skips[league][reason] += 1
+
+    def increment(self, name, amount=1):
+        self.counters[name] += amount
+
+    def as_report(self):
+        finished_at = datetime.now(timezone.utc)
+
+        return {
+            'command': self.command,
+            'started_at': self.started_at.isoformat(),
+            'finished_at': finished_at.isoformat(),
+            'wall_seconds': (finished_at - self.started_at).total_seconds(),
+            'stage_seconds': dict(self.stage_seconds),
+            'counters': dict(self.counters),
+            'fetch_latency': {
+                'count': self.fetch_latency.count,
+                'sum': self.fetch_latency.sum,
+                'p50_upper_bound': self.fetch_latency.quantile(0.5),
+                'p95_upper_bound': self.fetch_latency.quantile(0.95),
+                'buckets': {str(upper): total for upper, total in self.fetch_latency.cumulative_counts()},
+            },
+            'skips': {league: dict(reasons) for league, reasons in self.skips.items()},
+        }
+
+    def as_prometheus(self):
+        label = f'command="{self.command}"'
+        lines = [
+            f'# HELP {METRIC_PREFIX}_fetch_seconds ESPN request latency.',
+            f'# TYPE {METRIC_PREFIX}_fetch_seconds histogram',
+        ]
+
+        for upper, total in self.fetch_latency.cumulative_counts():
+            lines.append(f'{METRIC_PREFIX}_fetch_seconds_bucket{{{label},le="{upper}"}} {total}')
+
+        lines += [
+            f'{METRIC_PREFIX}_fetch_seconds_sum{{{label}}} {self.fetch_latency.sum}',
+            f'{METRIC_PREFIX}_fetch_seconds_count{{{label}}} {self.fetch_latency.count}',
+            f'# HELP {METRIC_PREFIX}_stage_seconds Time spent per ingestion stage.',
+            f'# TYPE {METRIC_PREFIX}_stage_seconds gauge',
+        ]
+        lines += [
+            f'{METRIC_PREFIX}_stage_seconds{{{label},stage="{stage}"}} {seconds}'
+            for stage, seconds in sorted(self.stage_seconds.items())
+        ]
+
+        for name, value in sorted(self.counters.items()):
+            lines += [
+                f'# TYPE {METRIC_PREFIX}_{name}_total counter',
+                f'{METRIC_PREFIX}_{name}_total{{{label}}} {value}',
+            ]
+
+        lines.append(f'# TYPE {METRIC_PREFIX}_skipped_events_total counter')
+        lines += [
+            f'{METRIC_PREFIX}_skipped_events_total{{{label},league="{league}",reason="{reason}"}} {count}'
+            for league, reasons in sorted(self.skips.items())
+            for reason, count in sorted(reasons.items())
+        ]
+        return '\n'.join(lines) + '\n'
+
+    def write_reports(self, directory):
+        """
+        Writes `<command>.prom` (replaced atomically, for node_exporter's textfile collector)
+        and a timestamped `<command>_<started>.json` run report into `directory`.
+        Returns the JSON report's path.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        prom_path = directory / f'{self.command}.prom'
+        tmp_path = prom_path.with_suffix('.prom.tmp')
+
+        with open(tmp_path, 'w') as prom_file:
+            prom_file.write(self.as_prometheus())
+
+        os.replace(tmp_path, prom_path)
+        report_path = directory / f'{self.command}_{self.started_at:%Y%m%dT%H%M%S}.json'
+
+        with open(report_path, 'w') as report_file:
+            json.dump(self.as_report(), report_file, indent=2)
+
+        return report_path
@@ -0,0 +1,19 @@
+# Event and TeamPrediction moved to the events app (`espndata.events.models`); eventdata only holds the collectors.
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventdata', '0006_alter_event_league'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='TeamPrediction',
+        ),
+        migrations.DeleteModel(
+            name='Event',
+        ),
+    ]
@@ -0,0 +1,211 @@
+from dateutil import parser as dateparser
+
+from espndata.core.utils import american_to_decimal
+from espndata.events.models import Event, TeamPrediction
+from espndata.events.teams import team_lookup
+
+UNRANKED_CURATED_RANK = 99     # scoreboard API's `curatedRank` value for unranked teams
+POSTPONED_CANCELLED_STATUS_IDS = ('5', '6')
+
+
+class EventSkipped(Exception):
+    """
+    Raised when an ESPN payload should not be turned into an Event.
+    `incomplete` is True when ESPN's data is missing something (recorded for review),
+    and False when the event is intentionally ignored (preseason, postponed, cancelled).
+    """
+    def __init__(self, reason, incomplete=True):
+        super().__init__(reason)
+        self.reason = reason
+        self.incomplete = incomplete
+
+
+def _parse_competitor(competitor):
+    rank = competitor.get('rank')
+
+    if rank is None:
+        rank = competitor.get('curatedRank', {}).get('current')
+
+        if rank == UNRANKED_CURATED_RANK:
+            rank = None
+
+    return {
+        'espn_team_id': competitor.get('id') or competitor.get('team', {}).get('id'),
+        'name': competitor.get('team', {}).get('displayName'),
+        'rank': rank,
+        'is_winner': competitor.get('winner', False),
+    }
+
+
+def _parse_competition(comp, season_info, week):
+    """
+    Parses the fields shared by scoreboard events and summary headers.
+    Raises EventSkipped if the competition should not be stored.
+    """
+    if season_info.get('type') == 1:
+        raise EventSkipped('preseason', incomplete=False)
+
+    event_status = comp.get('status', {}).get('type', {}).get('id')
+    if event_status in POSTPONED_CANCELLED_STATUS_IDS:
+        raise EventSkipped('postponed/cancelled', incomplete=False)
+
+    teams = comp.get('competitors', [])
+    home = next((t for t in teams if t.get('homeAway') == 'home'), None)
+    away = next((t for t in teams if t.get('homeAway') == 'away'), None)
+    if not (home and away):
+        raise EventSkipped('home/away')
+
+    return {
+        'date': dateparser.parse(comp.get('date')).date(),
+        'season': season_info.get('year'),
+        'season_type': season_info.get('type'),
+        'week': week,
+        'status_id': event_status,
+        'is_completed': comp.get('status', {}).get('type', {}).get('completed', False),
+        'is_neutral_site': comp.get('neutralSite', False),
+        'home': _parse_competitor(home),
+        'away': _parse_competitor(away),
+        'home_win_probability': None,
+        'home_american_ml': None,
+        'away_american_ml': None,
+    }
+
+
+def parse_scoreboard_event(event):
+    """
+    Parses a single entry of a scoreboard API payload's `events` list.
+    Win probability and moneylines are filled in only when the scoreboard carries them.
+    Raises EventSkipped if the event should not be stored.
+    """
+    comp = next(iter(event.get('competitions', [])), None)
+    if not comp:
+        raise EventSkipped('competition')
+
+    week = event.get('week', {}).get('number')
+    parsed = _parse_competition(comp, event.get('season', {}), week)
+    parsed['espn_id'] = event.get('id')
+
+    predictor = comp.get('predictor') or {}
+    home_projection = predictor.get('homeTeam', {}).get('gameProjection')
+    if home_projection is not None:
+        parsed['home_win_probability'] = float(home_projection)
+
+    odds = next(iter(comp.get('odds') or []), {})
+    if 'homeTeamOdds' in odds:
+        parsed['home_american_ml'] = odds.get('homeTeamOdds', {}).get('moneyLine')
+        parsed['away_american_ml'] = odds.get('awayTeamOdds', {}).get('moneyLine')
+    elif 'moneyline' in odds:
+        moneyline = odds['moneyline']
+        parsed['home_american_ml'] = moneyline.get('home', {}).get('close', {}).get('odds')
+        parsed['away_american_ml'] = moneyline.get('away', {}).get('close', {}).get('odds')
+
+    return parsed
+
+
+def parse_summary(event_summary):
+    """
+    Parses a summary API payload.
+    Raises EventSkipped if the event should not be stored.
+    """
+    header_info = event_summary.get('header', {})
+    season_info = header_info.get('season')
+    if not season_info:
+        raise EventSkipped('season/header')
+
+    comp = next(iter(header_info.get('competitions', [])), None)
+    if not comp:
+        raise EventSkipped('competition')
+
+    parsed = _parse_competition(comp, season_info, header_info.get('week'))
+    parsed['espn_id'] = header_info.get('id')
+
+    win_probs = event_summary.get('winprobability', [])
+    pre_win_probs = next(iter(win_probs), {})
+    home_win_pct = pre_win_probs.get('homeWinPercentage')
+    if home_win_pct is None:
+        raise EventSkipped('win probs')
+
+    parsed['home_win_probability'] = home_win_pct * 100
+
+    betting_data = next(iter(event_summary.get('pickcenter', [])), {})
+    parsed['home_american_ml'] = betting_data.get('homeTeamOdds', {}).get('moneyLine')
+    parsed['away_american_ml'] = betting_data.get('awayTeamOdds', {}).get('moneyLine')
+
+    return parsed
+
+
+def needs_summary(parsed, require_odds=True):
+    """
+    Returns True if a scoreboard-parsed event is missing data only the summary API provides.
+    With `require_odds=False`, missing moneylines alone do not justify a summary request.
+    """
+    return parsed['home_win_probability'] is None or (require_odds and parsed['home_american_ml'] is None)
+
+
+def merge_summary(parsed, summary_parsed):
+    """
+    Fills the fields missing from a scoreboard-parsed event with those from its parsed summary.
+    """
+    for field in ('home_win_probability', 'home_american_ml', 'away_american_ml'):
+        if parsed[field] is None:
+            parsed[field] = summary_parsed[field]
+
+    return parsed
+
+
+def build_event_rows(league, parsed):
+    """
+    Returns an unsaved Event and its two unsaved TeamPredictions built from a parsed payload.
+    Teams are resolved through the shared in-memory `team_lookup`.
+    Raises EventSkipped if the payload has no win probability.
+    """
+    if parsed['home_win_probability'] is None:
+        raise EventSkipped('win probs')
+
+    home = parsed['home']
+    away = parsed['away']
+    neutral_site = parsed['is_neutral_site']
+    home_win_prob = parsed['home_win_probability']
+    home_team = team_lookup.resolve(league, home['espn_team_id'], home['name'])
+    away_team = team_lookup.resolve(league, away['espn_team_id'], away['name'])
+
+    event = Event(
+        league=league,
+        espn_id=parsed['espn_id'],
+        date=parsed['date'],
+        season=parsed['season'],
+        week=parsed['week'],
+        season_type=parsed['season_type'],
+        is_neutral_site=neutral_site,
+        both_ranked_matchup=bool(home['rank'] and away['rank']),
+        one_ranked_matchup=bool(home['rank']) != bool(away['rank']),
+    )
+    home_team_prediction = TeamPrediction(
+        event=event,
+        team=home_team,
+        team_rank=home['rank'],
+        home_away='home' if not neutral_site else 'neutral',
+        win_probability=home_win_prob,
+        moneyline=american_to_decimal(parsed['home_american_ml']),
+        is_winner=home['is_winner'],
+        opponent=away_team,
+        opponent_rank=away['rank'],
+    )
+    away_team_prediction = TeamPrediction(
+        event=event,
+        team=away_team,
+        team_rank=away['rank'],
+        home_away='away' if not neutral_site else 'neutral',
+        win_probability=100 - home_win_prob,
+        moneyline=american_to_decimal(parsed['away_american_ml']),
+        is_winner=away['is_winner'],
+        opponent=home_team,
+        opponent_rank=home['rank'],
+    )
+
+    if home['is_winner']:
+        event.winner = home_team
+    elif away['is_winner']:
+        event.winner = away_team
+
+    return event, [home_team_prediction, away_team_prediction]
@@ -0,0 +1,170 @@
+from django.conf import settings
+from django.db.models import Count
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from espndata.eventdata.budget import request_interval
+from espndata.eventdata.parsers import POSTPONED_CANCELLED_STATUS_IDS
+from espndata.events.models import Event, IngestedWindow
+
+DEFAULT_EVENTS_PER_WINDOW = {       # used when a league has no stored events to estimate from
+    'daily': 8,
+    'weekly': 14,
+}
+
+
+@dataclass(frozen=True)
+class ScoreboardWindow:
+    """
+    One scoreboard API request's worth of events: a single date for daily leagues, a season type + week for weekly leagues.
+    """
+    season: int
+    date: date = None
+    season_type: int = None
+    week: int = None
+
+    @property
+    def key(self):
+        if self.date:
+            return self.date.isoformat()
+
+        return f'{self.season}-{self.season_type}-{self.week}'
+
+    def params(self, league):
+        """
+        Returns the scoreboard API query params for this window.
+        """
+        if self.date:
+            return {'dates': self.date.strftime('%Y%m%d')}
+
+        params = {'dates': self.season, 'seasontype': self.season_type, 'week': self.week}
+
+        if league.espn_name == 'college-football':
+            params['groups'] = 80   # FBS
+
+        return params
+
+
+def plan_league_windows(league, today=None, seasons=None):
+    """
+    Returns every scoreboard window in the league's configured season up to yesterday, in order.
+    Daily leagues skip the All Star break; weekly leagues only request the weeks listed in `_season_types`,
+    and none before the season has started (a week's dates aren't known, so weeks of a running season are all planned).
+
+    A League only stores its current season's dates, so past seasons are planned by passing their
+    (start date, end date) ranges as `seasons`. Their All Star breaks aren't known and are requested,
+    and weekly leagues are assumed to have played the weeks in `_season_types`.
+    """
+    yesterday = (today or date.today()) - timedelta(days=1)
+    windows = []
+
+    for season_start, season_end in seasons or [(league.season_start, league.season_end)]:
+        if league.check_type == 'daily':
+            day = season_start
+
+            while day <= min(season_end, yesterday):
+                in_all_star_break = (
+                    league.all_star_start and league.all_star_end
+                    and league.all_star_start <= day <= league.all_star_end
+                )
+
+                if not in_all_star_break:
+                    windows.append(ScoreboardWindow(season=season_start.year, date=day))
+
+                day += timedelta(days=1)
+        elif season_start <= yesterday:
+            windows += [
+                ScoreboardWindow(season=season_start.year, season_type=season_type, week=week)
+                for season_type, weeks in sorted(league.season_types.items())
+                for week in weeks
+            ]
+
+    return windows
+
+
+def plan_backfill(leagues, seasons=None):
+    """
+    Returns {league: [windows still to fetch]}, leaving out windows already recorded as fully ingested.
+    `seasons` are (start date, end date) ranges to plan instead of each league's configured season.
+    """
+    ingested = set(IngestedWindow.objects.filter(league__in=leagues).values_list('league_id', 'window_key'))
+
+    return {
+        league: [window for window in plan_league_windows(league, seasons=seasons) if (league.id, window.key) not in ingested]
+        for league in leagues
+    }
+
+
+def window_is_past(league, window, today=None):
+    """
+    Returns True once a window's games can no longer be scheduled: its date has passed, or for weekly leagues
+    (whose weeks have no dates) its season is before the configured one or the configured season has ended.
+    """
+    today = today or date.today()
+
+    if window.date:
+        return window.date < today
+
+    return window.season < league.season_start.year or league.season_end < today
+
+
+def scoreboard_is_settled(scoreboard, league, window, today=None):
+    """
+    Returns True if every event on a window's scoreboard payload is completed, postponed or cancelled,
+    meaning the window cannot yield any more events. An empty scoreboard only settles a window that is past,
+    as games may not have been published for it yet.
+    """
+    events = scoreboard.get('events', [])
+
+    if not events:
+        return window_is_past(league, window, today)
+
+    for event in events:
+        status = next(iter(event.get('competitions', [])), {}).get('status', {}).get('type', {})
+
+        if not (status.get('completed') or status.get('id') in POSTPONED_CANCELLED_STATUS_IDS):
+            return False
+
+    return True
+
+
+def mark_ingested(league, window, event_count):
+    IngestedWindow.objects.update_or_create(league=league, window_key=window.key, defaults={'event_count': event_count})
+
+
+def events_per_window(league):
+    """
+    Returns the league's average number of stored events per scoreboard window (a default if it has none).
+    """
+    events = Event.objects.filter(league=league)
+    group_by = ['date'] if league.check_type == 'daily' else ['season', 'season_type', 'week']
+    window_counts = list(events.values(*group_by).annotate(n=Count('id')).values_list('n', flat=True))
+
+    if not window_counts:
+        return DEFAULT_EVENTS_PER_WINDOW[league.check_type]
+
+    return sum(window_counts) / len(window_counts)
+
+
+def estimate_cost(plan, seasons=None):
+    """
+    Returns one dictionary per league estimating the requests and throttled time the plan will cost,
+    assuming it gets the API host's full request budget. Pass the `seasons` the plan was made for.
+    """
+    estimates = []
+    interval = request_interval(settings.BASE_ESPN_SCOREBOARD_API_LINK)
+
+    for league, windows in plan.items():
+        all_windows = len(plan_league_windows(league, seasons=seasons))
+        summaries = round(len(windows) * events_per_window(league))
+        estimates.append({
+            'league': league.display_name,
+            'windows': all_windows,
+            'skipped_windows': all_windows - len(windows),
+            'scoreboard_requests': len(windows),
+            'estimated_summary_requests': summaries,
+            'estimated_seconds': (len(windows) + summaries) * interval,
+        })
+
+    return estimates
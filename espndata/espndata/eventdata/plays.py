@@ -0,0 +1,202 @@
+from django.db import OperationalError, connection, transaction
+
+from collections import Counter
+import ijson
+import logging
+from pathlib import Path
+import time
+
+from espndata.eventdata.archive import PayloadArchive
+from espndata.events.models import Event, Play, PlayType, Team
+
+logger = logging.getLogger(__name__)
+
+PLAY_INSERT_CHUNK_SIZE = 5000       # plays buffered before a bulk insert; whole games are never split across inserts
+PLAY_PREFIXES = {                   # ijson prefix of a sport's plays; football nests them in drives
+    'football': 'drives.previous.item.plays.item',
+}
+INNING_HALVES = {'top': 1, 'bottom': 2}
+
+
+def iter_plays(stream, sport):
+    """
+    Yields the plays of a summary payload read from a binary file object, one dict at a time.
+    The rest of the document (box score, rosters, news, ...) is scanned past without being built.
+    """
+    return ijson.items(stream, PLAY_PREFIXES.get(sport, 'plays.item'), use_float=True)
+
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def clock_seconds(clock):
+    """
+    Returns the seconds left in the period from a play's `clock` (`value`, or a "M:SS" `displayValue`).
+    """
+    if not clock:
+        return None
+
+    if clock.get('value') is not None:
+        return int(clock['value'])
+
+    minutes, _, seconds = (clock.get('displayValue') or '').partition(':')
+    return int(minutes) * 60 + int(float(seconds)) if minutes.isdigit() and seconds else None
+
+
+class PlayTypeLookup:
+    """
+    In-memory (sport, ESPN play type ID) -> PlayType ID cache; unknown play types are created.
+    """
+    def __init__(self):
+        self.ids = {}
+        self.loaded_sports = set()
+
+    def resolve(self, sport, play_type):
+        espn_type_id = _int((play_type or {}).get('id'))
+
+        if espn_type_id is None:
+            return None
+
+        if sport not in self.loaded_sports:
+            self.ids.update(((sport, code), pk) for pk, code in PlayType.objects.filter(sport=sport).values_list('id', 'espn_type_id'))
+            self.loaded_sports.add(sport)
+
+        if (sport, espn_type_id) not in self.ids:
+            play_type_obj, _ = PlayType.objects.get_or_create(
+                sport=sport, espn_type_id=espn_type_id, defaults={'text': play_type.get('text') or ''},
+            )
+            self.ids[(sport, espn_type_id)] = play_type_obj.id
+
+        return self.ids[(sport, espn_type_id)]
+
+
+def build_play(play, sequence, event_id, sport, team_ids, play_types):
+    """
+    Returns an unsaved Play from one streamed play dict. `team_ids` maps the league's ESPN team IDs to Team IDs.
+    """
+    start = play.get('start') or {}
+    period = play.get('period') or {}
+    counts = play.get('resultCount') or {}
+    team_id = (play.get('team') or start.get('team') or {}).get('id')
+
+    return Play(
+        event_id=event_id,
+        sequence=sequence,
+        espn_play_id=_int(play.get('id')),
+        play_type_id=play_types.resolve(sport, play.get('type')),
+        team_id=team_ids.get(team_id),
+        period=_int(period.get('number')) or 0,
+        clock_seconds=clock_seconds(play.get('clock')),
+        home_score=_int(play.get('homeScore')) or 0,
+        away_score=_int(play.get('awayScore')) or 0,
+        is_scoring=bool(play.get('scoringPlay')),
+        inning_half=INNING_HALVES.get(str(period.get('type')).lower()),
+        outs=_int(play.get('outs')),
+        balls=_int(counts.get('balls')),
+        strikes=_int(counts.get('strikes')),
+        down=_int(start.get('down')),
+        distance=_int(start.get('distance')),
+        yards_to_endzone=_int(start.get('yardsToEndzone')),
+        yards_gained=_int(play.get('statYardage')),
+    )
+
+
+def table_bytes(model):
+    """
+    Returns the bytes a model's table and its indexes occupy in the database, or None if the backend can't tell.
+    """
+    table = model._meta.db_table
+
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SELECT pg_total_relation_size(%s)', [table])
+        elif connection.vendor == 'sqlite':
+            try:
+                cursor.execute(
+                    'SELECT SUM(pgsize) FROM dbstat WHERE name IN (SELECT name FROM sqlite_master WHERE tbl_name = %s)',
+                    [table],
+                )
+            except OperationalError:    # SQLite built without the dbstat virtual table
+                return None
+        else:
+            return None
+
+        return cursor.fetchone()[0] or 0
+
+
+def write_plays(event_ids, plays):
+    """
+    Replaces the plays of `event_ids` with `plays` in one transaction.
+    """
+    with transaction.atomic():
+        Play.objects.filter(event_id__in=event_ids).delete()
+        Play.objects.bulk_create(plays)
+
+
+def ingest_plays(league, espn_ids=None, directory=None, chunk_size=PLAY_INSERT_CHUNK_SIZE):
+    """
+    Streams the plays out of the league's stored summary payloads (the PayloadArchive, or `<espn_id>.json` files
+    in `directory`) into Play rows, replacing any stored for the same events. Only payloads of stored Events are read;
+    `espn_ids` limits ingestion to those events. Plays are inserted in chunks of about `chunk_size`.
+    Returns (Counter, seconds elapsed).
+    """
+    counts = Counter()
+    start_time = time.perf_counter()
+    event_ids = dict(Event.objects.filter(league=league).values_list('espn_id', 'id'))
+    team_ids = dict(Team.objects.filter(league=league, espn_team_id__isnull=False).values_list('espn_team_id', 'id'))
+    play_types = PlayTypeLookup()
+
+    if directory:
+        paths = {path.stem: path for path in Path(directory).glob('*.json')}
+        keys = sorted(paths)
+    else:
+        source = PayloadArchive(league.espn_name)
+        keys = [str(espn_id) for espn_id in source.ids()]
+
+    if espn_ids is not None:
+        wanted = {str(espn_id) for espn_id in espn_ids}
+        keys = [key for key in keys if key in wanted]
+
+    buffered_events = []
+    buffered_plays = []
+
+    for espn_id in keys:
+        if espn_id not in event_ids:
+            counts['skipped: no stored event'] += 1
+            continue
+
+        stream = open(paths[espn_id], 'rb') if directory else source.open(espn_id)
+
+        try:
+            with stream:
+                game_plays = [
+                    build_play(play, sequence, event_ids[espn_id], league.sport, team_ids, play_types)
+                    for sequence, play in enumerate(iter_plays(stream, league.sport))
+                ]
+                counts['payload_bytes'] += stream.tell()
+        except ijson.JSONError as e:
+            logger.warning(f'Could not stream plays of {league.espn_name} event {espn_id}: {e}')
+            counts['skipped: undecodable payload'] += 1
+            continue
+
+        if not game_plays:
+            counts['skipped: no plays'] += 1
+            continue
+
+        buffered_events.append(event_ids[espn_id])
+        buffered_plays += game_plays
+        counts['games'] += 1
+        counts['plays'] += len(game_plays)
+
+        if len(buffered_plays) >= chunk_size:
+            write_plays(buffered_events, buffered_plays)
+            buffered_events, buffered_plays = [], []
+
+    if buffered_plays:
+        write_plays(buffered_events, buffered_plays)
+
+    return counts, time.perf_counter() - start_time
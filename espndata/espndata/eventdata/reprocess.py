@@ -0,0 +1,141 @@
+from django.db import connections, transaction
+
+from collections import Counter
+import json
+import logging
+import multiprocessing
+from pathlib import Path
+import time
+
+from espndata.core.odds import fill_odds_columns
+from espndata.eventdata.archive import PayloadArchive
+from espndata.eventdata.parsers import EventSkipped, build_event_rows, parse_summary
+from espndata.eventdata.upsert import refresh_events, save_series
+from espndata.events.models import Event, TeamPrediction, WinProbabilitySeries
+from espndata.events.teams import team_lookup
+from espndata.events.timeseries import get_play_periods, pack_series
+
+logger = logging.getLogger(__name__)
+
+REPROCESS_BATCH_SIZE = 500
+REPROCESS_CHUNK_SIZE = 8    # payloads handed to a worker process at a time
+
+_worker_source = None   # the PayloadArchive or payload directory a worker process reads from
+
+
+def _init_worker(league_name, directory):
+    global _worker_source
+    _worker_source = Path(directory) if directory else PayloadArchive(league_name)
+
+
+def payload_keys(league, directory=None):
+    """
+    Returns the keys of the league's stored summary payloads: file names in `directory`, or archived ESPN IDs.
+    """
+    if directory:
+        return sorted(path.name for path in Path(directory).glob('*.json'))
+
+    return PayloadArchive(league.espn_name).ids()
+
+
+def parse_payload(task):
+    """
+    Worker process side of `reprocess_league()`: reads and parses one stored payload without touching the database.
+    Returns (espn_id, parsed summary, WinProbabilitySeries fields or None, skip reason or None).
+    """
+    key, sport = task
+    from_directory = isinstance(_worker_source, Path)
+
+    try:
+        event_summary = json.loads((_worker_source / key).read_bytes() if from_directory else _worker_source.get(key))
+    except ValueError:
+        return str(key), None, None, 'undecodable payload'
+
+    try:
+        parsed = parse_summary(event_summary)
+    except EventSkipped as e:
+        return str(key), None, None, e.reason
+
+    # Archive keys are ESPN IDs; payload files are identified by their header, falling back to the file name
+    espn_id = (parsed['espn_id'] or Path(key).stem) if from_directory else str(key)
+    series_fields = pack_series(event_summary.get('winprobability', []), play_periods=get_play_periods(event_summary), sport=sport)
+    return espn_id, parsed, series_fields, None
+
+
+def write_batch(league, results, dry_run=False):
+    """
+    Builds rows from parsed payloads and writes them: stored events are refreshed (only changed rows are written),
+    missing ones are created. With `dry_run`, everything is rolled back and only the counts are kept.
+    Returns a Counter of rows written (or that would be) and of skip reasons.
+    """
+    counts = Counter()
+    rows = {}
+
+    # Rows are built inside the transaction: resolving teams may create Teams or backfill their ESPN IDs
+    try:
+        with transaction.atomic():
+            for espn_id, parsed, series_fields, skip_reason in results:
+                if skip_reason:
+                    counts[f'skipped: {skip_reason}'] += 1
+                    continue
+
+                parsed['espn_id'] = espn_id
+
+                try:
+                    event, team_predictions = build_event_rows(league, parsed)
+                except EventSkipped as e:
+                    counts[f'skipped: {e.reason}'] += 1
+                    continue
+
+                series = WinProbabilitySeries(league=league, espn_id=espn_id, **series_fields) if series_fields else None
+                rows[espn_id] = (event, team_predictions, series)
+
+            stored_ids = set(Event.objects.filter(league=league, espn_id__in=rows).values_list('espn_id', flat=True))
+            new_rows = [row for espn_id, row in rows.items() if espn_id not in stored_ids]
+            counts.update(refresh_events(league, [row for espn_id, row in rows.items() if espn_id in stored_ids]))
+            Event.objects.bulk_create([event for event, _, _ in new_rows])
+            TeamPrediction.objects.bulk_create(fill_odds_columns([p for _, team_predictions, _ in new_rows for p in team_predictions]))
+            save_series([series for _, _, series in new_rows if series])
+            counts['events_created'] += len(new_rows)
+            counts['team_predictions_created'] += 2 * len(new_rows)
+
+            if dry_run:
+                transaction.set_rollback(True)
+    except Exception:
+        team_lookup.clear()     # holds Teams created inside the rolled back transaction
+        raise
+
+    if dry_run:
+        team_lookup.clear()     # rolled back as well
+
+    counts['rows_built'] += sum(1 + len(team_predictions) + bool(series) for _, team_predictions, series in rows.values())
+    return counts
+
+
+def reprocess_league(league, directory=None, processes=None, batch_size=REPROCESS_BATCH_SIZE, dry_run=False):
+    """
+    Rebuilds the league's Event, TeamPrediction and WinProbabilitySeries rows from stored summary payloads
+    (the PayloadArchive, or `*.json` files in `directory`). No network requests are made.
+    Payloads are parsed by a pool of `processes` worker processes; rows are built and written by this process in batches.
+    Returns (Counter, payloads read, seconds elapsed).
+    """
+    keys = payload_keys(league, directory)
+    counts = Counter()
+    start = time.perf_counter()
+    connections.close_all()     # forked workers must not share this process's database connections
+
+    with multiprocessing.Pool(processes, initializer=_init_worker, initargs=(league.espn_name, directory)) as pool:
+        results = pool.imap_unordered(parse_payload, ((key, league.sport) for key in keys), chunksize=REPROCESS_CHUNK_SIZE)
+        batch = []
+
+        for result in results:
+            batch.append(result)
+
+            if len(batch) >= batch_size:
+                counts.update(write_batch(league, batch, dry_run))
+                batch = []
+
+        if batch:
+            counts.update(write_batch(league, batch, dry_run))
+
+    return counts, len(keys), time.perf_counter() - start
@@ -0,0 +1,180 @@
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import heapq
+import json
+import logging
+import time
+
+from espndata.events.models import DataCollectionState
+
+logger = logging.getLogger(__name__)
+
+WEEKLY_POSTSEASON_GRACE = timedelta(days=7)     # weekly leagues may still collect postseason data just after `season_end`
+
+
+def next_due_date(league_state, after):
+    """
+    Returns the first date on or after `after` when the state's league may need collecting, or None if it is offseason.
+    Daily leagues collect the previous day's games, so a due date's previous day must be in season and outside the All Star break.
+    Weekly leagues are due on their `check_day` while in season.
+    `get_event_data` makes the final call on what (if anything) is collected on a due date.
+    """
+    league = league_state.league
+
+    if league_state.collection_date >= after:
+        after = league_state.collection_date + timedelta(days=1)    # already collected on that date
+
+    if league.check_type == 'daily':
+        candidate = max(after, league.season_start + timedelta(days=1))
+
+        if league.all_star_start and league.all_star_end:
+            if league.all_star_start <= candidate - timedelta(days=1) <= league.all_star_end:
+                candidate = league.all_star_end + timedelta(days=2)
+
+        if candidate - timedelta(days=1) > league.season_end:
+            return None
+
+        return candidate
+
+    candidate = max(after, league.season_start)
+    candidate += timedelta(days=(league.check_day - candidate.weekday()) % 7)
+
+    if candidate - timedelta(days=1) > league.season_end + WEEKLY_POSTSEASON_GRACE:
+        return None
+
+    return candidate
+
+
+def due_datetime(due_date):
+    """
+    Returns the aware datetime at which collection runs on `due_date`.
+    """
+    return timezone.make_aware(datetime.combine(due_date, settings.COLLECTION_TIME))
+
+
+class CollectionScheduler:
+    """
+    Long-running scheduler for `get_event_data` collections.
+    Keeps a heap of each league's next due time, sleeps until the earliest one and runs every due league concurrently.
+    """
+    def __init__(self, max_workers=4, max_sleep=None, schedule_path=None):
+        self.max_workers = max_workers
+        self.max_sleep = max_sleep if max_sleep is not None else settings.SCHEDULER_MAX_SLEEP
+        self.schedule_path = schedule_path
+        self.jobs = []      # heap of (due datetime, league id)
+        self.last_run = {}  # league id -> date of its last run, collected or not
+
+    def build_schedule(self, now=None):
+        """
+        Recomputes every league's next due time from the current League configuration.
+        """
+        now = now or timezone.now()
+        self.jobs = []
+
+        for league_state in DataCollectionState.objects.select_related('league'):
+            due = self.next_due(league_state, now)
+
+            if due:
+                heapq.heappush(self.jobs, (due, league_state.league_id))
+
+        self.publish_schedule()
+
+    def next_due(self, league_state, now):
+        today = timezone.localdate(now)
+        after = today + timedelta(days=1) if self.last_run.get(league_state.league_id) == today else today
+        due_date = next_due_date(league_state, after)
+
+        if due_date is None:
+            return None
+
+        return max(due_datetime(due_date), now)    # a run time already passed today without a collection runs now
+
+    def upcoming(self):
+        """
+        Returns the upcoming schedule as (due datetime, league display name) pairs, soonest first.
+        """
+        states = DataCollectionState.objects.select_related('league').in_bulk(
+            [league_id for _, league_id in self.jobs], field_name='league_id'
+        )
+        return [
+            (due, states[league_id].league.display_name)
+            for due, league_id in sorted(self.jobs)
+            if league_id in states
+        ]
+
+    def publish_schedule(self):
+        """
+        Logs the upcoming schedule and, if configured, writes it to `schedule_path` as JSON.
+        """
+        upcoming = self.upcoming()
+
+        for due, league_name in upcoming:
+            logger.info(f'Next {league_name} collection: {due.isoformat()}')
+
+        if self.schedule_path:
+            with open(self.schedule_path, 'w') as schedule_file:
+                json.dump([{'league': name, 'due': due.isoformat()} for due, name in upcoming], schedule_file)
+
+    def pop_due(self, now):
+        due_league_ids = []
+
+        while self.jobs and self.jobs[0][0] <= now:
+            due_league_ids.append(heapq.heappop(self.jobs)[1])
+
+        return due_league_ids
+
+    def run_league(self, league_id):
+        """
+        Runs one league's collection in a worker thread.
+        """
+        from espndata.eventdata.management.commands.get_event_data import Command as CollectCommand
+
+        close_old_connections()
+
+        try:
+            league_state = DataCollectionState.objects.select_related('league').get(league_id=league_id)
+            CollectCommand().run_league(league_state, timezone.localdate())
+        finally:
+            close_old_connections()
+
+    def run_due(self, league_ids):
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            list(executor.map(self.run_league, league_ids))
+
+        now = timezone.now()
+
+        for league_id in league_ids:
+            self.last_run[league_id] = timezone.localdate(now)
+
+        for league_state in DataCollectionState.objects.select_related('league').filter(league_id__in=league_ids):
+            due = self.next_due(league_state, now)
+
+            if due:
+                heapq.heappush(self.jobs, (due, league_state.league_id))
+
+        self.publish_schedule()
+
+    def run_forever(self):
+        """
+        Sleeps until the earliest due job, runs every due league, and repeats.
+        Sleeps are capped at `max_sleep` so League configuration changes are picked up without restarting.
+        """
+        self.build_schedule()
+
+        while True:
+            now = timezone.now()
+            due_league_ids = self.pop_due(now)
+
+            if due_league_ids:
+                self.run_due(due_league_ids)
+                continue
+
+            wake = self.jobs[0][0] if self.jobs else now + timedelta(seconds=self.max_sleep)
+            time.sleep(min(max((wake - now).total_seconds(), 0), self.max_sleep))
+
+            if not self.jobs or self.jobs[0][0] > timezone.now():
+                self.build_schedule()   # woke from a capped sleep, refresh from League configuration
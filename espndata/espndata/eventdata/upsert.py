@@ -0,0 +1,138 @@
+from django.db.models import DecimalField
+
+from collections import Counter, defaultdict
+from decimal import Decimal
+
+from espndata.core.odds import fill_odds_columns
+from espndata.events.models import Event, TeamPrediction, WinProbabilitySeries
+
+EVENT_REFRESH_FIELDS = [
+    'date', 'season', 'week', 'season_type', 'winner', 'is_neutral_site', 'both_ranked_matchup', 'one_ranked_matchup',
+]
+PREDICTION_REFRESH_FIELDS = [
+    'team_rank', 'home_away', 'win_probability', 'moneyline', 'is_winner', 'opponent', 'opponent_rank',
+    'implied_probability', 'fair_probability', 'overround', 'edge',
+]
+SERIES_REFRESH_FIELDS = [
+    'length', 'home_win_percentages', 'play_ids', 'periods', 'pregame_home_win_percentage', 'halftime_home_win_percentage',
+    'final_home_win_percentage', 'min_home_win_percentage', 'max_home_win_percentage', 'max_swing',
+]
+REFRESH_BATCH_SIZE = 500
+
+
+def normalize(field, value):
+    """
+    Returns `value` as it will read back from the database, so freshly parsed floats compare equal to stored Decimals.
+    """
+    if value is not None and isinstance(field, DecimalField):
+        return field.to_python(value).quantize(Decimal(1).scaleb(-field.decimal_places))
+
+    return field.to_python(value)
+
+
+def apply_changes(stored, fetched, field_names):
+    """
+    Copies the fields of `fetched` that differ onto `stored`. Foreign keys are compared by their ID columns.
+    Returns the names of the changed fields.
+    """
+    changed = []
+
+    for field_name in field_names:
+        field = stored._meta.get_field(field_name)
+        value_field = field.target_field if field.is_relation else field
+        new_value = normalize(value_field, getattr(fetched, field.attname))
+
+        if normalize(value_field, getattr(stored, field.attname)) != new_value:
+            setattr(stored, field.attname, new_value)
+            changed.append(field_name)
+
+    return tuple(changed)
+
+
+def bulk_update_changed(model, changed_rows):
+    """
+    Writes `changed_rows` ({changed field names: [rows]}) with one bulk_update per distinct set of changed fields,
+    so unchanged columns are never rewritten. Returns the number of rows written.
+    """
+    written = 0
+
+    for field_names, rows in changed_rows.items():
+        model.objects.bulk_update(rows, list(field_names), batch_size=REFRESH_BATCH_SIZE)
+        written += len(rows)
+
+    return written
+
+
+def save_series(series):
+    """
+    Inserts WinProbabilitySeries built from summary payloads, replacing any already stored for the same events
+    (e.g. one written by live tracking mid-game, or compacted from live points, which has no periods or halftime value).
+    """
+    return WinProbabilitySeries.objects.bulk_create(
+        series,
+        batch_size=REFRESH_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['league', 'espn_id'],
+        update_fields=SERIES_REFRESH_FIELDS,
+    )
+
+
+def refresh_events(league, fetched_rows):
+    """
+    Applies re-fetched (event, team_predictions, series) rows for already stored events of `league`.
+    Only rows with changed fields are written; win probability series are upserted (ON CONFLICT DO UPDATE)
+    when missing or when their length or final value changed.
+    Returns a Counter of rows written per table and of events that were unchanged.
+    """
+    counts = Counter()
+    fill_odds_columns([prediction for _, team_predictions, _ in fetched_rows for prediction in team_predictions])
+    fetched_by_id = {event.espn_id: (event, team_predictions, series) for event, team_predictions, series in fetched_rows}
+    stored_events = Event.objects.filter(league=league, espn_id__in=fetched_by_id).prefetch_related('predictions')
+    stored_series = {
+        espn_id: (length, final)
+        for espn_id, length, final in WinProbabilitySeries.objects.filter(league=league, espn_id__in=fetched_by_id)
+        .values_list('espn_id', 'length', 'final_home_win_percentage')
+    }
+    changed_events = defaultdict(list)
+    changed_predictions = defaultdict(list)
+    upserted_series = []
+
+    for stored_event in stored_events:
+        event, team_predictions, series = fetched_by_id[stored_event.espn_id]
+        stored_predictions = {prediction.team_id: prediction for prediction in stored_event.predictions.all()}
+        event_changed = apply_changes(stored_event, event, EVENT_REFRESH_FIELDS)
+
+        if event_changed:
+            changed_events[event_changed].append(stored_event)
+
+        prediction_changed = False
+
+        for team_prediction in team_predictions:
+            stored_prediction = stored_predictions.get(team_prediction.team_id)
+
+            if stored_prediction is None:
+                continue    # stored under a name-only Team that has since been given a different ESPN ID
+
+            changed = apply_changes(stored_prediction, team_prediction, PREDICTION_REFRESH_FIELDS)
+
+            if changed:
+                changed_predictions[changed].append(stored_prediction)
+                prediction_changed = True
+
+        if series and stored_series.get(series.espn_id) != (series.length, series.final_home_win_percentage):
+            upserted_series.append(series)
+
+        if not (event_changed or prediction_changed):
+            counts['events_unchanged'] += 1
+
+    counts['events_updated'] = bulk_update_changed(Event, changed_events)
+    counts['team_predictions_updated'] = bulk_update_changed(TeamPrediction, changed_predictions)
+    WinProbabilitySeries.objects.bulk_create(
+        upserted_series,
+        batch_size=REFRESH_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['league', 'espn_id'],
+        update_fields=SERIES_REFRESH_FIELDS,
+    )
+    counts['series_upserted'] = len(upserted_series)
+    return counts
@@ -0,0 +1,181 @@
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from datetime import timedelta
+import logging
+import threading
+import time
+
+from espndata.events.models import Event, IngestionTask, RateLimitSlot
+
+logger = logging.getLogger(__name__)
+
+CLAIM_RETRIES = 5   # compare-and-set attempts before `claim_task()` gives up for this poll
+
+
+def enqueue(league, espn_ids, batch_size=None):
+    """
+    Splits `espn_ids` into pending IngestionTasks.
+    IDs already stored or already waiting in an unfinished task are left out, so re-running is idempotent.
+    Returns the number of tasks created.
+    """
+    batch_size = batch_size or settings.WORK_QUEUE_BATCH_SIZE
+    known_ids = set(Event.objects.filter(league=league, espn_id__in=espn_ids).values_list('espn_id', flat=True))
+
+    for task_ids in IngestionTask.objects.filter(league=league, status__in=['pending', 'leased']).values_list('espn_ids', flat=True):
+        known_ids.update(task_ids)
+
+    new_ids = list(dict.fromkeys(espn_id for espn_id in espn_ids if espn_id not in known_ids))
+    tasks = [
+        IngestionTask(league=league, espn_ids=new_ids[i:i + batch_size])
+        for i in range(0, len(new_ids), batch_size)
+    ]
+    IngestionTask.objects.bulk_create(tasks)
+    return len(tasks)
+
+
+def claimable_tasks():
+    return IngestionTask.objects.filter(
+        Q(status='pending') | Q(status='leased', lease_expires_at__lt=timezone.now())
+    )
+
+
+def claim_task(worker_id, lease_seconds=None):
+    """
+    Leases the oldest pending or expired task to `worker_id` and returns it, or returns None if there is none.
+    The lease is taken with a compare-and-set UPDATE, so concurrent workers on any host never hold the same lease.
+    """
+    lease_seconds = lease_seconds or settings.WORK_QUEUE_LEASE_SECONDS
+
+    for _ in range(CLAIM_RETRIES):
+        candidate = claimable_tasks().order_by('id').values('id', 'status', 'lease_owner', 'attempts').first()
+
+        if not candidate:
+            return None
+
+        now = timezone.now()
+        claimed = IngestionTask.objects.filter(
+            id=candidate['id'],
+            status=candidate['status'],
+            lease_owner=candidate['lease_owner'],
+            attempts=candidate['attempts'],
+        ).update(
+            status='leased',
+            lease_owner=worker_id,
+            lease_expires_at=now + timedelta(seconds=lease_seconds),
+            attempts=F('attempts') + 1,
+            updated_at=now,
+        )
+
+        if claimed:
+            if candidate['status'] == 'leased':
+                logger.warning(f'Reclaimed expired lease on task {candidate["id"]} from {candidate["lease_owner"]}')
+
+            return IngestionTask.objects.select_related('league').get(id=candidate['id'])
+
+    return None
+
+
+def renew_lease(task, worker_id, lease_seconds=None):
+    """
+    Extends the worker's lease on `task`. Returns False if the lease was lost (expired and reclaimed).
+    """
+    lease_seconds = lease_seconds or settings.WORK_QUEUE_LEASE_SECONDS
+    now = timezone.now()
+
+    return bool(IngestionTask.objects.filter(id=task.id, status='leased', lease_owner=worker_id).update(
+        lease_expires_at=now + timedelta(seconds=lease_seconds),
+        updated_at=now,
+    ))
+
+
+def finish_task(task, worker_id, incomplete, retry_ids, deferred_ids=()):
+    """
+    Marks the worker's leased task done and requeues `retry_ids` (transient fetch failures) as a new task,
+    or marks the task failed once it has used WORK_QUEUE_MAX_ATTEMPTS leases.
+    `deferred_ids` (never requested, e.g. while a circuit was open) are requeued without using up an attempt.
+    Call inside the transaction that writes the task's rows. Returns False if the lease was lost.
+    """
+    out_of_attempts = retry_ids and task.attempts >= settings.WORK_QUEUE_MAX_ATTEMPTS
+
+    if out_of_attempts:
+        incomplete.update({espn_id: 'fetch failed' for espn_id in retry_ids})
+
+    finished = IngestionTask.objects.filter(id=task.id, status='leased', lease_owner=worker_id).update(
+        status='failed' if out_of_attempts else 'done',
+        lease_expires_at=None,
+        incomplete=incomplete,
+        updated_at=timezone.now(),
+    )
+
+    if finished and retry_ids and not out_of_attempts:
+        IngestionTask.objects.create(league=task.league, espn_ids=retry_ids, attempts=task.attempts)
+
+    if finished and deferred_ids:
+        IngestionTask.objects.create(league=task.league, espn_ids=list(deferred_ids), attempts=task.attempts - 1)
+
+    return bool(finished)
+
+
+class LeaseHeartbeat(threading.Thread):
+    """
+    Renews a task's lease every third of the lease duration while the worker processes it.
+    Sets `lost` if a renewal finds the lease was reclaimed, so the worker can discard its batch.
+    """
+    def __init__(self, task, worker_id, lease_seconds=None):
+        super().__init__(daemon=True)
+        self.task = task
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds or settings.WORK_QUEUE_LEASE_SECONDS
+        self.stopped = threading.Event()
+        self.lost = threading.Event()
+
+    def run(self):
+        try:
+            while not self.stopped.wait(self.lease_seconds / 3):
+                if not renew_lease(self.task, self.worker_id, self.lease_seconds):
+                    logger.warning(f'{self.worker_id} lost its lease on task {self.task.id}')
+                    self.lost.set()
+                    return
+        finally:
+            connection.close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stopped.set()
+        self.join()
+
+
+class GlobalRateLimiter:
+    """
+    Spaces requests made by every worker sharing the database to at most `requests_per_second`.
+    Each `acquire()` atomically reserves the next free slot in a RateLimitSlot row and sleeps until it.
+    Slots are epoch times, so hosts are assumed to have synchronised clocks.
+    """
+    def __init__(self, name, requests_per_second=None):
+        self.name = name
+        self.interval = 1 / (requests_per_second or settings.WORK_QUEUE_REQUESTS_PER_SECOND)
+        RateLimitSlot.objects.get_or_create(name=name)
+
+    def acquire(self):
+        with transaction.atomic():
+            # UPDATE first so the row is write-locked before it is read back
+            RateLimitSlot.objects.filter(name=self.name).update(next_slot=Greatest(F('next_slot'), Value(time.time())) + self.interval)
+            slot = RateLimitSlot.objects.values_list('next_slot', flat=True).get(name=self.name) - self.interval
+
+        wait = slot - time.time()
+
+        if wait > 0:
+            time.sleep(wait)
+
+        return wait
+
+
+def outstanding_tasks():
+    return IngestionTask.objects.filter(status__in=['pending', 'leased']).count()
@@ -0,0 +1,252 @@
+from django.conf import settings
+from django.db.models import Count, Max, Q, Sum
+
+import hashlib
+import json
+import logging
+import numpy as np
+import os
+from pathlib import Path
+import shutil
+
+from espndata.events.models import HOME_AWAY_CHOICES, Event, League, Team, TeamPrediction
+
+logger = logging.getLogger(__name__)
+
+MISSING_INT = -1
+CHUNK_SIZE = 10000
+
+# (column, TeamPrediction lookup, dtype). `*_code` columns index into the dataset's category arrays;
+# missing integers are MISSING_INT, missing floats NaN and a missing `is_winner` -1.
+COLUMNS = [
+    ('prediction_id', 'id', '<i8'),
+    ('event_id', 'event_id', '<i8'),
+    ('espn_id', 'event__espn_id', '<i8'),
+    ('league_code', 'event__league_id', '<i2'),
+    ('date', 'event__date', '<M8[D]'),
+    ('season', 'event__season', '<i2'),
+    ('season_type', 'event__season_type', '<i1'),
+    ('week', 'event__week', '<i2'),
+    ('is_neutral_site', 'event__is_neutral_site', '?'),
+    ('team_code', 'team_id', '<i4'),
+    ('opponent_code', 'opponent_id', '<i4'),
+    ('home_away_code', 'home_away', '<i1'),
+    ('team_rank', 'team_rank', '<i2'),
+    ('opponent_rank', 'opponent_rank', '<i2'),
+    ('win_probability', 'win_probability', '<f4'),
+    ('moneyline', 'moneyline', '<f4'),
+    ('implied_probability', 'implied_probability', '<f4'),
+    ('fair_probability', 'fair_probability', '<f4'),
+    ('overround', 'overround', '<f4'),
+    ('edge', 'edge', '<f4'),
+    ('is_winner', 'is_winner', '<i1'),
+]
+
+
+class PredictionDataset:
+    """
+    Every TeamPrediction (with its Event's fields) as one NumPy array per column.
+    League, team and home/away columns hold integer codes into `leagues`, `teams` and `home_away`.
+    Loaded from the cache, columns are read-only memory maps: pages are read on first use and shared between processes.
+    """
+    def __init__(self, columns, leagues, teams, team_ids, home_away, fingerprint):
+        self.columns = columns
+        self.leagues = np.asarray(leagues)          # code -> League.espn_name
+        self.teams = np.asarray(teams)              # code -> Team.name
+        self.team_ids = np.asarray(team_ids)        # code -> Team.id
+        self.home_away = np.asarray(home_away)      # code -> 'home'/'away'/'neutral'
+        self.fingerprint = fingerprint
+
+    def __len__(self):
+        return len(self.columns['prediction_id'])
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    @property
+    def nbytes(self):
+        return sum(column.nbytes for column in self.columns.values())
+
+    def league_mask(self, espn_name):
+        return self.columns['league_code'] == int(np.flatnonzero(self.leagues == espn_name)[0])
+
+    def decode(self, column):
+        """
+        Returns a categorical column's values (e.g. `team_code` -> team names).
+        """
+        categories = {
+            'league_code': self.leagues,
+            'team_code': self.teams,
+            'opponent_code': self.teams,
+            'home_away_code': self.home_away,
+        }[column]
+        return categories[self.columns[column]]
+
+
+def database_fingerprint():
+    """
+    Summarises the rows the dataset is built from with one aggregate query per table.
+    Inserts and deletes always change it; updates change it when they touch a summed column
+    (a winner, probability, moneyline, rank, date or team). Pass `refresh=True` to rebuild after other edits.
+    """
+    state = {
+        'events': Event.objects.aggregate(
+            count=Count('id'), max_id=Max('id'), date=Max('date'), winners=Sum('winner_id'), weeks=Sum('week'),
+        ),
+        'predictions': TeamPrediction.objects.aggregate(
+            count=Count('id'),
+            max_id=Max('id'),
+            win_probability=Sum('win_probability'),
+            moneyline=Sum('moneyline'),
+            fair_probability=Sum('fair_probability'),
+            team_rank=Sum('team_rank'),
+            opponent_rank=Sum('opponent_rank'),
+            teams=Sum('team_id'),
+            winners=Count('id', filter=Q(is_winner=True)),
+        ),
+        'teams': Team.objects.aggregate(count=Count('id'), max_id=Max('id')),
+        'leagues': list(League.objects.order_by('id').values_list('id', 'espn_name')),
+        'columns': [column for column, _, _ in COLUMNS],
+    }
+    return hashlib.sha256(json.dumps(state, default=str, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def _convert(values, dtype):
+    if dtype.kind == 'f':
+        return np.array([np.nan if value is None else float(value) for value in values], dtype=dtype)
+    if dtype.kind == 'M':
+        return np.array(values, dtype=dtype)
+    if dtype.kind == '?':
+        return np.array(values, dtype=dtype)
+
+    return np.array([MISSING_INT if value is None else int(value) for value in values], dtype=dtype)
+
+
+def build_dataset(fingerprint=None):
+    """
+    Reads every TeamPrediction with `values_list` (no model instances) into columns, chunk by chunk.
+    """
+    fingerprint = fingerprint or database_fingerprint()
+    # Bounded by ID, so predictions inserted while building can't outgrow the arrays sized from the count
+    max_id = TeamPrediction.objects.aggregate(max_id=Max('id'))['max_id'] or 0
+    queryset = TeamPrediction.objects.filter(id__lte=max_id).order_by('id').values_list(*(lookup for _, lookup, _ in COLUMNS))
+    size = queryset.count()
+    columns = {name: np.empty(size, dtype=np.dtype(dtype)) for name, _, dtype in COLUMNS}
+    leagues = dict(League.objects.order_by('id').values_list('id', 'espn_name'))
+    league_codes = {league_id: code for code, league_id in enumerate(leagues)}
+    teams = dict(Team.objects.order_by('id').values_list('id', 'name'))
+    team_codes = {team_id: code for code, team_id in enumerate(teams)}
+    home_away = [choice for choice, _ in HOME_AWAY_CHOICES]
+    home_away_codes = {choice: code for code, choice in enumerate(home_away)}
+    encoders = {
+        'espn_id': lambda value: int(value) if value.isdigit() else MISSING_INT,
+        'league_code': league_codes.__getitem__,
+        'team_code': team_codes.__getitem__,
+        'opponent_code': team_codes.__getitem__,
+        'home_away_code': home_away_codes.__getitem__,
+    }
+    position = 0
+    chunk = []
+
+    def flush():
+        for (name, _, dtype), values in zip(COLUMNS, zip(*chunk)):
+            if name in encoders:
+                values = [encoders[name](value) for value in values]
+            columns[name][position:position + len(chunk)] = _convert(values, np.dtype(dtype))
+
+    for row in queryset.iterator(chunk_size=CHUNK_SIZE):
+        chunk.append(row)
+
+        if len(chunk) == CHUNK_SIZE:
+            flush()
+            position += len(chunk)
+            chunk = []
+
+    if chunk:
+        flush()
+        position += len(chunk)
+
+    # Rows deleted between the count and the read leave the arrays short of `size`
+    columns = {name: column[:position] for name, column in columns.items()}
+    return PredictionDataset(columns, list(leagues.values()), list(teams.values()), list(teams), home_away, fingerprint)
+
+
+def save_dataset(dataset, cache_dir, replace=False):
+    """
+    Writes the dataset as one `.npy` file per column plus `meta.json` into a staging directory, then renames it to
+    the fingerprint, so readers never see a half-written cache. An existing copy of the version is kept, or with
+    `replace` moved aside and swapped for the new one. Older versions are removed.
+    """
+    cache_dir = Path(cache_dir)
+    version_dir = cache_dir / dataset.fingerprint
+    staging_dir = cache_dir / f'.{dataset.fingerprint}.{os.getpid()}'
+    staging_dir.mkdir(parents=True, exist_ok=True)
+
+    for name, column in dataset.columns.items():
+        np.save(staging_dir / f'{name}.npy', column)
+
+    with open(staging_dir / 'meta.json', 'w') as meta_file:
+        json.dump({
+            'fingerprint': dataset.fingerprint,
+            'leagues': dataset.leagues.tolist(),
+            'teams': dataset.teams.tolist(),
+            'team_ids': dataset.team_ids.tolist(),
+            'home_away': dataset.home_away.tolist(),
+        }, meta_file)
+
+    if version_dir.exists() and not replace:
+        shutil.rmtree(staging_dir)
+    else:
+        replaced_dir = cache_dir / f'.{dataset.fingerprint}.{os.getpid()}.replaced'
+
+        try:
+            version_dir.rename(replaced_dir)
+        except FileNotFoundError:
+            replaced_dir = None
+
+        staging_dir.rename(version_dir)
+
+        if replaced_dir is not None:
+            shutil.rmtree(replaced_dir, ignore_errors=True)
+
+    for path in cache_dir.iterdir():
+        if path.is_dir() and path.name != dataset.fingerprint and not path.name.startswith('.'):
+            shutil.rmtree(path, ignore_errors=True)     # processes with it mapped keep reading their open files
+
+
+def open_dataset(cache_dir, fingerprint):
+    """
+    Memory-maps a cached dataset version. Returns None if it is not cached.
+    """
+    version_dir = Path(cache_dir) / fingerprint
+
+    try:
+        with open(version_dir / 'meta.json') as meta_file:
+            meta = json.load(meta_file)
+
+        columns = {name: np.load(version_dir / f'{name}.npy', mmap_mode='r') for name, _, _ in COLUMNS}
+    except FileNotFoundError:
+        return None
+
+    return PredictionDataset(columns, meta['leagues'], meta['teams'], meta['team_ids'], meta['home_away'], fingerprint)
+
+
+def load_dataset(cache_dir=None, refresh=False):
+    """
+    Returns the PredictionDataset, memory-mapped from the cache when it was built from the database's current state,
+    otherwise rebuilt from the database and cached. `refresh` rebuilds and replaces the cached version regardless,
+    for edits the fingerprint doesn't see.
+    """
+    cache_dir = Path(cache_dir or settings.DATASET_CACHE_DIR)
+    fingerprint = database_fingerprint()
+
+    if not refresh:
+        dataset = open_dataset(cache_dir, fingerprint)
+
+        if dataset is not None:
+            return dataset
+
+    logger.info(f'Building the prediction dataset ({fingerprint})')
+    dataset = build_dataset(fingerprint)
+    save_dataset(dataset, cache_dir, replace=refresh)
+    return open_dataset(cache_dir, fingerprint)
@@ -0,0 +1,186 @@
+from asgiref.sync import sync_to_async
+import csv
+from decimal import Decimal
+from itertools import islice
+import json
+import zlib
+
+from espndata.events.models import TeamPrediction
+
+EXPORT_FORMATS = ['csv', 'ndjson']
+EXPORT_FIELDS = [
+    ('league', 'event__league__espn_name'),
+    ('espn_id', 'event__espn_id'),
+    ('date', 'event__date'),
+    ('season', 'event__season'),
+    ('season_type', 'event__season_type'),
+    ('week', 'event__week'),
+    ('is_neutral_site', 'event__is_neutral_site'),
+    ('team_name', 'team__name'),
+    ('team_rank', 'team_rank'),
+    ('home_away', 'home_away'),
+    ('win_probability', 'win_probability'),
+    ('moneyline', 'moneyline'),
+    ('implied_probability', 'implied_probability'),
+    ('fair_probability', 'fair_probability'),
+    ('overround', 'overround'),
+    ('edge', 'edge'),
+    ('is_winner', 'is_winner'),
+    ('opponent_name', 'opponent__name'),
+    ('opponent_rank', 'opponent_rank'),
+]
+DEFAULT_CHUNK_SIZE = 2000
+FLUSH_BYTES = 64 * 1024     # size of each yielded piece of output
+
+
+class _LineBuffer:
+    """
+    File-like object for `csv.writer` that hands back the written line instead of storing it.
+    """
+    def write(self, value):
+        return value
+
+
+def get_export_queryset(leagues=None, season=None, date_from=None, date_to=None):
+    """
+    Returns the filtered TeamPrediction queryset to be exported.
+    Ordered by primary key so the database can walk its index instead of sorting the result.
+    """
+    queryset = TeamPrediction.objects.order_by('pk')
+
+    if leagues:
+        queryset = queryset.filter(event__league__espn_name__in=leagues)
+    if season:
+        queryset = queryset.filter(event__season=season)
+    if date_from:
+        queryset = queryset.filter(event__date__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(event__date__lte=date_to)
+
+    return queryset
+
+
+def iter_export_rows(queryset, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yields the exported rows of `queryset` as plain tuples.
+    Rows are fetched `chunk_size` at a time and model instances are never built, keeping memory flat.
+    """
+    lookups = [lookup for _, lookup in EXPORT_FIELDS]
+    return queryset.values_list(*lookups).iterator(chunk_size=chunk_size)
+
+
+async def aiter_export_rows(queryset, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Async version of `iter_export_rows()`, for async views. Each chunk is fetched in Django's sync thread.
+    `values_list().aiterator()` is not used since it starts executing the query on the event loop, which Django refuses.
+    """
+    rows = None
+
+    def next_chunk():
+        nonlocal rows
+
+        if rows is None:
+            rows = iter_export_rows(queryset, chunk_size)   # created in the sync thread that owns the cursor
+
+        return list(islice(rows, chunk_size))
+
+    while True:
+        chunk = await sync_to_async(next_chunk)()
+
+        for row in chunk:
+            yield row
+
+        if len(chunk) < chunk_size:
+            break
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+
+    return str(value)   # dates
+
+
+class ExportEncoder:
+    """
+    Encodes exported rows as CSV or NDJSON bytes in pieces of roughly FLUSH_BYTES, gzipped on the fly if `compress` is True.
+    Shared by the sync and async export streams.
+    """
+    def __init__(self, export_format='csv', compress=False):
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f'Unsupported export format: {export_format}')
+
+        self.export_format = export_format
+        self.names = [name for name, _ in EXPORT_FIELDS]
+        self.writer = csv.writer(_LineBuffer())
+        self.compressor = zlib.compressobj(wbits=31) if compress else None    # wbits=31 writes a gzip header
+        self.pending = []
+        self.pending_size = 0
+
+        if export_format == 'csv':
+            self.add(self.writer.writerow(self.names))
+
+    def encode_row(self, row):
+        if self.export_format == 'csv':
+            return self.writer.writerow(row)
+
+        return json.dumps(dict(zip(self.names, row)), default=_json_default, separators=(',', ':')) + '\n'
+
+    def add(self, line):
+        """
+        Buffers one encoded line. Returns the next piece of output once FLUSH_BYTES have built up, else b''.
+        """
+        self.pending.append(line)
+        self.pending_size += len(line)
+
+        if self.pending_size < FLUSH_BYTES:
+            return b''
+
+        data = ''.join(self.pending).encode('utf-8')
+        self.pending = []
+        self.pending_size = 0
+        return self.compressor.compress(data) if self.compressor else data
+
+    def finish(self):
+        data = ''.join(self.pending).encode('utf-8')
+        self.pending = []
+        self.pending_size = 0
+        return self.compressor.compress(data) + self.compressor.flush() if self.compressor else data
+
+
+def stream_export(rows, export_format='csv', compress=False):
+    """
+    Yields the encoded export of `rows` as bytes, in pieces of roughly FLUSH_BYTES.
+    If `compress` is True, the output is gzipped on the fly.
+    """
+    encoder = ExportEncoder(export_format, compress)
+
+    for row in rows:
+        data = encoder.add(encoder.encode_row(row))
+
+        if data:
+            yield data
+
+    data = encoder.finish()
+
+    if data:
+        yield data
+
+
+async def astream_export(rows, export_format='csv', compress=False):
+    """
+    Async version of `stream_export()` for an async iterable of rows (see `aiter_export_rows()`).
+    Under ASGI, Django has to read a sync iterator to the end before sending anything; this one is streamed as it is read.
+    """
+    encoder = ExportEncoder(export_format, compress)
+
+    async for row in rows:
+        data = encoder.add(encoder.encode_row(row))
+
+        if data:
+            yield data
+
+    data = encoder.finish()
+
+    if data:
+        yield data
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+
+import time
+import tracemalloc
+
+from espndata.events.dataset import database_fingerprint, load_dataset
+from espndata.events.models import TeamPrediction
+
+
+class Command(BaseCommand):
+    help = 'Builds (or validates) the memory-mapped prediction dataset cache and reports its load time and memory use.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--refresh', action='store_true', help='Rebuild the cache even if it matches the database.')
+        parser.add_argument(
+            '--compare-orm',
+            action='store_true',
+            help='Also load every TeamPrediction (with its Event) as model instances, for comparison.',
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        database_fingerprint()
+        self.stdout.write(f'Fingerprint: {(time.perf_counter() - start) * 1000:.1f} ms')
+
+        start = time.perf_counter()
+        dataset = load_dataset(refresh=options['refresh'])
+        self.stdout.write(
+            f'{len(dataset)} predictions in {len(dataset.columns)} columns ({dataset.nbytes / 1e6:.1f} MB on disk) '
+            f'ready in {(time.perf_counter() - start) * 1000:.1f} ms; cache version {dataset.fingerprint}'
+        )
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        dataset = load_dataset()
+
+        for column in dataset.columns.values():
+            column.max()
+
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.stdout.write(f'Cached load plus a pass over every column: {elapsed * 1000:.1f} ms, peak {peak / 1e6:.1f} MB allocated')
+
+        if options['compare_orm']:
+            tracemalloc.start()
+            start = time.perf_counter()
+            predictions = list(TeamPrediction.objects.select_related('event'))
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            self.stdout.write(f'ORM: {len(predictions)} instances in {elapsed * 1000:.1f} ms, peak {peak / 1e6:.1f} MB allocated')
@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from datetime import timedelta
+import logging
+
+from espndata.events.models import Event, League, WinProbabilityPoint, WinProbabilitySeries
+from espndata.events.timeseries import pack_series
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = (
+        'Packs finished events\' live WinProbabilityPoint rows into compact WinProbabilitySeries rows and deletes the points. '
+        'Only needed for points stored before live tracking wrote series directly.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--idle-hours',
+            type=int,
+            default=12,
+            help='Also compact events with no new points for this many hours, even if not yet collected.',
+        )
+
+    def handle(self, *args, **options):
+        idle_cutoff = timezone.now() - timedelta(hours=options['idle_hours'])
+        leagues = League.objects.in_bulk()
+        collected_pairs = set(Event.objects.filter(winner__isnull=False).values_list('league_id', 'espn_id'))
+        # A series packed from the summary is complete (periods, halftime value); the live points only duplicate it
+        stored_pairs = set(WinProbabilitySeries.objects.values_list('league_id', 'espn_id'))
+        tracked = WinProbabilityPoint.objects.values('league_id', 'espn_id').annotate(last_recorded=Max('recorded_at'))
+        compacted = 0
+
+        for row in tracked.iterator():
+            pair = (row['league_id'], row['espn_id'])
+
+            if pair not in collected_pairs and row['last_recorded'] > idle_cutoff:
+                continue    # game may still be live
+
+            points = WinProbabilityPoint.objects.filter(league_id=pair[0], espn_id=pair[1])
+
+            if pair in stored_pairs:
+                points.delete()
+                compacted += 1
+                continue
+
+            win_probs = [
+                {'homeWinPercentage': prob, 'playId': play_id}
+                for prob, play_id in points.order_by('sequence').values_list('home_win_percentage', 'play_id')
+            ]
+            fields = pack_series(win_probs, sport=leagues[pair[0]].sport)
+
+            with transaction.atomic():
+                if fields:
+                    # A summary series stored since `stored_pairs` was read wins
+                    WinProbabilitySeries.objects.bulk_create(
+                        [WinProbabilitySeries(league_id=pair[0], espn_id=pair[1], **fields)], ignore_conflicts=True,
+                    )
+                points.delete()
+
+            compacted += 1
+
+        logger.info(f'{compacted} live win probability series compacted')
@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+
+from datetime import date
+import logging
+import sys
+
+from espndata.events.export import (
+    DEFAULT_CHUNK_SIZE,
+    EXPORT_FORMATS,
+    get_export_queryset,
+    iter_export_rows,
+    stream_export,
+)
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Streams TeamPrediction rows to a CSV or NDJSON file (optionally gzipped) without loading them into memory.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=EXPORT_FORMATS, default='csv')
+        parser.add_argument('--output', help='File to write to. Writes to stdout if omitted.')
+        parser.add_argument('--compress', action='store_true', help='Gzip the output. Implied by an `--output` ending in `.gz`.')
+        parser.add_argument('--league', action='append', dest='leagues', help='ESPN league name. May be repeated.')
+        parser.add_argument('--season', type=int)
+        parser.add_argument('--date-from', type=date.fromisoformat, help='YYYY-MM-DD, inclusive.')
+        parser.add_argument('--date-to', type=date.fromisoformat, help='YYYY-MM-DD, inclusive.')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        output = options['output']
+        compress = options['compress'] or bool(output and output.endswith('.gz'))
+        queryset = get_export_queryset(
+            leagues=options['leagues'],
+            season=options['season'],
+            date_from=options['date_from'],
+            date_to=options['date_to'],
+        )
+        rows = iter_export_rows(queryset, chunk_size=options['chunk_size'])
+        out_file = open(output, 'wb') if output else sys.stdout.buffer
+        total_bytes = 0
+
+        try:
+            for data in stream_export(rows, export_format=options['format'], compress=compress):
+                out_file.write(data)
+                total_bytes += len(data)
+        finally:
+            if output:
+                out_file.close()
+            else:
+                out_file.flush()
+
+        if output:
+            logger.info(f'Exported predictions to {output} ({total_bytes} bytes)')
@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from espndata.events.synthetic import INSERT_BATCH_SIZE, LEAGUE_TEMPLATES, delete_synthetic_data, generate, synthetic_leagues
+
+
+class Command(BaseCommand):
+    help = (
+        'Generates synthetic Leagues with realistic schedules, ESPN win probabilities, moneylines and outcomes, '
+        'for load and query testing at sizes the real data will take years to reach. Reproducible for a given --seed.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--league',
+            action='append',
+            choices=sorted(LEAGUE_TEMPLATES),
+            help='League template to generate. May be repeated. Defaults to all templates.',
+        )
+        parser.add_argument('--seasons', type=int, default=5, help='Seasons generated per league.')
+        parser.add_argument('--end-season', type=int, default=2024, help='Last generated season.')
+        parser.add_argument(
+            '--copies',
+            type=int,
+            default=1,
+            help='Independent leagues generated per template (e.g. 50 copies of every template is about 10 million Events).',
+        )
+        parser.add_argument('--seed', type=int, default=0, help='Random seed; the same arguments always generate the same data.')
+        parser.add_argument('--batch-size', type=int, default=INSERT_BATCH_SIZE, help='Events written per transaction.')
+        parser.add_argument('--replace', action='store_true', help='Delete all existing synthetic leagues first.')
+
+    def handle(self, *args, **options):
+        templates = {name: template for name, template in LEAGUE_TEMPLATES.items() if name in (options['league'] or LEAGUE_TEMPLATES)}
+        seasons = list(range(options['end_season'] - options['seasons'] + 1, options['end_season'] + 1))
+
+        if synthetic_leagues().exists():
+            if not options['replace']:
+                raise CommandError('Synthetic leagues already exist; pass --replace to regenerate them.')
+
+            self.stdout.write(f'Deleted {delete_synthetic_data()} synthetic Events')
+
+        counts, summaries, elapsed = generate(
+            templates, seasons, copies=options['copies'], seed=options['seed'], batch_size=options['batch_size'],
+        )
+
+        for league, stats in summaries.items():
+            self.stdout.write(
+                f'{league.display_name}: {stats["games"]} games, home teams won {stats["home_wins"] / stats["games"]:.1%} '
+                f'(ESPN expected {stats["predicted_home_wins"] / stats["games"]:.1%}), '
+                f'ESPN favourites won {stats["favourite_wins"] / stats["games"]:.1%}, Brier score {stats["brier"] / stats["games"]:.3f}'
+            )
+
+        rows = counts['events'] + counts['team_predictions']
+        self.stdout.write(
+            f'{counts["events"]} Events and {counts["team_predictions"]} TeamPredictions in {elapsed:.1f}s '
+            f'({rows / elapsed:.0f} rows/s, {counts["events"] / elapsed:.0f} events/s)'
+        )
@@ -0,0 +1,71 @@
+from django.core.management.base import BaseCommand, CommandError
+
+import time
+
+from espndata.events.matchups import lookup, lookup_exact, update_matchup_index
+from espndata.events.models import HOME_AWAY_CHOICES, MONEYLINE_ROLE_CHOICES, League
+
+YES_NO = {'yes': True, 'no': False}
+
+
+class Command(BaseCommand):
+    help = 'Updates the similar-matchup index and answers "how did teams in this spot do historically?" queries.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--league', action='append', help='ESPN league name. May be repeated. Defaults to all leagues.')
+        parser.add_argument('--rebuild', action='store_true', help='Recount every completed prediction instead of only new ones.')
+        parser.add_argument('--query', action='store_true', help='Print the outcomes matching the options below.')
+        parser.add_argument('--win-probability', type=float, help='ESPN win probability (percent); its band is queried.')
+        parser.add_argument('--home-away', choices=[choice for choice, _ in HOME_AWAY_CHOICES])
+        parser.add_argument('--team-ranked', choices=YES_NO)
+        parser.add_argument('--opponent-ranked', choices=YES_NO)
+        parser.add_argument('--moneyline-role', choices=[choice for choice, _ in MONEYLINE_ROLE_CHOICES])
+        parser.add_argument(
+            '--exact',
+            nargs=2,
+            type=float,
+            metavar=('MIN', 'MAX'),
+            help='Also answer from the predictions themselves for win probabilities in [MIN, MAX).',
+        )
+
+    def handle(self, *args, **options):
+        leagues = League.objects.all()
+
+        if options['league']:
+            leagues = leagues.filter(espn_name__in=options['league'])
+
+        if options['exact'] and not options['query']:
+            raise CommandError('--exact is only used with --query')
+
+        dimensions = {
+            'home_away': options['home_away'],
+            'team_ranked': YES_NO.get(options['team_ranked']),
+            'opponent_ranked': YES_NO.get(options['opponent_ranked']),
+            'moneyline_role': options['moneyline_role'],
+        }
+
+        for league in leagues:
+            counted = update_matchup_index(league, rebuild=options['rebuild'])
+            self.stdout.write(f'{league.display_name}: {counted} predictions added to the matchup index')
+
+            if not options['query']:
+                continue
+
+            start = time.perf_counter()
+            outcomes = lookup(league, win_probability=options['win_probability'], **dimensions)
+            self.write_outcomes('index', outcomes, time.perf_counter() - start)
+
+            if options['exact']:
+                start = time.perf_counter()
+                outcomes = lookup_exact(league, min_probability=options['exact'][0], max_probability=options['exact'][1], **dimensions)
+                self.write_outcomes('exact', outcomes, time.perf_counter() - start)
+
+    def write_outcomes(self, source, outcomes, elapsed):
+        if not outcomes['games']:
+            self.stdout.write(f'  {source}: no matching games ({elapsed * 1000:.1f} ms)')
+            return
+
+        self.stdout.write(
+            f'  {source}: {outcomes["wins"]}/{outcomes["games"]} won ({outcomes["win_rate"]:.1f}%), '
+            f'mean predicted {outcomes["mean_win_probability"]:.1f}% ({elapsed * 1000:.1f} ms)'
+        )
@@ -0,0 +1,67 @@
+from django.core.management.base import BaseCommand
+
+import logging
+import numpy as np
+
+from espndata.events.models import League
+from espndata.events.ratings import compare_with_espn, get_parameters, load_games, replay, tune, update_league_ratings
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Updates Elo team ratings from newly completed events and reports their predictive accuracy next to ESPN\'s.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--league', action='append', help='ESPN league name. May be repeated. Defaults to all leagues.')
+        parser.add_argument('--rebuild', action='store_true', help='Discard stored ratings and snapshots and replay all history.')
+        parser.add_argument('--report', action='store_true', help='Print Brier score, log loss and accuracy for the model and ESPN.')
+        parser.add_argument('--tune', action='store_true', help='Grid-search K and home advantage with a vectorised replay.')
+        parser.add_argument(
+            '--skip-games',
+            type=int,
+            default=0,
+            help='Leave the first N games out of --report/--tune scoring while ratings converge.',
+        )
+
+    def handle(self, *args, **options):
+        leagues = League.objects.all()
+
+        if options['league']:
+            leagues = leagues.filter(espn_name__in=options['league'])
+
+        for league in leagues:
+            rated = update_league_ratings(league, rebuild=options['rebuild'])
+            self.stdout.write(f'{league.display_name}: {rated} events rated')
+
+            if not (options['report'] or options['tune']):
+                continue
+
+            games = load_games(league)
+
+            if games is None or len(games) <= options['skip_games']:
+                self.stdout.write('  not enough completed events to score')
+                continue
+
+            parameters = get_parameters(league)
+
+            if options['report']:
+                probs = replay(games, parameters.k, parameters.home_advantage, parameters.initial, parameters.season_carryover)[0]
+                comparison = compare_with_espn(games, probs, options['skip_games'])
+                self.stdout.write(f'  {comparison["games"]} games scored   Brier   Log loss   Accuracy')
+
+                for source in ('model', 'espn'):
+                    scores = comparison[source]
+                    self.stdout.write(f'  {source:<19}{scores["brier"]:>8.4f}{scores["log_loss"]:>11.4f}{scores["accuracy"]:>11.1%}')
+
+            if options['tune']:
+                results = tune(
+                    games,
+                    parameters,
+                    k_values=np.linspace(parameters.k / 4, parameters.k * 2.5, 12),
+                    home_advantage_values=np.linspace(0, parameters.home_advantage * 2.5, 11),
+                    skip_games=options['skip_games'],
+                )
+                self.stdout.write(f'  Best of {len(results)} parameter sets (current K={parameters.k:g}, home advantage={parameters.home_advantage:g}):')
+
+                for log_loss, k, home_advantage in results[:5]:
+                    self.stdout.write(f'    K={k:<8.2f} home advantage={home_advantage:<8.1f} log loss={log_loss:.4f}')
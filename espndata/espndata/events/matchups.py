@@ -0,0 +1,177 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import BooleanField, Case, Count, ExpressionWrapper, F, IntegerField, Max, Q, Sum, Value, When
+from django.db.models.functions import Cast, Floor, Least
+
+from espndata.events.models import MatchupBucket, MatchupIndexState, TeamPrediction
+
+BUCKET_FIELDS = ['probability_band', 'home_away', 'team_ranked', 'opponent_ranked', 'moneyline_role']
+
+
+def bucket_annotations():
+    """
+    Returns the expressions that place a TeamPrediction in its MatchupBucket, computed by the database.
+    The moneyline role comes from the overround-free `fair_probability`, so a -110/-110 game is a pick'em for both sides.
+    """
+    width = settings.MATCHUP_BAND_WIDTH
+
+    return {
+        'probability_band': Least(Cast(Floor(F('win_probability') / width), IntegerField()) * width, Value(100 - width)),
+        'team_ranked': ExpressionWrapper(Q(team_rank__isnull=False), output_field=BooleanField()),
+        'opponent_ranked': ExpressionWrapper(Q(opponent_rank__isnull=False), output_field=BooleanField()),
+        'moneyline_role': Case(
+            When(fair_probability__isnull=True, then=Value('none')),
+            When(fair_probability__gt=50, then=Value('favourite')),
+            When(fair_probability__lt=50, then=Value('underdog')),
+            default=Value('pick'),
+        ),
+    }
+
+
+def completed_predictions(league):
+    return TeamPrediction.objects.filter(event__league=league, event__winner__isnull=False)
+
+
+def outcome_totals(totals):
+    """
+    Returns {games, wins, win_rate, mean_win_probability} from aggregated `games`, `wins` and `win_probability_sum`.
+    """
+    played = totals['games'] or 0
+
+    return {
+        'games': played,
+        'wins': totals['wins'] or 0,
+        'win_rate': round(100 * totals['wins'] / played, 2) if played else None,
+        'mean_win_probability': round(float(totals['win_probability_sum']) / played, 2) if played else None,
+    }
+
+
+def index_checksum(predictions):
+    """
+    Returns totals of the fields that decide a prediction's bucket and outcome, as a JSON-serialisable dictionary.
+    """
+    totals = predictions.aggregate(
+        predictions=Count('id'),
+        wins=Count('id', filter=Q(is_winner=True)),
+        win_probability=Sum('win_probability'),
+        fair_probability=Sum('fair_probability'),
+        team_ranked=Count('team_rank'),
+        opponent_ranked=Count('opponent_rank'),
+    )
+    return {name: round(float(total or 0), 4) for name, total in totals.items()}
+
+
+def update_matchup_index(league, rebuild=False):
+    """
+    Adds the league's TeamPredictions completed since the last update to its MatchupBuckets, with one GROUP BY query.
+    Falls back to a full rebuild when predictions already counted changed in the meantime: older predictions completed,
+    removed, re-ingested or refreshed in place (e.g. by `summary_data --refresh` or `reprocess_summaries`), which shows
+    up as their checksum no longer matching. Returns the number of predictions counted.
+    """
+    state, _ = MatchupIndexState.objects.get_or_create(league=league)
+    completed = completed_predictions(league)
+    new_predictions = completed.filter(id__gt=state.last_prediction_id)
+
+    if not rebuild and index_checksum(completed.filter(id__lte=state.last_prediction_id)) != state.checksum:
+        rebuild = True
+
+    if rebuild:
+        new_predictions = completed
+
+    last_prediction_id = new_predictions.aggregate(Max('id'))['id__max']
+    new_predictions = new_predictions.filter(id__lte=last_prediction_id or 0)     # ignore rows inserted from here on
+    rows = (
+        new_predictions.order_by().annotate(**bucket_annotations()).values(*BUCKET_FIELDS)
+        .annotate(games=Count('id'), wins=Count('id', filter=Q(is_winner=True)), win_probability_sum=Sum('win_probability'))
+    )
+
+    with transaction.atomic():
+        if rebuild:
+            MatchupBucket.objects.filter(league=league).delete()
+            state.last_prediction_id = 0
+            state.predictions = 0
+
+        buckets = {
+            tuple(getattr(bucket, field) for field in BUCKET_FIELDS): bucket
+            for bucket in MatchupBucket.objects.filter(league=league)
+        }
+        counted = 0
+
+        for row in rows:
+            key = tuple(row[field] for field in BUCKET_FIELDS)
+            bucket = buckets.setdefault(key, MatchupBucket(league=league, **dict(zip(BUCKET_FIELDS, key))))
+            bucket.games += row['games']
+            bucket.wins += row['wins']
+            bucket.win_probability_sum += float(row['win_probability_sum'])
+            counted += row['games']
+
+        MatchupBucket.objects.bulk_create(
+            buckets.values(),
+            update_conflicts=True,
+            unique_fields=['league', *BUCKET_FIELDS],
+            update_fields=['games', 'wins', 'win_probability_sum'],
+        )
+        state.last_prediction_id = max(state.last_prediction_id, last_prediction_id or 0)
+        state.predictions += counted
+        state.checksum = index_checksum(completed.filter(id__lte=state.last_prediction_id))
+        state.save()
+
+    return counted
+
+
+def matchup_filters(home_away=None, team_ranked=None, opponent_ranked=None, moneyline_role=None):
+    filters = {
+        'home_away': home_away,
+        'team_ranked': team_ranked,
+        'opponent_ranked': opponent_ranked,
+        'moneyline_role': moneyline_role,
+    }
+    return {field: value for field, value in filters.items() if value is not None}
+
+
+def matching_buckets(league, win_probability=None, **dimensions):
+    buckets = MatchupBucket.objects.filter(league=league, **matchup_filters(**dimensions))
+
+    if win_probability is not None:
+        width = settings.MATCHUP_BAND_WIDTH
+        buckets = buckets.filter(probability_band=min(int(win_probability // width) * width, 100 - width))
+
+    return buckets
+
+
+def matching_predictions(league, min_probability=None, max_probability=None, **dimensions):
+    predictions = completed_predictions(league).annotate(**bucket_annotations()).filter(**matchup_filters(**dimensions))
+
+    if min_probability is not None:
+        predictions = predictions.filter(win_probability__gte=min_probability)
+    if max_probability is not None:
+        predictions = predictions.filter(win_probability__lt=max_probability)
+
+    return predictions
+
+
+def bucket_totals():
+    return {'games': Sum('games'), 'wins': Sum('wins'), 'win_probability_sum': Sum('win_probability_sum')}
+
+
+def prediction_totals():
+    return {'games': Count('id'), 'wins': Count('id', filter=Q(is_winner=True)), 'win_probability_sum': Sum('win_probability')}
+
+
+def lookup(league, win_probability=None, **dimensions):
+    """
+    Answers "how did teams in this spot do?" from the league's MatchupBuckets: the outcomes of completed predictions in
+    `win_probability`'s band matching the given dimensions (`home_away`, `team_ranked`, `opponent_ranked`, `moneyline_role`).
+    Omitted dimensions match everything. Reads at most one row per bucket, however much history is indexed.
+    """
+    return outcome_totals(matching_buckets(league, win_probability, **dimensions).aggregate(**bucket_totals()))
+
+
+def lookup_exact(league, min_probability=None, max_probability=None, **dimensions):
+    """
+    Same question as `lookup()`, answered from the TeamPredictions themselves for any win probability range
+    [min_probability, max_probability). Slower, but needs no index and is not limited to band boundaries.
+    """
+    predictions = matching_predictions(league, min_probability, max_probability, **dimensions)
+    return outcome_totals(predictions.aggregate(**prediction_totals()))
+
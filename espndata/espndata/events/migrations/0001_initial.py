@@ -0,0 +1,91 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='League',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('espn_name', models.CharField(max_length=32, unique=True)),
+                ('display_name', models.CharField(max_length=32, unique=True)),
+                ('sport', models.CharField(max_length=32)),
+                ('check_type', models.CharField(choices=[('weekly', 'Weekly'), ('daily', 'Daily')], max_length=8)),
+                ('check_day', models.IntegerField(blank=True, null=True)),
+                ('_season_types', models.JSONField(blank=True, default=dict)),
+                ('season_start', models.DateField()),
+                ('season_end', models.DateField()),
+                ('all_star_start', models.DateField(blank=True, null=True)),
+                ('all_star_end', models.DateField(blank=True, null=True)),
+                ('is_offseason', models.BooleanField()),
+            ],
+            options={
+                'ordering': ['display_name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Event',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('espn_id', models.CharField(max_length=24)),
+                ('date', models.DateField()),
+                ('season', models.IntegerField()),
+                ('week', models.IntegerField(null=True)),
+                ('season_type', models.IntegerField(choices=[(2, 'Regular Season'), (3, 'Post Season')])),
+                ('winning_team', models.CharField(blank=True, max_length=128, null=True)),
+                ('is_neutral_site', models.BooleanField(default=False)),
+                ('both_ranked_matchup', models.BooleanField(default=False)),
+                ('one_ranked_matchup', models.BooleanField(default=False)),
+                ('league', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='events.league')),
+            ],
+            options={
+                'ordering': ['league', '-espn_id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='DataCollectionState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('collection_date', models.DateField()),
+                ('event_date', models.DateField(blank=True, null=True)),
+                ('season_type', models.IntegerField(choices=[(2, 'Regular Season'), (3, 'Post Season')])),
+                ('week', models.IntegerField(blank=True, null=True)),
+                ('league', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='data_collection_state', to='events.league')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TeamPrediction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('team_name', models.CharField(max_length=128)),
+                ('team_rank', models.IntegerField(blank=True, null=True)),
+                ('home_away', models.CharField(choices=[('home', 'Home'), ('away', 'Away'), ('neutral', 'Neutral')], max_length=8)),
+                ('win_probability', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('moneyline', models.DecimalField(blank=True, decimal_places=4, max_digits=10, null=True)),
+                ('is_winner', models.BooleanField(blank=True, null=True)),
+                ('opponent_name', models.CharField(max_length=128)),
+                ('opponent_rank', models.IntegerField(blank=True, null=True)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='predictions', to='events.event')),
+            ],
+            options={
+                'ordering': ['event__league__display_name', 'event__date', '-event__espn_id'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='event',
+            constraint=models.UniqueConstraint(fields=('league', 'espn_id'), name='unique_league_event_id_combination'),
+        ),
+        migrations.AddConstraint(
+            model_name='teamprediction',
+            constraint=models.UniqueConstraint(fields=('event', 'team_name'), name='unique_event_team_combination'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WinProbabilityPoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('espn_id', models.CharField(max_length=24)),
+                ('sequence', models.IntegerField()),
+                ('play_id', models.CharField(blank=True, max_length=32)),
+                ('home_win_percentage', models.FloatField()),
+                ('recorded_at', models.DateTimeField()),
+                ('league', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='win_probability_points', to='events.league')),
+            ],
+            options={
+                'ordering': ['league', 'espn_id', 'sequence'],
+                'constraints': [models.UniqueConstraint(fields=('league', 'espn_id', 'sequence'), name='unique_league_event_sequence_combination')],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0002_winprobabilitypoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WinProbabilitySeries',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('espn_id', models.CharField(max_length=24)),
+                ('length', models.IntegerField()),
+                ('home_win_percentages', models.BinaryField()),
+                ('play_ids', models.BinaryField()),
+                ('periods', models.BinaryField()),
+                ('pregame_home_win_percentage', models.FloatField()),
+                ('halftime_home_win_percentage', models.FloatField(blank=True, null=True)),
+                ('final_home_win_percentage', models.FloatField()),
+                ('min_home_win_percentage', models.FloatField()),
+                ('max_home_win_percentage', models.FloatField()),
+                ('max_swing', models.FloatField(db_index=True)),
+                ('league', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='win_probability_series', to='events.league')),
+            ],
+            options={
+                'verbose_name_plural': 'Win Probability Series',
+                'ordering': ['league', '-espn_id'],
+                'constraints': [models.UniqueConstraint(fields=('league', 'espn_id'), name='unique_league_series_event_id_combination')],
+            },
+        ),
+    ]
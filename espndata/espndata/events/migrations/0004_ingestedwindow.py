@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0003_winprobabilityseries'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IngestedWindow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('window_key', models.CharField(max_length=32)),
+                ('event_count', models.IntegerField()),
+                ('ingested_at', models.DateTimeField(auto_now=True)),
+                ('league', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ingested_windows', to='events.league')),
+            ],
+            options={
+                'ordering': ['league', 'window_key'],
+                'constraints': [models.UniqueConstraint(fields=('league', 'window_key'), name='unique_league_window_combination')],
+            },
+        ),
+    ]
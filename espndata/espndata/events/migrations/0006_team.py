@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0005_ingestiontask_ratelimitslot'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='teamprediction',
+            name='unique_event_team_combination',
+        ),
+        migrations.CreateModel(
+            name='Team',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('espn_team_id', models.CharField(blank=True, max_length=16, null=True)),
+                ('name', models.CharField(max_length=128)),
+                ('league', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='teams', to='events.league')),
+            ],
+            options={
+                'ordering': ['league', 'name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='winner',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.RESTRICT, related_name='won_events', to='events.team'),
+        ),
+        migrations.AddField(
+            model_name='teamprediction',
+            name='opponent',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.RESTRICT, related_name='opponent_predictions', to='events.team'),
+        ),
+        migrations.AddField(
+            model_name='teamprediction',
+            name='team',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.RESTRICT, related_name='predictions', to='events.team'),
+        ),
+        migrations.AddIndex(
+            model_name='team',
+            index=models.Index(fields=['league', 'name'], name='events_team_league__da314d_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='team',
+            constraint=models.UniqueConstraint(fields=('league', 'espn_team_id'), name='unique_league_espn_team_combination'),
+        ),
+    ]
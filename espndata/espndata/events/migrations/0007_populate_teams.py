@@ -0,0 +1,77 @@
+from django.db import migrations
+
+BATCH_SIZE = 2000
+
+
+def populate_teams(apps, schema_editor):
+    """
+    Creates one Team per distinct (league, name) in existing rows and points TeamPrediction/Event at them.
+    """
+    Team = apps.get_model('events', 'Team')
+    TeamPrediction = apps.get_model('events', 'TeamPrediction')
+    Event = apps.get_model('events', 'Event')
+
+    names = set(TeamPrediction.objects.values_list('event__league_id', 'team_name'))
+    names |= set(TeamPrediction.objects.values_list('event__league_id', 'opponent_name'))
+    names |= set(Event.objects.exclude(winning_team__isnull=True).values_list('league_id', 'winning_team'))
+    Team.objects.bulk_create(
+        [Team(league_id=league_id, name=name) for league_id, name in sorted(names)],
+        batch_size=BATCH_SIZE,
+    )
+    team_ids = {(league_id, name): team_id for team_id, league_id, name in Team.objects.values_list('id', 'league_id', 'name')}
+
+    predictions = []
+
+    for prediction_id, league_id, team_name, opponent_name in TeamPrediction.objects.values_list(
+        'id', 'event__league_id', 'team_name', 'opponent_name'
+    ).iterator(chunk_size=BATCH_SIZE):
+        predictions.append(TeamPrediction(
+            id=prediction_id,
+            team_id=team_ids[(league_id, team_name)],
+            opponent_id=team_ids[(league_id, opponent_name)],
+        ))
+
+        if len(predictions) == BATCH_SIZE:
+            TeamPrediction.objects.bulk_update(predictions, ['team', 'opponent'])
+            predictions = []
+
+    TeamPrediction.objects.bulk_update(predictions, ['team', 'opponent'])
+
+    events = [
+        Event(id=event_id, winner_id=team_ids[(league_id, winning_team)])
+        for event_id, league_id, winning_team in Event.objects.exclude(winning_team__isnull=True)
+        .values_list('id', 'league_id', 'winning_team').iterator(chunk_size=BATCH_SIZE)
+    ]
+    Event.objects.bulk_update(events, ['winner'], batch_size=BATCH_SIZE)
+
+
+def restore_team_names(apps, schema_editor):
+    TeamPrediction = apps.get_model('events', 'TeamPrediction')
+    Event = apps.get_model('events', 'Event')
+
+    predictions = []
+
+    for prediction in TeamPrediction.objects.select_related('team', 'opponent').iterator(chunk_size=BATCH_SIZE):
+        prediction.team_name = prediction.team.name
+        prediction.opponent_name = prediction.opponent.name
+        predictions.append(prediction)
+
+    TeamPrediction.objects.bulk_update(predictions, ['team_name', 'opponent_name'], batch_size=BATCH_SIZE)
+    events = []
+
+    for event in Event.objects.filter(winner__isnull=False).select_related('winner').iterator(chunk_size=BATCH_SIZE):
+        event.winning_team = event.winner.name
+        events.append(event)
+
+    Event.objects.bulk_update(events, ['winning_team'], batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0006_team'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_teams, restore_team_names),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0007_populate_teams'),
+    ]
+
+    operations = [
+        # Defaults let the name columns be re-added when migrating backwards; 0007 then refills them
+        migrations.AlterField(
+            model_name='teamprediction',
+            name='team_name',
+            field=models.CharField(default='', max_length=128),
+        ),
+        migrations.AlterField(
+            model_name='teamprediction',
+            name='opponent_name',
+            field=models.CharField(default='', max_length=128),
+        ),
+        migrations.RemoveField(
+            model_name='event',
+            name='winning_team',
+        ),
+        migrations.RemoveField(
+            model_name='teamprediction',
+            name='opponent_name',
+        ),
+        migrations.RemoveField(
+            model_name='teamprediction',
+            name='team_name',
+        ),
+        migrations.AlterField(
+            model_name='teamprediction',
+            name='opponent',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.RESTRICT, related_name='opponent_predictions', to='events.team'),
+        ),
+        migrations.AlterField(
+            model_name='teamprediction',
+            name='team',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.RESTRICT, related_name='predictions', to='events.team'),
+        ),
+        migrations.AddConstraint(
+            model_name='teamprediction',
+            constraint=models.UniqueConstraint(fields=('event', 'team'), name='unique_event_team_combination'),
+        ),
+    ]
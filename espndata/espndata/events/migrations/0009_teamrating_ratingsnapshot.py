@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0008_team_foreign_keys'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamRating',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rating', models.FloatField()),
+                ('games', models.IntegerField(default=0)),
+                ('season', models.IntegerField()),
+                ('team', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='rating', to='events.team')),
+            ],
+            options={
+                'ordering': ['-rating'],
+            },
+        ),
+        migrations.CreateModel(
+            name='RatingSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('rating', models.FloatField()),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rating_snapshots', to='events.team')),
+            ],
+            options={
+                'ordering': ['team', 'date'],
+                'constraints': [models.UniqueConstraint(fields=('team', 'date'), name='unique_team_rating_date_combination')],
+            },
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:37
+
+from django.db import migrations, models
+
+from espndata.core.odds import fill_odds_columns
+
+BATCH_SIZE = 2000
+ODDS_COLUMNS = ['implied_probability', 'fair_probability', 'overround', 'edge']
+
+
+def fill_existing_odds_columns(apps, schema_editor):
+    TeamPrediction = apps.get_model('events', 'TeamPrediction')
+    predictions = TeamPrediction.objects.filter(moneyline__isnull=False).order_by('event_id', 'id').only(
+        'id', 'event_id', 'moneyline', 'win_probability',
+    )
+    batch = []
+
+    for prediction in predictions.iterator(chunk_size=BATCH_SIZE):
+        # Only flush on event boundaries so both sides of a game are filled together
+        if len(batch) >= BATCH_SIZE and batch[-1].event_id != prediction.event_id:
+            TeamPrediction.objects.bulk_update(fill_odds_columns(batch), ODDS_COLUMNS)
+            batch = []
+
+        batch.append(prediction)
+
+    TeamPrediction.objects.bulk_update(fill_odds_columns(batch), ODDS_COLUMNS, batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0009_teamrating_ratingsnapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='teamprediction',
+            name='edge',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='teamprediction',
+            name='fair_probability',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='teamprediction',
+            name='implied_probability',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='teamprediction',
+            name='overround',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.RunPython(fill_existing_odds_columns, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0010_teamprediction_odds_columns'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchupIndexState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_prediction_id', models.BigIntegerField(default=0)),
+                ('predictions', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('league', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='matchup_index_state', to='events.league')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='MatchupBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('probability_band', models.IntegerField()),
+                ('home_away', models.CharField(choices=[('home', 'Home'), ('away', 'Away'), ('neutral', 'Neutral')], max_length=8)),
+                ('team_ranked', models.BooleanField()),
+                ('opponent_ranked', models.BooleanField()),
+                ('moneyline_role', models.CharField(choices=[('favourite', 'Favourite'), ('underdog', 'Underdog'), ('pick', "Pick'em"), ('none', 'No Line')], max_length=10)),
+                ('games', models.IntegerField(default=0)),
+                ('wins', models.IntegerField(default=0)),
+                ('win_probability_sum', models.FloatField(default=0.0)),
+                ('league', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='matchup_buckets', to='events.league')),
+            ],
+            options={
+                'ordering': ['league', 'probability_band', 'home_away', 'team_ranked', 'opponent_ranked', 'moneyline_role'],
+                'constraints': [models.UniqueConstraint(fields=('league', 'probability_band', 'home_away', 'team_ranked', 'opponent_ranked', 'moneyline_role'), name='unique_league_matchup_bucket')],
+            },
+        ),
+    ]
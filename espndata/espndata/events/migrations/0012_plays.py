@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0011_matchup_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayType',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sport', models.CharField(max_length=32)),
+                ('espn_type_id', models.IntegerField()),
+                ('text', models.CharField(max_length=128)),
+            ],
+            options={
+                'ordering': ['sport', 'espn_type_id'],
+                'constraints': [models.UniqueConstraint(fields=('sport', 'espn_type_id'), name='unique_sport_play_type_combination')],
+            },
+        ),
+        migrations.CreateModel(
+            name='Play',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sequence', models.IntegerField()),
+                ('espn_play_id', models.BigIntegerField(null=True)),
+                ('period', models.SmallIntegerField()),
+                ('clock_seconds', models.SmallIntegerField(null=True)),
+                ('home_score', models.SmallIntegerField()),
+                ('away_score', models.SmallIntegerField()),
+                ('is_scoring', models.BooleanField(default=False)),
+                ('inning_half', models.SmallIntegerField(choices=[(1, 'Top'), (2, 'Bottom')], null=True)),
+                ('outs', models.SmallIntegerField(null=True)),
+                ('balls', models.SmallIntegerField(null=True)),
+                ('strikes', models.SmallIntegerField(null=True)),
+                ('down', models.SmallIntegerField(null=True)),
+                ('distance', models.SmallIntegerField(null=True)),
+                ('yards_to_endzone', models.SmallIntegerField(null=True)),
+                ('yards_gained', models.SmallIntegerField(null=True)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='plays', to='events.event')),
+                ('team', models.ForeignKey(null=True, on_delete=django.db.models.deletion.RESTRICT, related_name='plays', to='events.team')),
+                ('play_type', models.ForeignKey(null=True, on_delete=django.db.models.deletion.RESTRICT, related_name='plays', to='events.playtype')),
+            ],
+            options={
+                'ordering': ['event', 'sequence'],
+                'constraints': [models.UniqueConstraint(fields=('event', 'sequence'), name='unique_event_play_sequence_combination')],
+            },
+        ),
+    ]
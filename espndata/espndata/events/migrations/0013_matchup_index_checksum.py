@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0012_plays'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='matchupindexstate',
+            name='checksum',
+            field=models.JSONField(default=dict),
+        ),
+    ]
@@ -17,6 +17,22 @@ HOME_AWAY_CHOICES = [
     ('away', 'Away'),
     ('neutral', 'Neutral'),
 ]
+MONEYLINE_ROLE_CHOICES = [
+    ('favourite', 'Favourite'),
+    ('underdog', 'Underdog'),
+    ('pick', 'Pick\'em'),
+    ('none', 'No Line'),
+]
+INNING_HALF_CHOICES = [
+    (1, 'Top'),
+    (2, 'Bottom'),
+]
+TASK_STATUS_CHOICES = [
+    ('pending', 'Pending'),
+    ('leased', 'Leased'),
+    ('done', 'Done'),
+    ('failed', 'Failed'),
+]
 
 
 class League(models.Model):
@@ -80,6 +96,31 @@ class League(models.Model):
         super().save(*args, **kwargs)
 
 
+class Team(models.Model):
+    """
+    A league's team, keyed by ESPN team ID.
+    Teams migrated from name-only rows have no `espn_team_id` until ingestion next sees them.
+    """
+    league = models.ForeignKey(League, on_delete=models.CASCADE, related_name='teams')
+    espn_team_id = models.CharField(max_length=16, null=True, blank=True)
+    name = models.CharField(max_length=128)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['league', 'espn_team_id'],
+                name='unique_league_espn_team_combination',
+            )
+        ]
+        indexes = [
+            models.Index(fields=['league', 'name']),
+        ]
+        ordering = ['league', 'name']
+
+    def __str__(self):
+        return f'{self.league.display_name} - {self.name}'
+
+
 class Event(models.Model):
     league = models.ForeignKey(League, on_delete=models.CASCADE, related_name='events')
     espn_id = models.CharField(max_length=24)
@@ -87,7 +128,7 @@ class Event(models.Model):
     season = models.IntegerField()
     week = models.IntegerField(null=True)
     season_type = models.IntegerField(choices=SEASON_TYPE_CHOICES)
-    winning_team = models.CharField(max_length=128, null=True, blank=True)
+    winner = models.ForeignKey(Team, on_delete=models.RESTRICT, null=True, blank=True, related_name='won_events')
     is_neutral_site = models.BooleanField(default=False)
     both_ranked_matchup = models.BooleanField(default=False)
     one_ranked_matchup = models.BooleanField(default=False)
@@ -107,19 +148,24 @@ class Event(models.Model):
 
 class TeamPrediction(models.Model):
     event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='predictions')
-    team_name = models.CharField(max_length=128)
+    team = models.ForeignKey(Team, on_delete=models.RESTRICT, related_name='predictions')
     team_rank = models.IntegerField(null=True, blank=True)
     home_away = models.CharField(max_length=8, choices=HOME_AWAY_CHOICES)
     win_probability = models.DecimalField(max_digits=5, decimal_places=2)
     moneyline = models.DecimalField(max_digits=10, decimal_places=4, null=True, blank=True)
+    # Percentages derived from `moneyline` in batch by `core.odds.fill_odds_columns()`; edge = win_probability - fair_probability
+    implied_probability = models.FloatField(null=True, blank=True)
+    fair_probability = models.FloatField(null=True, blank=True)
+    overround = models.FloatField(null=True, blank=True)
+    edge = models.FloatField(null=True, blank=True)
     is_winner = models.BooleanField(null=True, blank=True)
-    opponent_name = models.CharField(max_length=128)
+    opponent = models.ForeignKey(Team, on_delete=models.RESTRICT, related_name='opponent_predictions')
     opponent_rank = models.IntegerField(null=True, blank=True)
 
     class Meta:
         constraints = [
             models.UniqueConstraint(
-                fields=['event', 'team_name'],
+                fields=['event', 'team'],
                 name='unique_event_team_combination',
             )
         ]
@@ -127,7 +173,7 @@ class TeamPrediction(models.Model):
 
     def __str__(self):
         vs_at = '@' if self.is_away else 'vs'
-        return f'{self.team_name} {vs_at} {self.opponent_name} ({self.event.date})'
+        return f'{self.team.name} {vs_at} {self.opponent.name} ({self.event.date})'
     
     @property
     def is_home(self):
@@ -143,4 +189,273 @@ class TeamPrediction(models.Model):
     
     @property
     def is_opponent_ranked(self):
-        return self.opponent_rank is not None
\ No newline at end of file
+        return self.opponent_rank is not None
+
+class DataCollectionState(models.Model):
+    league = models.OneToOneField(League, on_delete=models.CASCADE, related_name='data_collection_state')
+    collection_date = models.DateField()
+    event_date = models.DateField(null=True, blank=True)
+    season_type = models.IntegerField(choices=SEASON_TYPE_CHOICES)
+    week = models.IntegerField(null=True, blank=True)
+
+    def __str__(self):
+        return self.league.display_name
+
+
+class WinProbabilityPoint(models.Model):
+    """
+    A single entry of an event's in-game `winprobability` series, as live tracking used to append them.
+    Keyed by league and ESPN ID since live events are tracked before their Event rows are collected.
+    Live tracking now writes WinProbabilitySeries directly; `compact_win_probabilities` packs the remaining rows.
+    """
+    league = models.ForeignKey(League, on_delete=models.CASCADE, related_name='win_probability_points')
+    espn_id = models.CharField(max_length=24)
+    sequence = models.IntegerField()
+    play_id = models.CharField(max_length=32, blank=True)
+    home_win_percentage = models.FloatField()
+    recorded_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['league', 'espn_id', 'sequence'],
+                name='unique_league_event_sequence_combination',
+            )
+        ]
+        ordering = ['league', 'espn_id', 'sequence']
+
+    def __str__(self):
+        return f'{self.league.display_name} - {self.espn_id} #{self.sequence}'
+
+
+class WinProbabilitySeries(models.Model):
+    """
+    An event's full `winprobability` series, packed into little-endian arrays (see `events.timeseries`).
+    Summary columns are computed when packing so cross-event queries never decode the arrays.
+    """
+    league = models.ForeignKey(League, on_delete=models.CASCADE, related_name='win_probability_series')
+    espn_id = models.CharField(max_length=24)
+    length = models.IntegerField()
+    home_win_percentages = models.BinaryField()     # float32
+    play_ids = models.BinaryField()                 # int64
+    periods = models.BinaryField()                  # int8, 0 when unknown
+    pregame_home_win_percentage = models.FloatField()
+    halftime_home_win_percentage = models.FloatField(null=True, blank=True)
+    final_home_win_percentage = models.FloatField()
+    min_home_win_percentage = models.FloatField()
+    max_home_win_percentage = models.FloatField()
+    max_swing = models.FloatField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['league', 'espn_id'],
+                name='unique_league_series_event_id_combination',
+            )
+        ]
+        ordering = ['league', '-espn_id']
+        verbose_name_plural = 'Win Probability Series'
+
+    def __str__(self):
+        return f'{self.league.display_name} - {self.espn_id} ({self.length} points)'
+
+
+class IngestedWindow(models.Model):
+    """
+    A scoreboard window (a date, or a season type + week) whose events have all been gathered.
+    Used by the backfill planner to skip windows that cannot yield new events.
+    """
+    league = models.ForeignKey(League, on_delete=models.CASCADE, related_name='ingested_windows')
+    window_key = models.CharField(max_length=32)
+    event_count = models.IntegerField()
+    ingested_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['league', 'window_key'],
+                name='unique_league_window_combination',
+            )
+        ]
+        ordering = ['league', 'window_key']
+
+    def __str__(self):
+        return f'{self.league.display_name} - {self.window_key}'
+
+
+class IngestionTask(models.Model):
+    """
+    A batch of ESPN event IDs in the summary work queue.
+    Workers lease a pending task (or one whose lease expired), renew the lease with heartbeats while they work,
+    and mark it done in the same transaction that writes its rows.
+    """
+    league = models.ForeignKey(League, on_delete=models.CASCADE, related_name='ingestion_tasks')
+    espn_ids = models.JSONField(default=list)
+    status = models.CharField(max_length=8, choices=TASK_STATUS_CHOICES, default='pending')
+    lease_owner = models.CharField(max_length=128, blank=True)
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.IntegerField(default=0)
+    incomplete = models.JSONField(default=dict, blank=True)     # espn_id -> reason, as in `incomplete_data_events.json`
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'lease_expires_at']),
+        ]
+        ordering = ['id']
+
+    def __str__(self):
+        return f'{self.league.display_name} - {len(self.espn_ids)} IDs ({self.status})'
+
+
+class RateLimitSlot(models.Model):
+    """
+    Shared request schedule for workers on any host using this database.
+    `next_slot` is the epoch time of the next request any worker may make under the named limit.
+    """
+    name = models.CharField(max_length=64, unique=True)
+    next_slot = models.FloatField(default=0.0)
+
+    def __str__(self):
+        return self.name
+
+
+class TeamRating(models.Model):
+    """
+    A team's current Elo rating, updated incrementally as completed events are ingested (see `events/ratings.py`).
+    """
+    team = models.OneToOneField(Team, on_delete=models.CASCADE, related_name='rating')
+    rating = models.FloatField()
+    games = models.IntegerField(default=0)
+    season = models.IntegerField()     # season of the team's last rated game, for between-season regression
+
+    class Meta:
+        ordering = ['-rating']
+
+    def __str__(self):
+        return f'{self.team.name} ({self.rating:.0f})'
+
+
+class RatingSnapshot(models.Model):
+    """
+    A team's Elo rating after its games on `date`.
+    """
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='rating_snapshots')
+    date = models.DateField()
+    rating = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['team', 'date'],
+                name='unique_team_rating_date_combination',
+            )
+        ]
+        ordering = ['team', 'date']
+
+    def __str__(self):
+        return f'{self.team.name} - {self.date} ({self.rating:.0f})'
+
+
+class MatchupBucket(models.Model):
+    """
+    Outcome counts of a league's completed TeamPredictions that share a win probability band, venue, ranking situation
+    and moneyline role. Maintained incrementally by `events.matchups.update_matchup_index()`.
+    """
+    league = models.ForeignKey(League, on_delete=models.CASCADE, related_name='matchup_buckets')
+    probability_band = models.IntegerField()        # lower bound of the MATCHUP_BAND_WIDTH wide win probability band
+    home_away = models.CharField(max_length=8, choices=HOME_AWAY_CHOICES)
+    team_ranked = models.BooleanField()
+    opponent_ranked = models.BooleanField()
+    moneyline_role = models.CharField(max_length=10, choices=MONEYLINE_ROLE_CHOICES)
+    games = models.IntegerField(default=0)
+    wins = models.IntegerField(default=0)
+    win_probability_sum = models.FloatField(default=0.0)    # for the bucket's mean predicted win probability
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['league', 'probability_band', 'home_away', 'team_ranked', 'opponent_ranked', 'moneyline_role'],
+                name='unique_league_matchup_bucket',
+            )
+        ]
+        ordering = ['league', 'probability_band', 'home_away', 'team_ranked', 'opponent_ranked', 'moneyline_role']
+
+    def __str__(self):
+        return f'{self.league.display_name} - {self.probability_band}% {self.home_away} {self.moneyline_role} ({self.wins}/{self.games})'
+
+
+class MatchupIndexState(models.Model):
+    """
+    How far a league's MatchupBuckets have been built: the highest TeamPrediction ID counted and the number counted,
+    plus a checksum of the counted predictions' bucketed fields, to notice them being updated in place.
+    """
+    league = models.OneToOneField(League, on_delete=models.CASCADE, related_name='matchup_index_state')
+    last_prediction_id = models.BigIntegerField(default=0)
+    predictions = models.IntegerField(default=0)
+    checksum = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'{self.league.display_name} - {self.predictions} predictions'
+
+
+class PlayType(models.Model):
+    """
+    An ESPN play type (e.g. baseball's "Strike Looking", football's "Pass Reception"). ESPN's type IDs are per sport.
+    """
+    sport = models.CharField(max_length=32)
+    espn_type_id = models.IntegerField()
+    text = models.CharField(max_length=128)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['sport', 'espn_type_id'],
+                name='unique_sport_play_type_combination',
+            )
+        ]
+        ordering = ['sport', 'espn_type_id']
+
+    def __str__(self):
+        return f'{self.sport} - {self.text}'
+
+
+class Play(models.Model):
+    """
+    One play of an event's play-by-play, streamed out of its summary payload by `eventdata.plays.ingest_plays()`.
+    Only compact, numeric fields are kept (no play text); sport-specific fields are null for other sports.
+    """
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='plays')
+    sequence = models.IntegerField()                    # position in the payload's play list
+    espn_play_id = models.BigIntegerField(null=True)
+    play_type = models.ForeignKey(PlayType, on_delete=models.RESTRICT, null=True, related_name='plays')
+    team = models.ForeignKey(Team, on_delete=models.RESTRICT, null=True, related_name='plays')  # batting team / possession
+    period = models.SmallIntegerField()                 # quarter, period or inning; 0 when unknown
+    clock_seconds = models.SmallIntegerField(null=True)  # time left in the period
+    home_score = models.SmallIntegerField()
+    away_score = models.SmallIntegerField()
+    is_scoring = models.BooleanField(default=False)
+    # Baseball
+    inning_half = models.SmallIntegerField(choices=INNING_HALF_CHOICES, null=True)
+    outs = models.SmallIntegerField(null=True)
+    balls = models.SmallIntegerField(null=True)
+    strikes = models.SmallIntegerField(null=True)
+    # Football
+    down = models.SmallIntegerField(null=True)
+    distance = models.SmallIntegerField(null=True)
+    yards_to_endzone = models.SmallIntegerField(null=True)
+    yards_gained = models.SmallIntegerField(null=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['event', 'sequence'],
+                name='unique_event_play_sequence_combination',
+            )
+        ]
+        ordering = ['event', 'sequence']
+
+    def __str__(self):
+        return f'{self.event} #{self.sequence}'
@@ -0,0 +1,247 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max
+
+from dataclasses import dataclass
+import logging
+import numpy as np
+
+from espndata.events.models import Event, RatingSnapshot, TeamPrediction, TeamRating
+
+logger = logging.getLogger(__name__)
+
+PROBABILITY_FLOOR = 1e-6    # clip for log loss
+
+
+@dataclass(frozen=True)
+class EloParameters:
+    k: float
+    home_advantage: float
+    initial: float
+    season_carryover: float     # share of a rating's distance from `initial` kept into a new season
+
+
+def get_parameters(league):
+    return EloParameters(**settings.ELO_PARAMETERS.get(league.espn_name, settings.ELO_PARAMETERS['default']))
+
+
+@dataclass
+class Games:
+    """
+    A league's completed events as parallel arrays, in date order.
+    `home`/`away` index into `team_ids`; neutral-site events have no home advantage applied.
+    """
+    event_ids: np.ndarray
+    dates: np.ndarray               # datetime64[D]
+    seasons: np.ndarray
+    home: np.ndarray
+    away: np.ndarray
+    home_won: np.ndarray            # 1.0 or 0.0
+    neutral: np.ndarray
+    espn_home_probability: np.ndarray   # 0-1, ESPN's pregame win probability for the home team
+    team_ids: np.ndarray
+
+    def __len__(self):
+        return len(self.event_ids)
+
+
+def load_games(league, after=None):
+    """
+    Loads the league's completed events (those with a winner and both TeamPredictions) dated after `after`.
+    """
+    predictions = TeamPrediction.objects.filter(event__league=league, event__winner__isnull=False)
+
+    if after:
+        predictions = predictions.filter(event__date__gt=after)
+
+    rows = predictions.order_by('event__date', 'event_id', 'id').values_list(
+        'event_id', 'event__date', 'event__season', 'team_id', 'home_away', 'is_winner', 'win_probability',
+    )
+    games = []
+    pending = None
+
+    for row in rows.iterator(chunk_size=5000):
+        if pending is None or pending[0] != row[0]:
+            pending = row
+            continue
+
+        # Home prediction is created first; for neutral sites the first team is treated as "home" without an advantage
+        home, away = (row, pending) if row[4] == 'home' else (pending, row)
+        games.append((
+            home[0], home[1], home[2], home[3], away[3], float(bool(home[5])), home[4] == 'neutral', float(home[6]) / 100,
+        ))
+        pending = None
+
+    if not games:
+        return None
+
+    columns = list(zip(*games))
+    team_ids, team_index = np.unique(np.array(columns[3] + columns[4], dtype=np.int64), return_inverse=True)
+
+    return Games(
+        event_ids=np.array(columns[0], dtype=np.int64),
+        dates=np.array(columns[1], dtype='datetime64[D]'),
+        seasons=np.array(columns[2], dtype=np.int32),
+        home=team_index[:len(games)],
+        away=team_index[len(games):],
+        home_won=np.array(columns[5]),
+        neutral=np.array(columns[6], dtype=bool),
+        espn_home_probability=np.array(columns[7]),
+        team_ids=team_ids,
+    )
+
+
+def replay(games, k, home_advantage, initial, season_carryover, start_ratings=None, start_seasons=None):
+    """
+    Runs Elo over `games` for P parameter sets at once: `k`, `home_advantage` and `season_carryover` may be arrays of shape (P,).
+    Each game is one vectorised update across all parameter sets, so tuning a grid costs about as much as a single replay.
+    Returns (pregame home win probabilities (P, N), post-game home ratings (P, N), post-game away ratings (P, N),
+    final ratings (P, T), final seasons (T,)).
+    """
+    k, home_advantage, season_carryover = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(k, dtype=float)),
+        np.atleast_1d(np.asarray(home_advantage, dtype=float)),
+        np.atleast_1d(np.asarray(season_carryover, dtype=float)),
+    )
+    n_params, n_games, n_teams = len(k), len(games), len(games.team_ids)
+    ratings = np.full((n_params, n_teams), initial, dtype=float)
+    team_seasons = np.full(n_teams, -1, dtype=np.int32) if start_seasons is None else start_seasons.copy()
+
+    if start_ratings is not None:
+        ratings[:] = start_ratings
+
+    advantage = home_advantage[:, None] * ~games.neutral[None, :]     # (P, N)
+    probs = np.empty((n_params, n_games))
+    post_home = np.empty((n_params, n_games))
+    post_away = np.empty((n_params, n_games))
+
+    for i in range(n_games):
+        home, away, season = games.home[i], games.away[i], games.seasons[i]
+
+        for team in (home, away):
+            if team_seasons[team] != season:
+                if team_seasons[team] != -1:
+                    ratings[:, team] = initial + (ratings[:, team] - initial) * season_carryover
+                team_seasons[team] = season
+
+        p = 1 / (1 + 10 ** (-(ratings[:, home] - ratings[:, away] + advantage[:, i]) / 400))
+        delta = k * (games.home_won[i] - p)
+        ratings[:, home] += delta
+        ratings[:, away] -= delta
+        probs[:, i] = p
+        post_home[:, i] = ratings[:, home]
+        post_away[:, i] = ratings[:, away]
+
+    return probs, post_home, post_away, ratings, team_seasons
+
+
+def score(probabilities, outcomes):
+    """
+    Returns Brier score, log loss and pick accuracy for home win probabilities (last axis = games).
+    """
+    clipped = np.clip(probabilities, PROBABILITY_FLOOR, 1 - PROBABILITY_FLOOR)
+
+    return {
+        'brier': np.mean((probabilities - outcomes) ** 2, axis=-1),
+        'log_loss': -np.mean(outcomes * np.log(clipped) + (1 - outcomes) * np.log(1 - clipped), axis=-1),
+        'accuracy': np.mean((probabilities > 0.5) == (outcomes == 1), axis=-1),
+    }
+
+
+def compare_with_espn(games, probs, skip_games=0):
+    """
+    Scores the model's pregame probabilities next to ESPN's over the same games.
+    `skip_games` leaves out the first games, while ratings are still converging.
+    """
+    outcomes = games.home_won[skip_games:]
+    model = score(probs[0, skip_games:], outcomes)
+    espn = score(games.espn_home_probability[skip_games:], outcomes)
+
+    return {
+        'games': len(outcomes),
+        'model': {name: float(value) for name, value in model.items()},
+        'espn': {name: float(value) for name, value in espn.items()},
+    }
+
+
+def tune(games, parameters, k_values, home_advantage_values, skip_games=0):
+    """
+    Replays every (k, home advantage) combination at once. Returns [(log loss, k, home advantage)], best first.
+    """
+    k_grid, advantage_grid = (grid.ravel() for grid in np.meshgrid(k_values, home_advantage_values, indexing='ij'))
+    probs = replay(games, k_grid, advantage_grid, parameters.initial, parameters.season_carryover)[0]
+    log_loss = score(probs[:, skip_games:], games.home_won[skip_games:])['log_loss']
+    order = np.argsort(log_loss)
+
+    return [(float(log_loss[i]), float(k_grid[i]), float(advantage_grid[i])) for i in order]
+
+
+def rated_event_count(league, through):
+    return (
+        Event.objects.filter(league=league, winner__isnull=False, date__lte=through)
+        .annotate(n_predictions=Count('predictions')).filter(n_predictions=2).count()
+    )
+
+
+def update_league_ratings(league, rebuild=False):
+    """
+    Rates the league's completed events newer than its latest snapshot, starting from the stored TeamRatings.
+    Falls back to a full rebuild when events dated on or before the latest snapshot were ingested since it was taken.
+    Returns the number of events rated.
+    """
+    parameters = get_parameters(league)
+    stored = {rating.team_id: rating for rating in TeamRating.objects.filter(team__league=league)}
+    rated_through = RatingSnapshot.objects.filter(team__league=league).aggregate(Max('date'))['date__max']
+
+    if rated_through and not rebuild and rated_event_count(league, rated_through) != sum(r.games for r in stored.values()) // 2:
+        logger.info(f'{league.display_name}: events were backfilled before {rated_through}; rebuilding ratings')
+        rebuild = True
+
+    if rebuild:
+        stored = {}
+        rated_through = None
+
+    games = load_games(league, after=rated_through)
+
+    if games is None:
+        return 0
+
+    start_ratings = np.array([stored[t].rating if t in stored else parameters.initial for t in games.team_ids])
+    start_seasons = np.array([stored[t].season if t in stored else -1 for t in games.team_ids], dtype=np.int32)
+    _, post_home, post_away, final_ratings, final_seasons = replay(
+        games, parameters.k, parameters.home_advantage, parameters.initial, parameters.season_carryover,
+        start_ratings=start_ratings, start_seasons=start_seasons,
+    )
+    game_counts = np.bincount(games.home, minlength=len(games.team_ids)) + np.bincount(games.away, minlength=len(games.team_ids))
+    snapshots = {}
+
+    for i, date in enumerate(games.dates.tolist()):
+        snapshots[(games.team_ids[games.home[i]], date)] = post_home[0, i]
+        snapshots[(games.team_ids[games.away[i]], date)] = post_away[0, i]
+
+    ratings = []
+
+    for index, team_id in enumerate(games.team_ids.tolist()):
+        rating = stored.get(team_id) or TeamRating(team_id=team_id, games=0)
+        rating.rating = float(final_ratings[0, index])
+        rating.games += int(game_counts[index])
+        rating.season = int(final_seasons[index])
+        ratings.append(rating)
+
+    with transaction.atomic():
+        if rebuild:
+            TeamRating.objects.filter(team__league=league).delete()
+            RatingSnapshot.objects.filter(team__league=league).delete()
+
+        TeamRating.objects.bulk_create(
+            ratings,
+            update_conflicts=True,
+            unique_fields=['team'],
+            update_fields=['rating', 'games', 'season'],
+        )
+        RatingSnapshot.objects.bulk_create(
+            [RatingSnapshot(team_id=int(team_id), date=date, rating=float(rating)) for (team_id, date), rating in snapshots.items()],
+            batch_size=2000,
+        )
+
+    return len(games)
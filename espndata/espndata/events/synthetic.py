@@ -0,0 +1,415 @@
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date
+import logging
+import numpy as np
+import time
+
+from espndata.core.odds import american_to_decimal, decimal_to_american, decimal_to_implied, edge, remove_overround
+from espndata.events.models import Event, League, Play, Team, TeamPrediction
+
+logger = logging.getLogger(__name__)
+
+SYNTHETIC_PREFIX = 'synthetic-'             # League.espn_name prefix marking generated leagues
+SYNTHETIC_ESPN_ID_BASE = 9_000_000_000      # generated ESPN event IDs count up from here, clear of real ones
+INSERT_BATCH_SIZE = 50000                   # events written per transaction (with their two predictions each)
+ESPN_NOISE = 0.25           # logit-scale sd of ESPN's win probability around the true probability
+MARKET_NOISE = 0.15         # logit-scale sd of the betting market's fair probability around the true probability
+OVERROUND_RANGE = (0.03, 0.06)
+MAX_QUOTED_PROBABILITY = 0.99   # heaviest favourite's implied probability (-9900), as books never quote odds below 1.0
+STRENGTH_CARRYOVER = 0.7    # share of a team's strength (Elo points above average) kept into the next season
+RANKED_TEAMS = 25
+
+
+@dataclass(frozen=True)
+class LeagueTemplate:
+    """
+    Shape of a generated league: schedule, playoff format and how lopsided its games are.
+    Weekly leagues play `regular_weeks` weekly slots; daily leagues play on any day between the season dates.
+    """
+    display_name: str
+    sport: str
+    check_type: str
+    teams: int
+    games_per_team: int
+    season_start: tuple         # (month, day)
+    season_end: tuple           # (month, day); in the next calendar year when before `season_start`
+    playoff_teams: int          # a power of two
+    series_length: int          # games per playoff pairing (best of)
+    home_advantage: float       # Elo points
+    strength_sd: float          # Elo points
+    moneyline_share: float      # share of games with moneylines
+    regular_weeks: int = 0
+    neutral_share: float = 0.005            # regular season games at neutral sites
+    neutral_postseason: bool = False        # every postseason game (bowls); otherwise only a weekly league's final
+    ranked: bool = False
+
+
+LEAGUE_TEMPLATES = {
+    'nfl': LeagueTemplate('NFL', 'football', 'weekly', 32, 17, (9, 5), (1, 5), 8, 1, 48.0, 90.0, 0.97, regular_weeks=18),
+    'college-football': LeagueTemplate(
+        'College Football', 'football', 'weekly', 128, 12, (8, 24), (12, 7), 4, 1, 55.0, 220.0, 0.85,
+        regular_weeks=15, neutral_share=0.03, neutral_postseason=True, ranked=True,
+    ),
+    'nba': LeagueTemplate('NBA', 'basketball', 'daily', 30, 82, (10, 21), (4, 13), 16, 7, 70.0, 120.0, 0.95),
+    'wnba': LeagueTemplate('WNBA', 'basketball', 'daily', 12, 40, (5, 16), (9, 11), 8, 3, 60.0, 110.0, 0.9),
+    'mlb': LeagueTemplate('MLB', 'baseball', 'daily', 30, 162, (3, 27), (9, 28), 8, 5, 24.0, 45.0, 0.95),
+    'nhl': LeagueTemplate('NHL', 'hockey', 'daily', 32, 82, (10, 8), (4, 16), 16, 7, 35.0, 50.0, 0.95),
+}
+
+
+def synthetic_leagues():
+    return League.objects.filter(espn_name__startswith=SYNTHETIC_PREFIX)
+
+
+def delete_synthetic_data():
+    """
+    Deletes the synthetic leagues and everything in them. Predictions, plays and events are deleted with one statement
+    per table, as the ORM's cascade collects every row into memory first (and overflows SQLite's parameter limit).
+    Returns the number of Events deleted.
+    """
+    league_ids = list(synthetic_leagues().values_list('id', flat=True))
+
+    if not league_ids:
+        return 0
+
+    quote = connection.ops.quote_name
+    placeholders = ', '.join(['%s'] * len(league_ids))
+
+    with transaction.atomic():
+        TeamPrediction.objects.filter(event__league__in=league_ids).delete()
+        Play.objects.filter(event__league__in=league_ids).delete()
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {quote(Event._meta.db_table)} WHERE {quote(Event._meta.get_field("league").column)} IN ({placeholders})',
+                league_ids,
+            )
+            deleted = cursor.rowcount
+
+        League.objects.filter(id__in=league_ids).delete()
+
+    return deleted
+
+
+def season_bounds(template, season):
+    end_year = season + 1 if template.season_end < template.season_start else season
+    return date(season, *template.season_start), date(end_year, *template.season_end)
+
+
+def create_league(name, template, copy, seasons):
+    """
+    Creates a generated League (offseason, so the collectors leave it alone) and its Teams.
+    """
+    suffix = f' {copy}' if copy else ''
+    season_start, season_end = season_bounds(template, seasons[-1])
+    rounds = int(np.log2(template.playoff_teams))
+    league = League.objects.create(
+        espn_name=f'{SYNTHETIC_PREFIX}{name}{"-" + str(copy) if copy else ""}',
+        display_name=f'Synthetic {template.display_name}{suffix}',
+        sport=template.sport,
+        check_type=template.check_type,
+        check_day=1 if template.check_type == 'weekly' else None,
+        _season_types={2: list(range(1, template.regular_weeks + 1)), 3: list(range(1, rounds + 1))} if template.regular_weeks else {},
+        season_start=season_start,
+        season_end=season_end,
+        is_offseason=True,
+    )
+    teams = Team.objects.bulk_create([
+        Team(league=league, espn_team_id=str(number), name=f'{league.display_name} Team {number:03d}')
+        for number in range(1, template.teams + 1)
+    ])
+    return league, np.array([team.id for team in teams])
+
+
+def win_probability(strength_difference):
+    return 1 / (1 + 10 ** (-strength_difference / 400))
+
+
+def perturb(probability, noise, rng):
+    """
+    Adds logit-scale Gaussian noise to probabilities.
+    """
+    logit = np.log(probability / (1 - probability)) + rng.normal(0, noise, len(probability))
+    return 1 / (1 + np.exp(-logit))
+
+
+def regular_season(template, season, rng):
+    """
+    Draws the regular season schedule. Each slot (week or day), a binomial number of random pairings play,
+    so teams average `games_per_team` games. Returns (home, away, dates, weeks) arrays.
+    """
+    start, end = season_bounds(template, season)
+    step = 7 if template.regular_weeks else 1
+    slots = template.regular_weeks or (end - start).days + 1
+    slot_dates = np.datetime64(start) + np.arange(slots) * step
+    pairings = template.teams // 2
+    games_per_slot = rng.binomial(pairings, min(1.0, template.games_per_team / slots), slots)
+    order = rng.permuted(np.tile(np.arange(template.teams), (slots, 1)), axis=1)
+    plays = np.arange(pairings) < games_per_slot[:, None]
+    slot_index = np.nonzero(plays)[0]
+    weeks = slot_index + 1 if template.regular_weeks else np.zeros(len(slot_index), dtype=int)
+    return order[:, 0:2 * pairings:2][plays], order[:, 1:2 * pairings:2][plays], slot_dates[slot_index], weeks
+
+
+def postseason(template, season, strengths, regular_wins, rng):
+    """
+    Plays a seeded single elimination bracket of the teams with the most regular season wins.
+    Pairings play best-of-`series_length` series with 2-2-1-1-1 home games for the higher seed.
+    Returns (home, away, dates, weeks, neutral, home_won, true home win probability) arrays.
+    """
+    _, end = season_bounds(template, season)
+    field = list(np.argsort(-(regular_wins + rng.random(template.teams)))[:template.playoff_teams])
+    columns = {'home': [], 'away': [], 'dates': [], 'weeks': [], 'neutral': [], 'home_won': [], 'probability': []}
+    first_day = np.datetime64(end) + (7 if template.regular_weeks else 3)
+    round_number = 0
+
+    while len(field) > 1:
+        higher, lower = np.array(field[:len(field) // 2]), np.array(field[::-1][:len(field) // 2])
+        wins = np.zeros((2, len(higher)), dtype=int)
+        needed = template.series_length // 2 + 1
+        round_start = first_day + round_number * (7 if template.regular_weeks else template.series_length + 2)
+        is_final = len(field) == 2
+        neutral = template.neutral_postseason or (is_final and bool(template.regular_weeks))
+
+        for game in range(template.series_length):
+            live = (wins < needed).all(axis=0)
+
+            if not live.any():
+                break
+
+            higher_home = game in (0, 1, 4, 6)
+            home, away = (higher, lower) if higher_home else (lower, higher)
+            home, away = home[live], away[live]
+            probability = win_probability(strengths[home] - strengths[away] + (0 if neutral else template.home_advantage))
+            home_won = rng.random(len(home)) < probability
+            wins[0 if higher_home else 1, live] += home_won
+            wins[1 if higher_home else 0, live] += ~home_won
+            columns['home'].append(home)
+            columns['away'].append(away)
+            columns['dates'].append(np.full(len(home), round_start + (0 if template.regular_weeks else game)))
+            columns['weeks'].append(np.full(len(home), round_number + 1 if template.regular_weeks else 0))
+            columns['neutral'].append(np.full(len(home), neutral))
+            columns['home_won'].append(home_won)
+            columns['probability'].append(probability)
+
+        field = list(np.where(wins[0] >= needed, higher, lower))
+        round_number += 1
+
+    return tuple(np.concatenate(values) for values in columns.values())
+
+
+def generate_season(template, season, strengths, rng):
+    """
+    Generates one season of games as parallel arrays (a dictionary), with ESPN probabilities,
+    moneylines and outcomes drawn from the teams' latent strengths.
+    """
+    home, away, dates, weeks = regular_season(template, season, rng)
+    neutral = rng.random(len(home)) < template.neutral_share
+    probability = win_probability(strengths[home] - strengths[away] + np.where(neutral, 0, template.home_advantage))
+    home_won = rng.random(len(home)) < probability
+    regular_wins = np.bincount(np.where(home_won, home, away), minlength=template.teams)
+    post_home, post_away, post_dates, post_weeks, post_neutral, post_home_won, post_probability = postseason(
+        template, season, strengths, regular_wins, rng,
+    )
+    games = {
+        'home': np.concatenate([home, post_home]),
+        'away': np.concatenate([away, post_away]),
+        'dates': np.concatenate([dates, post_dates]),
+        'weeks': np.concatenate([weeks, post_weeks]),
+        'season_types': np.concatenate([np.full(len(home), 2), np.full(len(post_home), 3)]),
+        'neutral': np.concatenate([neutral, post_neutral]),
+        'probability': np.concatenate([probability, post_probability]),
+        'home_won': np.concatenate([home_won, post_home_won]),
+    }
+    order = np.argsort(games['dates'], kind='stable')
+    games = {name: values[order] for name, values in games.items()}
+    size = len(games['home'])
+    games['espn_probability'] = np.clip(np.round(perturb(games['probability'], ESPN_NOISE, rng) * 100, 2), 0.5, 99.5)
+
+    # The market's line: fair probability plus an overround, quoted as rounded American odds
+    market = perturb(games['probability'], MARKET_NOISE, rng)
+    book_sum = 1 + rng.uniform(*OVERROUND_RANGE, size)
+    has_line = rng.random(size) < template.moneyline_share
+    market = np.clip(market, 1 - MAX_QUOTED_PROBABILITY / book_sum, MAX_QUOTED_PROBABILITY / book_sum)
+    american = decimal_to_american(1 / (np.stack([market, 1 - market], axis=1) * book_sum[:, None]))
+    american = np.where(np.abs(american) < 100, 100, np.round(american / 5) * 5)
+    games['moneylines'] = np.where(has_line[:, None], np.round(american_to_decimal(american), 4), np.nan)
+
+    if template.ranked:
+        poll = np.argsort(-(strengths + rng.normal(0, template.strength_sd / 4, template.teams)))
+        ranks = np.zeros(template.teams, dtype=int)
+        ranks[poll[:RANKED_TEAMS]] = np.arange(1, RANKED_TEAMS + 1)
+        games['home_rank'], games['away_rank'] = ranks[games['home']], ranks[games['away']]
+    else:
+        games['home_rank'] = games['away_rank'] = np.zeros(size, dtype=int)
+
+    return games
+
+
+def _nullable(values, digits=None):
+    """
+    Returns a list of Python values with NaN (floats) or 0 (ranks, weeks) as None.
+    """
+    values = np.asarray(values)
+    missing = np.isnan(values) if values.dtype.kind == 'f' else values == 0
+
+    if digits is not None:
+        values = np.round(values, digits)
+
+    return np.where(missing, None, values).tolist()
+
+
+def bulk_insert(model, fields, rows):
+    """
+    Inserts tuples of `fields` values (primary key included) with one `executemany()`,
+    skipping the per-row cost of model instances and bulk_create's statement building.
+    """
+    quote = connection.ops.quote_name
+    columns = ', '.join(quote(model._meta.get_field(field).column) for field in fields)
+    placeholders = ', '.join(['%s'] * len(fields))
+
+    with connection.cursor() as cursor:
+        cursor.executemany(f'INSERT INTO {quote(model._meta.db_table)} ({columns}) VALUES ({placeholders})', rows)
+
+
+class SyntheticLoader:
+    """
+    Buffers generated seasons and writes them with `bulk_insert()` in INSERT_BATCH_SIZE transactions.
+    Primary keys are assigned here, counting up from the tables' current maximums; run it while nothing else writes Events.
+    """
+    def __init__(self, batch_size=INSERT_BATCH_SIZE):
+        self.batch_size = batch_size
+        self.next_event_id = (Event.objects.aggregate(max_id=Max('id'))['max_id'] or 0) + 1
+        self.next_prediction_id = (TeamPrediction.objects.aggregate(max_id=Max('id'))['max_id'] or 0) + 1
+        self.buffer = []
+        self.buffered = 0
+        self.counts = Counter()
+
+    def add(self, league, team_ids, season, games, first_espn_id):
+        self.buffer.append((league, team_ids, season, games, first_espn_id))
+        self.buffered += len(games['home'])
+
+        if self.buffered >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+
+        with transaction.atomic():
+            for league, team_ids, season, games, first_espn_id in self.buffer:
+                self.write_season(league, team_ids, season, games, first_espn_id)
+
+        self.buffer = []
+        self.buffered = 0
+
+    def write_season(self, league, team_ids, season, games, first_espn_id):
+        size = len(games['home'])
+        event_ids = np.arange(self.next_event_id, self.next_event_id + size)
+        prediction_ids = np.arange(self.next_prediction_id, self.next_prediction_id + 2 * size).reshape(size, 2)
+        self.next_event_id += size
+        self.next_prediction_id += 2 * size
+        home, away = team_ids[games['home']], team_ids[games['away']]
+        ranked = (games['home_rank'] > 0).astype(int) + (games['away_rank'] > 0)
+        bulk_insert(
+            Event,
+            ['id', 'league', 'espn_id', 'date', 'season', 'week', 'season_type', 'winner',
+             'is_neutral_site', 'both_ranked_matchup', 'one_ranked_matchup'],
+            zip(
+                event_ids.tolist(),
+                [league.id] * size,
+                [str(espn_id) for espn_id in range(first_espn_id, first_espn_id + size)],
+                np.datetime_as_string(games['dates']).tolist(),     # ISO dates, accepted by every backend
+                [season] * size,
+                _nullable(games['weeks']),
+                games['season_types'].tolist(),
+                np.where(games['home_won'], home, away).tolist(),
+                games['neutral'].tolist(),
+                (ranked == 2).tolist(),
+                (ranked == 1).tolist(),
+            ),
+        )
+
+        # Both sides of each game: columns are (home, away) pairs
+        probability = np.stack([games['espn_probability'], 100 - games['espn_probability']], axis=1)
+        implied = decimal_to_implied(games['moneylines'])
+        home_fair, away_fair, overround = remove_overround(implied[:, 0], implied[:, 1])
+        fair = np.stack([home_fair, away_fair], axis=1)
+        rows = zip(
+            prediction_ids.ravel().tolist(),
+            np.repeat(event_ids, 2).tolist(),
+            np.stack([home, away], axis=1).ravel().tolist(),
+            _nullable(np.stack([games['home_rank'], games['away_rank']], axis=1).ravel()),
+            np.where(np.repeat(games['neutral'], 2), 'neutral', np.tile(['home', 'away'], size)).tolist(),
+            np.round(probability.ravel(), 2).tolist(),
+            _nullable(games['moneylines'].ravel(), 4),
+            _nullable(implied.ravel() * 100, 4),
+            _nullable(fair.ravel() * 100, 4),
+            _nullable(np.repeat(overround, 2) * 100, 4),
+            _nullable(edge(probability / 100, fair).ravel() * 100, 4),
+            np.stack([games['home_won'], ~games['home_won']], axis=1).ravel().tolist(),
+            np.stack([away, home], axis=1).ravel().tolist(),
+            _nullable(np.stack([games['away_rank'], games['home_rank']], axis=1).ravel()),
+        )
+        bulk_insert(
+            TeamPrediction,
+            ['id', 'event', 'team', 'team_rank', 'home_away', 'win_probability', 'moneyline', 'implied_probability',
+             'fair_probability', 'overround', 'edge', 'is_winner', 'opponent', 'opponent_rank'],
+            rows,
+        )
+        self.counts['events'] += size
+        self.counts['team_predictions'] += 2 * size
+
+    def finish(self):
+        self.flush()
+
+        # Explicit primary keys leave sequence-backed databases (e.g. PostgreSQL) behind the new rows
+        with connection.cursor() as cursor:
+            for statement in connection.ops.sequence_reset_sql(no_style(), [Event, TeamPrediction]):
+                cursor.execute(statement)
+
+
+def generate(templates, seasons, copies=1, seed=0, batch_size=INSERT_BATCH_SIZE):
+    """
+    Creates `copies` synthetic Leagues per template (espn_name `synthetic-<name>[-<copy>]`) and fills `seasons`
+    of Events and TeamPredictions for each. Team strengths drift between seasons; ESPN probabilities and moneylines are
+    noisy views of each game's true win probability, and outcomes are drawn from it, so the data is calibrated like ESPN's.
+    Every league-season draws from its own generator seeded by (seed, template, copy, season): the same arguments
+    always produce the same rows. Returns (Counter, {league: summary statistics}, seconds elapsed).
+    """
+    start_time = time.perf_counter()
+    loader = SyntheticLoader(batch_size)
+    summaries = {}
+
+    for template_number, (name, template) in enumerate(templates.items()):
+        for copy in range(copies):
+            league, team_ids = create_league(name, template, copy if copies > 1 else 0, seasons)
+            strength_rng = np.random.default_rng([seed, template_number, copy])
+            strengths = strength_rng.normal(0, template.strength_sd, template.teams)
+            next_espn_id = SYNTHETIC_ESPN_ID_BASE
+            stats = Counter()
+
+            for season in seasons:
+                rng = np.random.default_rng([seed, template_number, copy, season])
+                games = generate_season(template, season, strengths, rng)
+                loader.add(league, team_ids, season, games, next_espn_id)
+                next_espn_id += len(games['home'])
+                predicted = games['espn_probability'] / 100
+                stats['games'] += len(predicted)
+                stats['home_wins'] += int(games['home_won'].sum())
+                stats['predicted_home_wins'] += float(predicted.sum())
+                stats['brier'] += float(((predicted - games['home_won']) ** 2).sum())
+                stats['favourite_wins'] += int(((predicted >= 0.5) == games['home_won']).sum())
+                strengths = STRENGTH_CARRYOVER * strengths + strength_rng.normal(
+                    0, template.strength_sd * np.sqrt(1 - STRENGTH_CARRYOVER ** 2), template.teams,
+                )
+
+            summaries[league] = stats
+
+    loader.finish()
+    return loader.counts, summaries, time.perf_counter() - start_time
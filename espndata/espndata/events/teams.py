@@ -0,0 +1,64 @@
+import threading
+
+from espndata.events.models import Team
+
+
+class TeamLookup:
+    """
+    In-memory (league, ESPN team ID) -> Team cache used while building rows.
+    Each league's teams are loaded with one query the first time the league is seen; after that, rows resolve
+    their teams without queries. Unknown teams are created, and teams migrated from name-only rows get their ESPN ID filled in.
+    """
+    def __init__(self):
+        self.by_espn_id = {}    # (league_id, espn_team_id) -> Team
+        self.by_name = {}       # (league_id, name) -> Team, for teams with no ESPN ID yet
+        self.loaded_leagues = set()
+        self.lock = threading.Lock()
+
+    def load(self, league):
+        for team in Team.objects.filter(league=league):
+            if team.espn_team_id:
+                self.by_espn_id[(league.id, team.espn_team_id)] = team
+            else:
+                self.by_name[(league.id, team.name)] = team
+
+        self.loaded_leagues.add(league.id)
+
+    def resolve(self, league, espn_team_id, name):
+        """
+        Returns the league's Team for an ESPN team ID, creating or completing it if needed.
+        """
+        with self.lock:
+            if league.id not in self.loaded_leagues:
+                self.load(league)
+
+            team = self.by_espn_id.get((league.id, espn_team_id)) if espn_team_id else self.by_name.get((league.id, name))
+
+            if team:
+                return team
+
+            team = self.by_name.pop((league.id, name), None)
+
+            if team:
+                team.espn_team_id = espn_team_id
+                team.save(update_fields=['espn_team_id'])
+            elif espn_team_id:
+                team, _ = Team.objects.get_or_create(league=league, espn_team_id=espn_team_id, defaults={'name': name})
+            else:
+                team, _ = Team.objects.get_or_create(league=league, espn_team_id=None, name=name)
+
+            if espn_team_id:
+                self.by_espn_id[(league.id, espn_team_id)] = team
+            else:
+                self.by_name[(league.id, name)] = team
+
+            return team
+
+    def clear(self):
+        with self.lock:
+            self.by_espn_id.clear()
+            self.by_name.clear()
+            self.loaded_leagues.clear()
+
+
+team_lookup = TeamLookup()
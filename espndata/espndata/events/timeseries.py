@@ -0,0 +1,116 @@
+import numpy as np
+
+from espndata.events.models import WinProbabilitySeries
+
+PROBABILITY_DTYPE = np.dtype('<f4')
+PLAY_ID_DTYPE = np.dtype('<i8')
+PERIOD_DTYPE = np.dtype('<i1')
+
+HALFTIME_PERIODS = {     # last period played before halftime (or the midpoint for sports without one)
+    'football': 2,
+    'basketball': 2,
+    'baseball': 5,
+    'hockey': 2,
+}
+
+
+def get_play_periods(event_summary):
+    """
+    Returns a dictionary mapping the summary's play IDs to their period (quarter, inning, ...).
+    Football summaries nest plays in drives; other sports list them under `plays`.
+    """
+    plays = event_summary.get('plays') or [
+        play
+        for drive in event_summary.get('drives', {}).get('previous', [])
+        for play in drive.get('plays', [])
+    ]
+    return {play.get('id'): play.get('period', {}).get('number', 0) for play in plays}
+
+
+def pack_series(win_probs, play_periods=None, sport=None):
+    """
+    Packs a `winprobability` list into the fields of a WinProbabilitySeries (without league/espn_id).
+    Entries without a `homeWinPercentage` are dropped. Returns None if no entries remain.
+    """
+    play_periods = play_periods or {}
+    points = [point for point in win_probs if point.get('homeWinPercentage') is not None]
+
+    if not points:
+        return None
+
+    probs = np.array([point['homeWinPercentage'] for point in points], dtype=PROBABILITY_DTYPE)
+    play_ids = np.array([int(point.get('playId') or 0) for point in points], dtype=PLAY_ID_DTYPE)
+    periods = np.array([play_periods.get(point.get('playId'), 0) for point in points], dtype=PERIOD_DTYPE)
+    swings = np.abs(np.diff(probs)) if len(probs) > 1 else np.zeros(1, dtype=PROBABILITY_DTYPE)
+    halftime = None
+    halftime_period = HALFTIME_PERIODS.get(sport)
+
+    if halftime_period and periods.any():
+        first_half = np.flatnonzero((periods > 0) & (periods <= halftime_period))
+
+        if len(first_half):
+            halftime = float(probs[first_half[-1]])
+
+    return {
+        'length': len(probs),
+        'home_win_percentages': probs.tobytes(),
+        'play_ids': play_ids.tobytes(),
+        'periods': periods.tobytes(),
+        'pregame_home_win_percentage': float(probs[0]),
+        'halftime_home_win_percentage': halftime,
+        'final_home_win_percentage': float(probs[-1]),
+        'min_home_win_percentage': float(probs.min()),
+        'max_home_win_percentage': float(probs.max()),
+        'max_swing': float(swings.max()),
+    }
+
+
+def series_from_summary(league, espn_id, event_summary):
+    """
+    Returns an unsaved WinProbabilitySeries built from a summary payload, or None if it has no win probabilities.
+    """
+    fields = pack_series(
+        event_summary.get('winprobability', []),
+        play_periods=get_play_periods(event_summary),
+        sport=league.sport,
+    )
+
+    if fields is None:
+        return None
+
+    return WinProbabilitySeries(league=league, espn_id=espn_id, **fields)
+
+
+def load_series(series):
+    """
+    Returns the (home win percentages, play IDs, periods) NumPy arrays of a WinProbabilitySeries.
+    The arrays are read-only views over the stored bytes.
+    """
+    return (
+        np.frombuffer(series.home_win_percentages, dtype=PROBABILITY_DTYPE),
+        np.frombuffer(series.play_ids, dtype=PLAY_ID_DTYPE),
+        np.frombuffer(series.periods, dtype=PERIOD_DTYPE),
+    )
+
+
+def load_many(queryset):
+    """
+    Loads the series of every WinProbabilitySeries in `queryset` into flat arrays for vectorized analysis.
+    Returns (espn_ids, offsets, home win percentages, periods); series `i` spans `offsets[i]:offsets[i + 1]`.
+    """
+    espn_ids = []
+    prob_chunks = []
+    period_chunks = []
+
+    for espn_id, probs, periods in queryset.values_list('espn_id', 'home_win_percentages', 'periods').iterator(chunk_size=500):
+        espn_ids.append(espn_id)
+        prob_chunks.append(np.frombuffer(probs, dtype=PROBABILITY_DTYPE))
+        period_chunks.append(np.frombuffer(periods, dtype=PERIOD_DTYPE))
+
+    offsets = np.zeros(len(prob_chunks) + 1, dtype=np.int64)
+    np.cumsum([len(chunk) for chunk in prob_chunks], out=offsets[1:])
+
+    if not prob_chunks:
+        return espn_ids, offsets, np.empty(0, dtype=PROBABILITY_DTYPE), np.empty(0, dtype=PERIOD_DTYPE)
+
+    return espn_ids, offsets, np.concatenate(prob_chunks), np.concatenate(period_chunks)
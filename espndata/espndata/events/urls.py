@@ -4,4 +4,7 @@ from espndata.events import views
 
 urlpatterns = [
     path('', views.Homepage.as_view(), name='home'),
+    path('export/predictions/', views.PredictionExport.as_view(), name='prediction-export'),
+    path('matchups/', views.MatchupOutcomes.as_view(), name='matchup-outcomes'),
+    path('ratings/', views.TeamRatings.as_view(), name='team-ratings'),
 ]
@@ -1,7 +1,141 @@
-from django.shortcuts import render
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, render
+from django.views import View
 from django.views.generic import TemplateView
 
+from datetime import date
+import math
+
+from espndata.events.export import (
+    EXPORT_FORMATS, aiter_export_rows, astream_export, get_export_queryset, iter_export_rows, stream_export,
+)
+from espndata.events.matchups import lookup, lookup_exact
+from espndata.events.models import HOME_AWAY_CHOICES, MONEYLINE_ROLE_CHOICES, League, TeamRating
+from espndata.mixins import AsyncSuperuserRequiredMixin, SuperuserRequiredMixin
+
 
 # Create your views here.
 class Homepage(TemplateView):
-    template_name = 'events/home.html'
\ No newline at end of file
+    template_name = 'events/home.html'
+
+
+class PredictionExport(AsyncSuperuserRequiredMixin, View):
+    """
+    Streams filtered TeamPredictions as a CSV or NDJSON download.
+    Query params: `format`, `compress`, `league` (repeatable), `season`, `date_from`, `date_to`.
+    Under ASGI rows are read with the async ORM and under WSGI with the sync ORM, so either way the download starts
+    streaming immediately instead of being buffered. The only async view: async gained the JSON lookups nothing (see the README).
+    """
+    content_types = {
+        'csv': 'text/csv',
+        'ndjson': 'application/x-ndjson',
+    }
+
+    async def get(self, request, *args, **kwargs):
+        export_format = request.GET.get('format', 'csv')
+        compress = request.GET.get('compress') in ('1', 'true')
+
+        if export_format not in EXPORT_FORMATS:
+            return HttpResponseBadRequest(f'`format` must be one of: {", ".join(EXPORT_FORMATS)}')
+
+        try:
+            season = int(request.GET['season']) if request.GET.get('season') else None
+            date_from = date.fromisoformat(request.GET['date_from']) if request.GET.get('date_from') else None
+            date_to = date.fromisoformat(request.GET['date_to']) if request.GET.get('date_to') else None
+        except ValueError:
+            return HttpResponseBadRequest('`season` must be a year and dates must be YYYY-MM-DD.')
+
+        queryset = get_export_queryset(
+            leagues=request.GET.getlist('league'),
+            season=season,
+            date_from=date_from,
+            date_to=date_to,
+        )
+        # Each handler needs its own kind of iterator to stream: WSGI reads an async one into memory first, and so does
+        # ASGI with a sync one
+        if isinstance(request, ASGIRequest):
+            content = astream_export(aiter_export_rows(queryset), export_format=export_format, compress=compress)
+        else:
+            content = stream_export(iter_export_rows(queryset), export_format=export_format, compress=compress)
+
+        response = StreamingHttpResponse(content, content_type=self.content_types[export_format])
+        filename = f'predictions.{export_format}'
+
+        if compress:
+            filename += '.gz'
+
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+
+class MatchupOutcomes(SuperuserRequiredMixin, View):
+    """
+    Returns how teams in a given spot did historically, as JSON, from the matchup index.
+    Query params: `league` (required), `win_probability`, `home_away`, `team_ranked`, `opponent_ranked` (`true`/`false`),
+    `moneyline_role`. With `exact=1`, `min_probability`/`max_probability` are answered from the predictions themselves.
+    """
+    def get(self, request, *args, **kwargs):
+        league = get_object_or_404(League, espn_name=request.GET.get('league'))
+        dimensions = {}
+
+        for param in ('team_ranked', 'opponent_ranked'):
+            if request.GET.get(param):
+                dimensions[param] = request.GET[param] in ('1', 'true')
+
+        for param, choices in (('home_away', HOME_AWAY_CHOICES), ('moneyline_role', MONEYLINE_ROLE_CHOICES)):
+            if request.GET.get(param):
+                if request.GET[param] not in dict(choices):
+                    return HttpResponseBadRequest(f'`{param}` must be one of: {", ".join(dict(choices))}')
+                dimensions[param] = request.GET[param]
+
+        try:
+            probabilities = {
+                param: float(request.GET[param])
+                for param in ('win_probability', 'min_probability', 'max_probability')
+                if request.GET.get(param)
+            }
+        except ValueError:
+            return HttpResponseBadRequest('Probabilities must be percentages.')
+
+        if not all(math.isfinite(probability) for probability in probabilities.values()):
+            return HttpResponseBadRequest('Probabilities must be finite percentages.')
+
+        if request.GET.get('exact') in ('1', 'true'):
+            outcomes = lookup_exact(
+                league,
+                min_probability=probabilities.get('min_probability'),
+                max_probability=probabilities.get('max_probability'),
+                **dimensions,
+            )
+        else:
+            outcomes = lookup(league, win_probability=probabilities.get('win_probability'), **dimensions)
+
+        return JsonResponse({'league': league.espn_name, **dimensions, **probabilities, **outcomes})
+
+
+class TeamRatings(SuperuserRequiredMixin, View):
+    """
+    Returns a league's current Elo ratings, best first, as JSON.
+    Query params: `league` (required), `limit`.
+    """
+    def get(self, request, *args, **kwargs):
+        league = get_object_or_404(League, espn_name=request.GET.get('league'))
+
+        try:
+            limit = int(request.GET.get('limit', 50))
+        except ValueError:
+            limit = 0
+
+        if limit < 1:
+            return HttpResponseBadRequest('`limit` must be a positive integer.')
+
+        ratings = TeamRating.objects.filter(team__league=league).order_by('-rating').values('team__name', 'rating', 'games')[:limit]
+
+        return JsonResponse({
+            'league': league.espn_name,
+            'ratings': [
+                {'team': rating['team__name'], 'rating': round(rating['rating'], 1), 'games': rating['games']}
+                for rating in ratings
+            ],
+        })
@@ -21,4 +21,17 @@ class SuperuserRequiredMixin(UserPassesTestMixin):
         if referer:
             return redirect(referer)
         
-        return redirect('home')
\ No newline at end of file
+        return redirect('home')
+
+class AsyncSuperuserRequiredMixin(SuperuserRequiredMixin):
+    """
+    SuperuserRequiredMixin for views with async handlers.
+    The user is loaded with `request.auser()`, since the sync `request.user` cannot query the session from the event loop.
+    """
+    async def dispatch(self, request, *args, **kwargs):
+        user = await request.auser()
+
+        if not user.is_superuser:
+            return self.handle_no_permission()
+
+        return await super(UserPassesTestMixin, self).dispatch(request, *args, **kwargs)
@@ -10,10 +10,9 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+from datetime import time
 from decouple import config
 from pathlib import Path
-import sentry_sdk
-from sentry_sdk.integrations.django import DjangoIntegration
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -40,11 +39,12 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     # custom applications
     'espndata.events.apps.EventsConfig',
-    # 'espndata.eventdata.apps.EventdataConfig',
+    'espndata.eventdata.apps.EventdataConfig',
     'espndata.core.apps.CoreConfig',
 ]
 
 MIDDLEWARE = [
+    'espndata.core.middleware.QueryInstrumentationMiddleware',     # first, to include every other middleware's queries
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -128,22 +128,9 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
-# Sentry configuration:
+# Sentry configuration (initialised on first use by `espndata.core.sentry`, so commands that never report skip loading it):
 SENTRY_DSN = config('SENTRY_DSN', default=None)
 
-if SENTRY_DSN:
-    sentry_sdk.init(
-        dsn=SENTRY_DSN,
-        integrations=[DjangoIntegration()],
-        sample_rate=1.0,
-        enable_logs=True,
-        send_default_pii=False,
-        environment='development' if DEBUG else 'production',
-    )
-    print('Sentry Active')
-else:
-    print('Sentry DSN not found')
-
 
 # Email settings:
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
@@ -158,4 +145,79 @@ ADMIN_EMAIL = config('ADMIN_EMAIL')
 # ESPN Links
 BASE_ESPN_SCOREBOARD_LINK = 'https://espn.com/{league}/scoreboard/{specifiers}'
 BASE_ESPN_SCOREBOARD_API_LINK = 'https://site.api.espn.com/apis/site/v2/sports/{sport}/{league}/scoreboard'
-BASE_ESPN_EVENT_SUMMARY_API_LINK = 'https://site.api.espn.com/apis/site/v2/sports/{sport}/{league}/summary'
\ No newline at end of file
+BASE_ESPN_EVENT_SUMMARY_API_LINK = 'https://site.api.espn.com/apis/site/v2/sports/{sport}/{league}/summary'
+
+# Ingestion run reports (JSON run reports and Prometheus textfiles)
+RUN_REPORT_DIR = BASE_DIR / 'espndata' / '_raw_data' / 'reports'
+
+# Raw summary payload archive (see `eventdata/archive.py`)
+PAYLOAD_ARCHIVE_ENABLED = True
+PAYLOAD_ARCHIVE_DIR = BASE_DIR / 'espndata' / '_raw_data' / 'archive'
+PAYLOAD_ARCHIVE_COMPRESSION_LEVEL = 9
+PAYLOAD_ARCHIVE_SEGMENT_BYTES = 1024 ** 3
+PAYLOAD_ARCHIVE_TRAIN_AFTER = 200       # payloads archived before a league's first dictionary is trained on them
+
+# Data collection scheduler
+COLLECTION_TIME = time(hour=10)         # time of day (TIME_ZONE) scheduled collections run
+SCHEDULER_MAX_SLEEP = 6 * 60 * 60       # seconds; longest the scheduler sleeps before re-reading League configuration
+
+# Live win probability tracking (seconds)
+LIVE_SCOREBOARD_INTERVAL = 60
+LIVE_POLL_INTERVALS = {
+    'close_late': 10,
+    'default': 30,
+    'intermission': 120,
+    'blowout': 180,
+}
+LIVE_FLUSH_SECONDS = 30
+LIVE_MAX_IDLE_SECONDS = 3 * 60 * 60     # games whose series hasn't changed for this long are no longer tracked (e.g. suspended)
+LIVE_WRITE_BATCH_SIZE = 50              # games with changed series
+
+# Summary work queue (see `eventdata/workqueue.py`)
+WORK_QUEUE_BATCH_SIZE = 50              # event IDs per task
+WORK_QUEUE_LEASE_SECONDS = 300          # leases not renewed by a heartbeat within this time are reclaimed
+WORK_QUEUE_MAX_ATTEMPTS = 3             # leases of one batch before its remaining IDs are marked failed
+WORK_QUEUE_REQUESTS_PER_SECOND = 2.0    # summary requests across all workers
+
+# Elo team ratings (see `events/ratings.py`), by League.espn_name
+ELO_PARAMETERS = {
+    'default': {'k': 20.0, 'home_advantage': 50.0, 'initial': 1500.0, 'season_carryover': 0.75},
+    'nfl': {'k': 20.0, 'home_advantage': 48.0, 'initial': 1500.0, 'season_carryover': 0.67},
+    'college-football': {'k': 25.0, 'home_advantage': 55.0, 'initial': 1500.0, 'season_carryover': 0.6},
+    'nba': {'k': 20.0, 'home_advantage': 70.0, 'initial': 1500.0, 'season_carryover': 0.75},
+    'wnba': {'k': 20.0, 'home_advantage': 60.0, 'initial': 1500.0, 'season_carryover': 0.75},
+    'mlb': {'k': 4.0, 'home_advantage': 24.0, 'initial': 1500.0, 'season_carryover': 0.67},
+}
+
+# Startup import budgets in milliseconds (`python -X importtime`), checked by `startup_benchmark --check`
+STARTUP_IMPORT_BUDGETS = {
+    'default': 350,                     # Django and the project's models only
+    'archive_payloads': 500,            # NumPy and zstandard
+    'build_dataset': 500,               # NumPy
+    'compact_win_probabilities': 500,
+    'generate_synthetic_data': 500,
+    'ingest_plays': 500,
+    'reprocess_summaries': 500,
+    'update_ratings': 500,
+    'track_live': 600,                  # requests and NumPy
+    'get_event_data': 600,              # requests, NumPy and zstandard
+    'plan_backfill': 600,
+    'summary_data': 600,
+    'summary_worker': 600,
+}
+
+# Similar-matchup index (see `events/matchups.py`)
+MATCHUP_BAND_WIDTH = 5      # win probability percentage points per bucket; rebuild the index after changing it
+
+# Memory-mapped NumPy cache of all TeamPredictions (see `events/dataset.py`)
+DATASET_CACHE_DIR = BASE_DIR / 'espndata' / '_raw_data' / 'dataset'
+
+# Per-request SQL query and latency instrumentation (see `core/instrumentation.py`)
+INSTRUMENTATION_WINDOW = 1000           # most recent requests per endpoint kept for percentiles
+INSTRUMENTATION_SLOW_QUERIES = 5        # slowest queries kept per request and per endpoint
+QUERY_BUDGETS = {                       # URL name -> most queries a request may run
+    'prediction-export': 4,
+    'matchup-outcomes': 4,
+    'team-ratings': 4,
+}
+QUERY_BUDGET_STRICT = False             # raise QueryBudgetExceeded instead of logging a warning; enable in test settings